@@ -0,0 +1,98 @@
+import numpy as np
+
+from rumus import calculate_ahp_weights, calculate_ahp_weights_eigen
+
+# --- AHP HIERARKIS ---
+# Pohon kriteria: setiap node internal memiliki matriks perbandingan antar anak-anaknya.
+# Prioritas lokal disimpan per node; bobot global daun = hasil kali prioritas lokal
+# sepanjang jalur dari akar. Mengganti satu matriks hanya membuang cache node tersebut
+# dan bobot global di subtree-nya, sehingga hanya bagian itu yang dihitung ulang.
+class HierarchicalAHP:
+    def __init__(self, root="Goal", method="eigen"):
+        if method not in ("eigen", "mean"):
+            raise ValueError(f"Unknown AHP method: {method}")
+        self.root = root
+        self.method = method
+        self.children = {root: []}
+        self.parent = {root: None}
+        self.matrices = {}
+        self._local = {}
+        self._global = {root: 1.0}
+        self.recomputed = 0  # jumlah perhitungan prioritas lokal (untuk pemantauan cache)
+
+    def add_children(self, node, children, matrix=None):
+        if node not in self.children:
+            raise KeyError(f"Unknown node: {node}")
+        for child in children:
+            if child in self.children:
+                raise ValueError(f"Duplicate node name: {child}")
+            self.children[child] = []
+            self.parent[child] = node
+        self.children[node].extend(children)
+        if matrix is not None:
+            self.set_matrix(node, matrix)
+        else:
+            # Matriks lama tidak lagi cocok dengan jumlah anak yang baru
+            self.matrices.pop(node, None)
+            self._invalidate(node)
+
+    def set_matrix(self, node, matrix):
+        matrix = np.asarray(matrix, dtype=float)
+        n = len(self.children[node])
+        if matrix.shape != (n, n):
+            raise ValueError(f"Comparison matrix for '{node}' must be {n}x{n}, got {matrix.shape}.")
+        self.matrices[node] = matrix
+        self._invalidate(node)
+
+    def _invalidate(self, node):
+        self._local.pop(node, None)
+        stack = list(self.children[node])
+        while stack:
+            child = stack.pop()
+            self._global.pop(child, None)
+            stack.extend(self.children[child])
+
+    # Prioritas lokal anak-anak node: (dict anak -> bobot, CR)
+    def local_priorities(self, node):
+        if node not in self._local:
+            children = self.children[node]
+            if not children:
+                raise ValueError(f"'{node}' is a leaf and has no local priorities.")
+            if len(children) == 1:
+                weights, cr = [1.0], 0.0
+            elif node not in self.matrices:
+                raise ValueError(f"No comparison matrix set for '{node}'.")
+            elif self.method == "eigen":
+                weights, cr = calculate_ahp_weights_eigen(self.matrices[node])
+            else:
+                weights, cr = calculate_ahp_weights(self.matrices[node])
+            self._local[node] = (dict(zip(children, weights)), float(cr))
+            self.recomputed += 1
+        return self._local[node]
+
+    def global_weight(self, node):
+        if node not in self._global:
+            parent = self.parent[node]
+            local, _ = self.local_priorities(parent)
+            self._global[node] = self.global_weight(parent) * local[node]
+        return self._global[node]
+
+    def leaves(self):
+        order = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if self.children[node]:
+                stack.extend(reversed(self.children[node]))
+            else:
+                order.append(node)
+        return order
+
+    # Bobot global seluruh daun (kriteria yang dipakai TOPSIS / Profile Matching)
+    def global_weights(self):
+        return {leaf: self.global_weight(leaf) for leaf in self.leaves()}
+
+    # CR setiap node internal
+    def consistency(self):
+        return {node: self.local_priorities(node)[1]
+                for node, children in self.children.items() if children}
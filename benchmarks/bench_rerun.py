@@ -0,0 +1,147 @@
+import argparse
+import contextlib
+import functools
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+# --- BENCHMARK RERUN ---
+# Mengukur waktu rerun aplikasi untuk satu interaksi widget di tab TOPSIS dan Profile Matching
+# (default 20 kriteria x 500 alternatif, hasil sudah dihitung dan tetap ditampilkan):
+#   full       seluruh skrip dijalankan ulang (CSS, sidebar, semua fragment di tab)
+#   fragment   hanya fragment yang memuat widget tersebut, seperti yang dilakukan browser
+# AppTest selalu menjalankan skrip penuh, jadi rerun fragment diminta dengan menambahkan id
+# fragment (dari kunci @st.fragment) ke RerunData, sama seperti permintaan rerun dari browser.
+# Ini memakai internal Streamlit (AppTest._fragment_storage, RerunData di local_script_runner)
+# yang dapat berubah antarversi, jadi versi Streamlit dipatok dan diperiksa sebelum mengukur.
+#
+# Setiap interaksi mengubah widget dari nilai "sebelum" ke nilai "sesudah"; nilai sebelum dipasang
+# lewat rerun penuh yang tidak diukur. Suntingan input yang membuat hasil usang (current -> stale)
+# atau kembali sesuai (stale -> current) menjalankan fragment input lalu st.rerun(scope="app"),
+# jadi mode fragment di baris itu membayar keduanya; suntingan saat hasil sudah usang (stale)
+# cukup menjalankan fragment input.
+#
+#   python benchmarks/bench_rerun.py
+#   python benchmarks/bench_rerun.py --alternatives 5000 --criteria 20 --repeats 9
+
+STREAMLIT_VERSION = "1.66"
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "program_dss.py")
+
+# (tab, label, jenis widget, kunci widget, (nilai sebelum, nilai sesudah), kunci fragment)
+# Hasil dihitung dengan nilai bawaan: tipe kriteria "Benefit" dan nilai ideal 1
+INTERACTIONS = [
+    ("☕ AHP + TOPSIS", "TOPSIS: type, current -> stale", "selectbox", "type_0", ("Benefit", "Cost"), "topsis_inputs_fragment"),
+    ("☕ AHP + TOPSIS", "TOPSIS: type, stale -> current", "selectbox", "type_0", ("Cost", "Benefit"), "topsis_inputs_fragment"),
+    ("☕ AHP + TOPSIS", "TOPSIS: rank reversal option", "checkbox", "topsis_rank_reversal", (False, True), "topsis_results_fragment"),
+    ("☕ AHP + Profile Matching", "PM: ideal, current -> stale", "number_input", "ideal_0", (1, 2), "pm_profile_fragment"),
+    ("☕ AHP + Profile Matching", "PM: ideal, stale", "number_input", "ideal_0", (3, 4), "pm_profile_fragment"),
+    ("☕ AHP + Profile Matching", "PM: radar layout", "radio", "pm_radar_layout", ("Overlay", "Small multiples"), "pm_results_fragment"),
+]
+
+CALCULATE = {
+    "☕ AHP + TOPSIS": "🔍 Calculate Location Ranking (TOPSIS)",
+    "☕ AHP + Profile Matching": "🔍 Calculate Location Ranking (Profile Matching)",
+}
+
+def check_streamlit_version():
+    installed = ".".join(streamlit.__version__.split(".")[:2])
+    if installed != STREAMLIT_VERSION:
+        raise SystemExit(f"bench_rerun.py drives fragment reruns through Streamlit {STREAMLIT_VERSION} internals; "
+                         f"Streamlit {streamlit.__version__} is installed. Check fragment_scope() against the new "
+                         "version before updating STREAMLIT_VERSION.")
+
+def new_app(n, m, seed, timeout):
+    rng = np.random.default_rng(seed)
+    criteria = [f"C{j + 1}" for j in range(m)]
+    alternatives = [f"Site {i + 1}" for i in range(n)]
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    at.session_state["criteria"] = criteria
+    at.session_state["alternatives"] = alternatives
+    at.session_state["weights"] = list(rng.dirichlet(np.ones(m)))
+    # Matriks masuk lewat jalur proyek yang dimuat (sama dengan file yang diimpor)
+    at.session_state["topsis_import_loaded"] = pd.DataFrame(rng.integers(1, 11, size=(n, m)).astype(float),
+                                                            index=alternatives, columns=criteria)
+    at.session_state["pm_import_loaded"] = pd.DataFrame(rng.integers(1, 6, size=(n, m)).astype(float),
+                                                        index=alternatives, columns=criteria)
+    for j in range(m):
+        at.session_state[f"cf_sf_{j}"] = "CF (Core Factor)" if j < m * 0.6 else "SF (Secondary Factor)"
+    return at.run()
+
+def _check(at):
+    assert not at.exception, at.exception
+    return at
+
+@contextlib.contextmanager
+def fragment_scope(at, fragment_key):
+    ids = at._fragment_storage.resolve_target(fragment_key)
+    original = local_script_runner.RerunData
+    local_script_runner.RerunData = functools.partial(original, fragment_id_queue=list(ids), is_fragment_scoped_rerun=True)
+    try:
+        yield
+    finally:
+        local_script_runner.RerunData = original
+
+def timed_interaction(at, kind, key, value, fragment_key=None):
+    widget = getattr(at, kind)(key=key).set_value(value)
+    scope = fragment_scope(at, fragment_key) if fragment_key else contextlib.nullcontext()
+    with scope:
+        start = time.perf_counter()
+        widget.run()
+        elapsed = time.perf_counter() - start
+    _check(at)
+    if fragment_key:
+        # Pohon elemen AppTest hanya berisi fragment; rerun penuh (tidak diukur) memulihkannya
+        _check(at.run())
+    return elapsed
+
+def measure(at, kind, key, values, fragment_key, repeats):
+    before, after = values
+    times = {"full": [], "fragment": []}
+    for _ in range(repeats):
+        for mode in ("full", "fragment"):
+            _check(getattr(at, kind)(key=key).set_value(before).run())
+            times[mode].append(timed_interaction(at, kind, key, after, fragment_key if mode == "fragment" else None))
+    return {mode: statistics.median(t) for mode, t in times.items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure full-script vs fragment-scoped reruns of the TOPSIS and Profile Matching tabs.")
+    parser.add_argument("--alternatives", type=int, default=500)
+    parser.add_argument("--criteria", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5, help="Timed reruns per mode; the median is kept.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="AppTest timeout per rerun in seconds.")
+    args = parser.parse_args(argv)
+    check_streamlit_version()
+
+    at = _check(new_app(args.alternatives, args.criteria, args.seed, args.timeout))
+    print(f"{args.criteria} criteria x {args.alternatives:,} alternatives, median of {args.repeats} reruns\n")
+    print(f"{'interaction':<34} {'full (ms)':>10} {'fragment (ms)':>14} {'reduction':>10}")
+
+    current_tab = None
+    for tab, label, kind, key, values, fragment_key in INTERACTIONS:
+        if tab != current_tab:
+            _check(at.sidebar.radio[0].set_value(tab).run())
+            next(b for b in at.main.button if b.label == CALCULATE[tab]).click()
+            _check(at.run())
+            assert any("Calculation Results" in h.value for h in at.subheader), "results were not rendered"
+            current_tab = tab
+        # Satu putaran pemanasan agar cache hasil dan grafik terisi untuk kedua mode
+        measure(at, kind, key, values, fragment_key, 1)
+        result = measure(at, kind, key, values, fragment_key, args.repeats)
+        full, fragment = result["full"] * 1000, result["fragment"] * 1000
+        print(f"{label:<34} {full:10.1f} {fragment:14.1f} {1 - fragment / full:10.0%}")
+
+        # Hasil tetap ditampilkan setelah interaksi
+        assert any("Calculation Results" in h.value for h in at.subheader), "results did not persist"
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rumus import (calculate_ahp_weights, compile_gap_weight, gap_weight, pairwise_from_upper,  # noqa: E402
+                   profile_matching, topsis, topsis_kernel)
+
+# --- BENCHMARK RUMUS ---
+# Menyapu jumlah alternatif (n) dan kriteria (m) untuk fungsi-fungsi utama rumus.py,
+# mengukur waktu (minimum dari beberapa ulangan), memori puncak serta byte dan blok yang masih
+# dipegang setelah pemanggilan (hasil yang dikembalikan, cache; via tracemalloc), lalu
+# membandingkannya dengan baseline JSON.
+#
+#   python benchmarks/bench_rumus.py                  # bandingkan dengan baseline, exit 1 bila regresi
+#   python benchmarks/bench_rumus.py --save           # simpan hasil sebagai baseline baru
+#   python benchmarks/bench_rumus.py --sweep full     # n sampai 10^7, m sampai 50
+#
+# Kasus dengan n*m > --max-cells dilewati agar sapuan penuh tetap muat di memori mesin.
+
+SWEEPS = {
+    "quick": {"n": [10, 1_000, 100_000], "m": [3, 10, 50]},
+    "full": {"n": [10, 1_000, 100_000, 1_000_000, 10_000_000], "m": [3, 10, 20, 50]},
+}
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def _inputs(func, n, m, rng):
+    if func == "calculate_ahp_weights":
+        upper = rng.choice([1 / 5, 1 / 3, 1, 3, 5], size=m * (m - 1) // 2)
+        return (pairwise_from_upper(upper, m),), {}
+    weights = rng.dirichlet(np.ones(m))
+    if func == "topsis":
+        return (rng.uniform(1, 10, size=(n, m)), weights, rng.random(m) < 0.5), {}
+    if func == "topsis_kernel":
+        return (rng.uniform(1, 10, size=(n, m)).astype(np.float32), weights, rng.random(m) < 0.5), {"out": np.empty(n, dtype=np.float32)}
+    if func == "profile_matching":
+        grouping = np.where(np.arange(m) < (m + 1) // 2, "CF", "SF")
+        return (rng.integers(1, 6, size=m), rng.integers(1, 6, size=(n, m)).astype(float), weights, grouping), {}
+    if func == "gap_weight":
+        return (rng.integers(-5, 6, size=n).tolist(),), {}
+    if func == "gap_table":
+        return (rng.uniform(-5, 5, size=(n, m)),), {}
+    raise ValueError(func)
+
+def _target(func):
+    if func == "gap_weight":
+        return lambda gaps: [gap_weight(g) for g in gaps]
+    if func == "gap_table":
+        return compile_gap_weight()
+    return {"calculate_ahp_weights": calculate_ahp_weights, "topsis": topsis, "topsis_kernel": topsis_kernel,
+            "profile_matching": profile_matching}[func]
+
+def _cases(sweep, max_cells, functions):
+    for func in functions:
+        if func == "calculate_ahp_weights":
+            for m in sweep["m"]:
+                yield func, 0, m
+            continue
+        for n in sweep["n"]:
+            # gap_weight adalah fungsi skalar: cukup satu sapuan n (tidak bergantung m)
+            for m in ([1] if func == "gap_weight" else sweep["m"]):
+                if n * m <= max_cells:
+                    yield func, n, m
+
+def measure(func, n, m, repeats=3, min_time=0.05, seed=0):
+    args, kwargs = _inputs(func, n, m, np.random.default_rng(seed))
+    fn = _target(func)
+
+    # Waktu: ulangi panggilan sampai >= min_time per ulangan, ambil minimum per panggilan
+    fn(*args, **kwargs)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10
+    timings = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(*args, **kwargs)
+        timings.append((time.perf_counter() - start) / number)
+
+    return {"time_s": min(timings), **measure_memory(fn, args, kwargs)}
+
+# Memori: satu panggilan dengan tracemalloc aktif (NumPy melaporkan alokasi array ke tracemalloc).
+# tracemalloc hanya melacak alokasi sejak start(), jadi selama hasil masih dipegang:
+#   peak_bytes       puncak memori selama pemanggilan
+#   retained_bytes   byte yang dialokasikan pemanggilan dan belum dibebaskan (termasuk hasil)
+#   retained_blocks  jumlah blok alokasi tersebut (Python dan NumPy)
+# Ini bukan total alokasi: blok yang dialokasikan lalu dibebaskan di dalam pemanggilan tidak terhitung.
+def measure_memory(fn, args, kwargs):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn(*args, **kwargs)
+        retained, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return {"peak_bytes": peak, "retained_bytes": retained, "retained_blocks": blocks}
+
+def compare(results, baseline, threshold, min_abs_time=1e-3):
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if current["time_s"] > base["time_s"] * (1 + threshold) and current["time_s"] - base["time_s"] > min_abs_time:
+            regressions.append(f"{key}: time {base['time_s'] * 1000:.3f} ms -> {current['time_s'] * 1000:.3f} ms")
+        if current["peak_bytes"] > base["peak_bytes"] * (1 + threshold) and current["peak_bytes"] - base["peak_bytes"] > 64 * 1024:
+            regressions.append(f"{key}: peak memory {base['peak_bytes'] / 1024:.0f} KiB -> {current['peak_bytes'] / 1024:.0f} KiB")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark rumus.py hot paths and gate on regressions.")
+    parser.add_argument("--sweep", choices=sorted(SWEEPS), default="quick")
+    parser.add_argument("--functions", nargs="+",
+                        default=["calculate_ahp_weights", "topsis", "topsis_kernel", "profile_matching", "gap_weight", "gap_table"])
+    parser.add_argument("--max-cells", type=float, default=5e7, help="Skip cases with n*m above this (default 5e7).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown / memory growth (default 0.25).")
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats per case; the minimum is kept.")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per timing repeat.")
+    parser.add_argument("--save", action="store_true", help="Write the results into the baseline file instead of comparing.")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for func, n, m in _cases(SWEEPS[args.sweep], args.max_cells, args.functions):
+        key = f"{func}[n={n},m={m}]"
+        results[key] = measure(func, n, m, args.repeats, args.min_time)
+        r = results[key]
+        print(f"{key:<40} {r['time_s'] * 1000:12.4f} ms {r['peak_bytes'] / 1024:12.1f} KiB peak "
+              f"{r['retained_bytes'] / 1024:10.1f} KiB / {r['retained_blocks']:6d} blocks retained")
+
+    meta = {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine()}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.save:
+        baseline = {"meta": meta, "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline["meta"] = meta
+        baseline["results"].update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save first.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
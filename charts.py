@@ -0,0 +1,84 @@
+import os
+from io import BytesIO
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from result_cache import ResultCache, content_hash
+
+# --- RENDER GRAFIK ---
+# Grafik dibuat dengan API berorientasi objek (Figure) tanpa state global pyplot, sehingga
+# figure langsung dibebaskan setelah dirender. Setiap grafik dirender ke PNG tepat sekali;
+# bytes yang sama dipakai untuk tampilan (st.image) dan tombol unduh, dan di-cache
+# berdasarkan hash isi data. Anggaran cache diatur lewat DSS_CHART_CACHE_MB (default 64 MB).
+CHART_CACHE = ResultCache(int(float(os.environ.get("DSS_CHART_CACHE_MB", 64)) * 1024 * 1024))
+
+RADAR_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#7a42ad']
+
+def _to_png(fig, **savefig_kwargs):
+    buf = BytesIO()
+    fig.savefig(buf, format="png", **savefig_kwargs)
+    return buf.getvalue()
+
+# Diagram batang skor; `labels`/`values` diharapkan sudah terurut berdasarkan ranking.
+# Hanya `max_bars` batang pertama yang digambar agar tetap terbaca untuk banyak alternatif.
+def bar_chart_png(labels, values, title, xlabel="Alternative", ylabel="Score", max_bars=30, dpi=150):
+    labels = [str(label) for label in labels[:max_bars]]
+    values = np.asarray(values, dtype=float)[:max_bars]
+    key = content_hash("bar", labels, values, title, xlabel, ylabel, dpi)
+    return CHART_CACHE.get_or_compute(key, lambda: _render_bar(labels, values, title, xlabel, ylabel, dpi))
+
+def _render_bar(labels, values, title, xlabel, ylabel, dpi):
+    fig = Figure(figsize=(5, 3))
+    ax = fig.add_subplot()
+    ax.bar(labels, values, color='saddlebrown')
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.tick_params(axis='x', labelrotation=45)
+    for tick in ax.get_xticklabels():
+        tick.set_horizontalalignment('right')
+    return _to_png(fig, dpi=dpi, bbox_inches='tight')
+
+# Radar kedekatan ke profil ideal. `closeness` (n, m) dan `labels` diharapkan terurut
+# berdasarkan ranking; hanya `top_n` alternatif teratas yang digambar.
+# layout="overlay": semua alternatif dalam satu radar; "small_multiples": satu radar per alternatif.
+def radar_chart_png(closeness, labels, criteria, top_n=5, layout="overlay", dpi=100):
+    closeness = np.asarray(closeness, dtype=float)[:top_n]
+    labels = [str(label) for label in labels[:top_n]]
+    criteria = [str(crit) for crit in criteria]
+    key = content_hash("radar", closeness, labels, criteria, layout, dpi)
+    return CHART_CACHE.get_or_compute(key, lambda: _render_radar(closeness, labels, criteria, layout, dpi))
+
+def _draw_radar(ax, angles, rows, labels, criteria, colors):
+    for row, label, color in zip(rows, labels, colors):
+        values = np.append(row, row[0])
+        ax.plot(angles, values, label=label, linewidth=2.5, marker='o', color=color)
+        ax.fill(angles, values, alpha=0.25, color=color)
+    ax.set_thetagrids(np.degrees(angles[:-1]), criteria, fontsize=11, ha='center')
+    ax.set_ylim(0, 1)
+    ax.grid(True, linestyle='--', alpha=0.5)
+
+def _render_radar(closeness, labels, criteria, layout, dpi):
+    angles = np.linspace(0, 2 * np.pi, len(criteria), endpoint=False)
+    angles = np.append(angles, angles[0])
+    colors = [RADAR_COLORS[i % len(RADAR_COLORS)] for i in range(len(labels))]
+
+    if layout == "small_multiples":
+        ncols = min(3, len(labels))
+        nrows = -(-len(labels) // ncols)
+        fig = Figure(figsize=(4 * ncols, 4 * nrows))
+        for i, (row, label, color) in enumerate(zip(closeness, labels, colors)):
+            ax = fig.add_subplot(nrows, ncols, i + 1, projection='polar')
+            _draw_radar(ax, angles, [row], [label], criteria, [color])
+            ax.set_title(f"#{i + 1} {label}", size=12, pad=20)
+        fig.suptitle("Closeness of Alternatives to Ideal Profile", size=13)
+        fig.tight_layout()
+    else:
+        fig = Figure(figsize=(8, 7))
+        ax = fig.add_subplot(projection='polar')
+        _draw_radar(ax, angles, closeness, labels, criteria, colors)
+        ax.set_title("Closeness of Alternatives to Ideal Profile", size=13, pad=30)
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2, frameon=False)
+
+    return _to_png(fig, dpi=dpi, transparent=True, bbox_inches='tight')
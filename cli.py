@@ -0,0 +1,170 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# --- CLI BATCH ---
+# Menjalankan AHP, TOPSIS dan Profile Matching tanpa Streamlit. Hanya NumPy dan rumus yang
+# dimuat (pandas hanya untuk matriks CSV); streamlit dan matplotlib tidak pernah diimpor.
+#
+# Spesifikasi job (file .json berisi satu objek / daftar objek, atau .jsonl satu job per baris):
+#   name            nama job, dipakai sebagai awalan file keluaran: harus unik dan berupa nama file
+#                   biasa (tanpa folder); default job1, job2, ... berurutan lintas file spesifikasi
+#   matrix          path matriks keputusan (.csv dengan kolom pertama = nama alternatif, atau .npy)
+#   alternatives    nama alternatif (opsional; default dari CSV atau A1..An)
+#   criteria        nama kriteria (opsional; default dari header CSV atau C1..Cm)
+#   pairwise        matriks perbandingan berpasangan AHP, atau
+#   weights         bobot kriteria langsung
+#   ahp_method      "mean" (default) atau "eigen"
+#   criteria_types  daftar "benefit"/"cost" -> menjalankan TOPSIS
+#   ideal, cf_sf    profil ideal dan daftar "CF"/"SF" -> menjalankan Profile Matching
+#   gap_table       tabel bobot GAP {gap: bobot} (opsional), gap_interpolate (default true)
+#   top_k           hanya tulis k peringkat teratas (opsional)
+# Path relatif dihitung dari folder file spesifikasi.
+
+def load_jobs(path, first=1):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            jobs = [json.loads(line) for line in f if line.strip()]
+        else:
+            jobs = json.load(f)
+    if isinstance(jobs, dict):
+        jobs = [jobs]
+    base = os.path.dirname(os.path.abspath(path))
+    for i, job in enumerate(jobs):
+        job.setdefault("name", f"job{first + i}")
+        if "matrix" in job and not os.path.isabs(job["matrix"]):
+            job["matrix"] = os.path.join(base, job["matrix"])
+    return jobs
+
+# Nama job menjadi awalan file di folder keluaran, jadi tidak boleh memuat folder (mis. "../x")
+def check_job_name(name):
+    if not isinstance(name, str) or not name.strip() or name in (".", "..") or any(sep in name for sep in "/\\:"):
+        raise ValueError(f"Invalid job name {name!r}: use a plain file name without folders.")
+    return name
+
+def check_job_names(jobs):
+    seen = set()
+    for job in jobs:
+        name = check_job_name(job["name"])
+        if name in seen:
+            raise ValueError(f"Duplicate job name {name!r}: output files would overwrite each other.")
+        seen.add(name)
+
+def _read_matrix(job):
+    import numpy as np
+
+    path = job["matrix"]
+    alternatives, criteria = job.get("alternatives"), job.get("criteria")
+    if path.lower().endswith(".npy"):
+        matrix = np.load(path, mmap_mode="r")
+    else:
+        import pandas as pd
+
+        frame = pd.read_csv(path, index_col=0)
+        matrix = frame.to_numpy(dtype=float)
+        alternatives = alternatives or frame.index.astype(str).tolist()
+        criteria = criteria or frame.columns.astype(str).tolist()
+
+    alternatives = alternatives or [f"A{i + 1}" for i in range(matrix.shape[0])]
+    criteria = criteria or [f"C{j + 1}" for j in range(matrix.shape[1])]
+    return np.asarray(matrix, dtype=float), alternatives, criteria
+
+def _write_ranking(path, alternatives, scores, ranking):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Ranking", "Alternative", "Score"])
+        writer.writerows((rank, alternatives[i], f"{scores[i]:.6f}") for rank, i in enumerate(ranking, start=1))
+
+def run_job(job, out_dir):
+    from rumus import (calculate_ahp_weights, calculate_ahp_weights_eigen, compile_gap_weight,
+                       profile_matching, topsis)
+
+    name = check_job_name(job["name"])
+    matrix, alternatives, criteria = _read_matrix(job)
+    summary = {"name": name, "alternatives": len(alternatives)}
+
+    if "pairwise" in job:
+        if job.get("ahp_method", "mean") == "eigen":
+            weights, cr = calculate_ahp_weights_eigen(job["pairwise"])
+        else:
+            weights, cr = calculate_ahp_weights(job["pairwise"])
+        summary["consistency_ratio"] = float(cr)
+    elif "weights" in job:
+        weights = [float(w) for w in job["weights"]]
+    else:
+        raise ValueError(f"Job '{name}' needs either 'pairwise' or 'weights'.")
+    summary["weights"] = dict(zip(criteria, weights))
+
+    with open(os.path.join(out_dir, f"{name}_weights.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Criteria", "Weight"])
+        writer.writerows(zip(criteria, weights))
+
+    top_k = job.get("top_k")
+    if "criteria_types" in job:
+        is_benefit = [t.lower() == "benefit" for t in job["criteria_types"]]
+        scores, ranking = topsis(matrix, weights, is_benefit, top_k=top_k)
+        _write_ranking(os.path.join(out_dir, f"{name}_topsis.csv"), alternatives, scores, ranking)
+        summary["topsis_best"] = alternatives[ranking[0]]
+
+    if "ideal" in job and "cf_sf" in job:
+        gap_table = None
+        if "gap_table" in job:
+            mapping = {float(k): float(v) for k, v in job["gap_table"].items()}
+            gap_table = compile_gap_weight(mapping, interpolate=job.get("gap_interpolate", True))
+        scores, ranking = profile_matching(job["ideal"], matrix, weights, job["cf_sf"], gap_table, top_k=top_k)
+        _write_ranking(os.path.join(out_dir, f"{name}_profile_matching.csv"), alternatives, scores, ranking)
+        summary["profile_matching_best"] = alternatives[ranking[0]]
+
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run AHP, TOPSIS and Profile Matching ranking jobs without the Streamlit UI.")
+    parser.add_argument("specs", nargs="+", help="Job specification files (.json or .jsonl).")
+    parser.add_argument("-o", "--out", default="results", help="Output directory (default: results).")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Number of parallel worker processes.")
+    args = parser.parse_args(argv)
+
+    jobs = []
+    for spec in args.specs:
+        jobs.extend(load_jobs(spec, first=len(jobs) + 1))
+    try:
+        check_job_names(jobs)
+    except ValueError as e:
+        parser.error(str(e))
+    os.makedirs(args.out, exist_ok=True)
+
+    summaries, failed = [], 0
+    if args.jobs == 1 or len(jobs) == 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append((job, run_job(job, args.out), None))
+            except Exception as e:
+                results.append((job, None, e))
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs))) as pool:
+            futures = {pool.submit(run_job, job, args.out): job for job in jobs}
+            for future in as_completed(futures):
+                error = future.exception()
+                results.append((futures[future], None if error else future.result(), error))
+
+    for job, summary, error in results:
+        if error is not None:
+            failed += 1
+            print(f"[FAILED] {job['name']}: {error}", file=sys.stderr)
+        else:
+            summaries.append(summary)
+            print(f"[OK] {job['name']}")
+
+    with open(os.path.join(args.out, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(sorted(summaries, key=lambda s: s["name"]), f, indent=2)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+import numpy as np
+import pytest
+
+
+# Masalah TOPSIS acak: matriks (n, m) bernilai 1..10, bobot Dirichlet, Benefit/Cost berselang-seling
+@pytest.fixture
+def topsis_problem():
+    def make(n=25, m=4, seed=0):
+        rng = np.random.default_rng(seed)
+        return rng.uniform(1, 10, size=(n, m)), rng.dirichlet(np.ones(m)), np.arange(m) % 2 == 0
+    return make
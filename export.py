@@ -0,0 +1,152 @@
+import importlib.util
+import tempfile
+
+import numpy as np
+
+from rumus import gap_score_matrix
+
+# --- EKSPOR HASIL PERINGKAT ---
+# Tabel peringkat ditulis per chunk langsung dari array skor NumPy: setiap chunk mengambil
+# indeks `ranking[start:stop]` lalu mengindeks nama, skor dan rincian per kriteria, sehingga
+# DataFrame terurut berukuran penuh tidak pernah dibuat. Format:
+#   CSV        pyarrow.csv.CSVWriter per chunk (pandas.to_csv bila pyarrow tidak ada)
+#   Parquet    pyarrow.parquet.ParquetWriter, satu row group per chunk
+#   Arrow IPC  pyarrow.ipc file writer, satu record batch per chunk
+# pyarrow diimpor hanya saat menulis dan wajib hanya untuk Parquet / Arrow.
+
+FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": (".arrow", "application/vnd.apache.arrow.file"),
+}
+
+def available_formats():
+    if importlib.util.find_spec("pyarrow") is None:
+        return ["CSV"]
+    return list(FORMATS)
+
+# --- RINCIAN PER KRITERIA ---
+# Masing-masing mengembalikan (nama kolom, fungsi baris -> array (len(baris), kolom)).
+# TOPSIS: jarak terbobot tiap kriteria ke solusi ideal positif (d+) dan negatif (d-).
+def topsis_breakdown(matrix, weights, is_benefit, criteria):
+    matrix = np.asarray(matrix)
+    is_benefit = np.asarray(is_benefit, dtype=bool)
+    scale = np.asarray(weights, dtype=float) / np.sqrt(np.einsum("ij,ij->j", matrix, matrix, dtype=float))
+    col_max, col_min = matrix.max(axis=0) * scale, matrix.min(axis=0) * scale
+    best = np.where(is_benefit, col_max, col_min)
+    worst = np.where(is_benefit, col_min, col_max)
+
+    def rows(idx):
+        weighted = matrix[idx] * scale
+        return np.hstack([np.abs(weighted - best), np.abs(weighted - worst)])
+
+    return [f"{c} d+" for c in criteria] + [f"{c} d-" for c in criteria], rows
+
+# Profile Matching: gap (aktual - ideal) dan bobot gap tiap kriteria
+def profile_matching_breakdown(ideal, actuals, criteria, gap_table=None):
+    actuals = np.asarray(actuals)
+    ideal = np.asarray(ideal, dtype=float)
+
+    def rows(idx):
+        values = np.asarray(actuals[idx], dtype=float)
+        return np.hstack([values - ideal, gap_score_matrix(ideal, values, gap_table)])
+
+    return [f"{c} gap" for c in criteria] + [f"{c} gap weight" for c in criteria], rows
+
+# --- CHUNK ---
+# Kolom per chunk (dict nama -> array) dalam urutan `ranking`; `breakdown` = (nama, fungsi baris)
+def ranked_chunks(alternatives, scores, ranking, breakdown=None, chunksize=65_536):
+    alternatives = np.asarray(alternatives)
+    scores = np.asarray(scores, dtype=float)
+    ranking = np.asarray(ranking, dtype=np.intp)
+    for start in range(0, len(ranking), chunksize):
+        idx = ranking[start:start + chunksize]
+        chunk = {
+            "Ranking": np.arange(start + 1, start + len(idx) + 1),
+            "Alternative": alternatives[idx].astype(str),
+            "Score": scores[idx],
+        }
+        if breakdown is not None:
+            names, rows = breakdown
+            values = rows(idx)
+            for j, name in enumerate(names):
+                chunk[name] = values[:, j]
+        yield chunk
+
+# --- PENULIS ---
+def _arrow_batches(chunks):
+    import pyarrow as pa
+
+    for chunk in chunks:
+        yield pa.RecordBatch.from_pydict(chunk)
+
+# CSV memakai penulis pyarrow bila tersedia (jauh lebih cepat daripada pandas.to_csv untuk
+# kolom float), selain itu pandas
+def write_csv(handle, chunks):
+    if importlib.util.find_spec("pyarrow") is None:
+        import pandas as pd
+
+        for i, chunk in enumerate(chunks):
+            pd.DataFrame(chunk).to_csv(handle, header=i == 0, index=False, encoding="utf-8")
+        return
+
+    import pyarrow.csv as pa_csv
+
+    writer = None
+    try:
+        for batch in _arrow_batches(chunks):
+            if writer is None:
+                writer = pa_csv.CSVWriter(handle, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_parquet(handle, chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for batch in _arrow_batches(chunks):
+            if writer is None:
+                writer = pq.ParquetWriter(handle, batch.schema)
+            writer.write_table(pa.Table.from_batches([batch]))
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_arrow(handle, chunks):
+    import pyarrow as pa
+
+    writer = None
+    try:
+        for batch in _arrow_batches(chunks):
+            if writer is None:
+                writer = pa.ipc.new_file(handle, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+WRITERS = {"CSV": write_csv, "Parquet": write_parquet, "Arrow IPC": write_arrow}
+
+# Menulis tabel peringkat ke `path` atau file biner yang sudah terbuka
+def export_ranking(target, fmt, alternatives, scores, ranking, breakdown=None, chunksize=65_536):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt != "CSV" and fmt not in available_formats():
+        raise ValueError(f"{fmt} export needs the optional package 'pyarrow'.")
+    chunks = ranked_chunks(alternatives, scores, ranking, breakdown, chunksize)
+    if hasattr(target, "write"):
+        WRITERS[fmt](target, chunks)
+    else:
+        with open(target, "wb") as handle:
+            WRITERS[fmt](handle, chunks)
+
+# File sementara berisi hasil ekspor, posisi di awal; untuk unduhan tanpa menahan seluruh isi di RAM
+def export_tempfile(fmt, alternatives, scores, ranking, breakdown=None, chunksize=65_536):
+    handle = tempfile.TemporaryFile()
+    export_ranking(handle, fmt, alternatives, scores, ranking, breakdown, chunksize)
+    handle.seek(0)
+    return handle
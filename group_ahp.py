@@ -0,0 +1,228 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from rumus import calculate_ahp_weights_batch, pairwise_from_upper
+
+# --- AHP KELOMPOK ---
+# Menggabungkan perbandingan berpasangan dari banyak responden survei (pemilik, barista,
+# pelanggan) tanpa memasukkannya satu per satu lewat slider. File dibaca per blok; CR setiap
+# responden dihitung dalam satu pass batch per blok, responden yang tidak konsisten dibuang,
+# lalu penilaian yang tersisa digabung:
+#   AIJ  aggregation of individual judgements: rata-rata geometrik tiap elemen matriks
+#   AIP  aggregation of individual priorities: rata-rata geometrik vektor bobot tiap responden
+# Keduanya diakumulasikan sebagai jumlah logaritma, sehingga memori tidak bergantung jumlah responden.
+#
+# Format masukan:
+#   CSV   satu responden per baris: n(n-1)/2 kolom segitiga atas (urutan baris, i < j) atau n*n
+#         kolom matriks penuh, ditambah kolom id / kelompok opsional (non-numerik). Nilai boleh
+#         berupa angka atau pecahan seperti "1/3".
+#   JSONL satu objek per baris: {"respondent": ..., "group": ..., "matrix": [[...]]} atau "upper": [...]
+
+def _size_from_upper(count):
+    n = int(round((1 + np.sqrt(1 + 8 * count)) / 2))
+    return n if n * (n - 1) // 2 == count else None
+
+def _to_upper(values, layout, n):
+    if layout == "full":
+        iu = np.triu_indices(n, 1)
+        return values.reshape(-1, n, n)[:, iu[0], iu[1]]
+    return values
+
+# Menentukan tata letak kolom numerik: matriks penuh bila jumlah kolom kuadrat dan diagonalnya 1,
+# selain itu segitiga atas
+def _detect_layout(values, layout=None):
+    count = values.shape[1]
+    root = int(round(np.sqrt(count)))
+    if layout in (None, "full") and root * root == count and root > 1:
+        diagonal = values[:, np.arange(root) * (root + 1)]
+        if layout == "full" or np.allclose(diagonal[np.isfinite(diagonal)], 1):
+            return "full", root
+    n = _size_from_upper(count)
+    if layout in (None, "upper") and n is not None and n > 1:
+        return "upper", n
+    raise ValueError(f"Cannot read {count} numeric columns as an upper triangle or a full pairwise matrix.")
+
+# Sel penilaian CSV: angka atau pecahan "a/b"; sel yang tidak dapat dibaca menjadi NaN
+def _parse_judgements(column):
+    values = pd.to_numeric(column, errors="coerce")
+    text = column[values.isna() & column.notna()].astype(str)
+    if len(text):
+        parts = text.str.extract(r"^\s*(\d*\.?\d+)\s*/\s*(\d*\.?\d+)\s*$").astype(float)
+        values[text.index] = parts[0] / parts[1]
+    return values
+
+def _unparsed(column, values):
+    return column[column.notna() & values.isna()]
+
+ID_COLUMNS = ("respondent", "respondent_id", "id")
+GROUP_COLUMNS = ("group", "stakeholder", "role")
+
+# Blok (id responden, kelompok, segitiga atas (k, n(n-1)/2)) dari CSV atau JSONL. Kolom id dan
+# kelompok dikenali dari namanya (respondent/id, group/stakeholder/role) bila tidak disebutkan.
+def iter_respondents(source, chunksize=20_000, layout=None, id_col=None, group_col=None):
+    name = os.fspath(getattr(source, "name", source))
+    if name.lower().endswith(".jsonl"):
+        yield from _iter_jsonl(source, chunksize)
+        return
+
+    n = None
+    for start, frame in enumerate(pd.read_csv(source, chunksize=chunksize)):
+        if start == 0:
+            columns = {str(c).strip().lower(): c for c in frame.columns}
+            id_col = id_col or next((columns[c] for c in ID_COLUMNS if c in columns), None)
+            group_col = group_col or next((columns[c] for c in GROUP_COLUMNS if c in columns), None)
+            # Kolom penilaian: numerik, atau teks yang seluruhnya angka / pecahan. Kolom teks tanpa
+            # satu pun angka dianggap keterangan dan diabaikan; campuran keduanya ditolak.
+            judgement_cols = []
+            for c in frame.columns:
+                if c in (id_col, group_col):
+                    continue
+                parsed = _parse_judgements(frame[c])
+                if pd.api.types.is_numeric_dtype(frame[c]) or _unparsed(frame[c], parsed).empty:
+                    judgement_cols.append(c)
+                elif parsed.notna().any():
+                    raise ValueError(f"Column '{c}' has values that are not numbers or fractions like 1/3, "
+                                     f"e.g. '{_unparsed(frame[c], parsed).iloc[0]}'.")
+        values = np.empty((len(frame), len(judgement_cols)))
+        for j, c in enumerate(judgement_cols):
+            parsed = _parse_judgements(frame[c])
+            bad = _unparsed(frame[c], parsed)
+            if not bad.empty:
+                raise ValueError(f"Column '{c}' has values that are not numbers or fractions like 1/3, "
+                                 f"e.g. '{bad.iloc[0]}'.")
+            values[:, j] = parsed.to_numpy(dtype=float)
+        if n is None:
+            layout, n = _detect_layout(values, layout)
+        ids = frame[id_col].astype(str).to_numpy() if id_col else (start * chunksize + np.arange(len(frame))).astype(str)
+        groups = frame[group_col].astype(str).to_numpy() if group_col else np.full(len(frame), "All")
+        yield ids, groups, _to_upper(values, layout, n)
+
+def _iter_jsonl(source, chunksize):
+    handle = open(source, encoding="utf-8") if not hasattr(source, "read") else source
+    try:
+        ids, groups, rows = [], [], []
+        seen = 0  # nomor responden berjalan (lintas blok) untuk id default
+        for line in handle:
+            line = line.decode("utf-8") if isinstance(line, bytes) else line
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "upper" in record:
+                upper = np.asarray(record["upper"], dtype=float)
+            else:
+                matrix = np.asarray(record["matrix"], dtype=float)
+                upper = matrix[np.triu_indices(matrix.shape[0], 1)]
+            ids.append(str(record.get("respondent", seen)))
+            seen += 1
+            groups.append(str(record.get("group", "All")))
+            rows.append(upper)
+            if len(rows) == chunksize:
+                yield np.array(ids), np.array(groups), np.vstack(rows)
+                ids, groups, rows = [], [], []
+        if rows:
+            yield np.array(ids), np.array(groups), np.vstack(rows)
+    finally:
+        if handle is not source:
+            handle.close()
+
+# Akumulator jumlah log per kelompok
+class _LogMean:
+    def __init__(self, size):
+        self.size = size
+        self.sums = {}
+        self.counts = {}
+
+    def add(self, groups, values):
+        for group in np.unique(groups):
+            rows = values[groups == group]
+            self.sums[group] = self.sums.get(group, 0.0) + np.log(rows).sum(axis=0)
+            self.counts[group] = self.counts.get(group, 0) + len(rows)
+
+    def mean(self, group=None):
+        if group is None:
+            count = sum(self.counts.values())
+            total = sum(self.sums.values()) if self.sums else np.zeros(self.size)
+        else:
+            count, total = self.counts.get(group, 0), self.sums.get(group, np.zeros(self.size))
+        return np.exp(total / count) if count else None
+
+def _aggregate_weights(upper_mean, weight_mean, n, method, ahp_method):
+    matrix = pairwise_from_upper(upper_mean, n)
+    weights, cr = calculate_ahp_weights_batch(matrix, ahp_method)
+    if method == "aip":
+        weights = weight_mean / weight_mean.sum()
+    return weights, float(cr), matrix
+
+# Sebaran CR responden yang dipakai (median, persentil 90, maksimum)
+def _cr_summary(crs):
+    return {"median": float(np.median(crs)), "p90": float(np.percentile(crs, 90)), "max": float(crs.max())}
+
+# Hasil: weights dan matrix (AIJ dari responden yang konsisten), aij_consistency_ratio (CR matriks
+# gabungan), respondent_cr / respondent_ids / respondent_groups untuk semua responden yang valid,
+# consistent_cr (sebaran CR responden yang dipakai), jumlah responden per status, dan hasil per
+# kelompok (groups). consistency_ratio adalah CR yang mewakili bobot: CR matriks gabungan untuk AIJ,
+# CR tertinggi di antara responden yang dipakai untuk AIP (bobot AIP tidak berasal dari satu matriks).
+def aggregate_group_ahp(source, method="aij", ahp_method="mean", cr_threshold=0.1, layout=None,
+                        id_col=None, group_col=None, chunksize=20_000):
+    if method not in ("aij", "aip"):
+        raise ValueError(f"Unknown aggregation method: {method}")
+
+    judgements = priorities = None
+    n = None
+    ids, groups_seen, crs = [], [], []
+    invalid = 0
+    for chunk_ids, chunk_groups, upper in iter_respondents(source, chunksize, layout, id_col, group_col):
+        if n is None:
+            n = _size_from_upper(upper.shape[1])
+            if n is None:
+                raise ValueError(f"{upper.shape[1]} judgements do not form a pairwise matrix.")
+            judgements, priorities = _LogMean(upper.shape[1]), _LogMean(n)
+
+        # Penilaian kosong, nol atau negatif tidak dapat dibentuk menjadi matriks resiprokal
+        valid = np.isfinite(upper).all(axis=1) & (upper > 0).all(axis=1)
+        invalid += int((~valid).sum())
+        upper, chunk_ids, chunk_groups = upper[valid], chunk_ids[valid], chunk_groups[valid]
+        if len(upper) == 0:
+            continue
+
+        weights, cr = calculate_ahp_weights_batch(pairwise_from_upper(upper, n), ahp_method)
+        ids.append(chunk_ids)
+        groups_seen.append(chunk_groups)
+        crs.append(cr)
+
+        keep = cr <= cr_threshold
+        judgements.add(chunk_groups[keep], upper[keep])
+        priorities.add(chunk_groups[keep], weights[keep])
+
+    if n is None:
+        raise ValueError("The survey file contains no respondents.")
+    respondent_cr = np.concatenate(crs) if crs else np.zeros(0)
+    consistent = int((respondent_cr <= cr_threshold).sum())
+    if consistent == 0:
+        raise ValueError(f"No respondent has a consistency ratio of {cr_threshold} or lower.")
+
+    respondent_groups = np.concatenate(groups_seen) if groups_seen else np.zeros(0, dtype=str)
+    kept = respondent_cr <= cr_threshold
+
+    def summarise(weights, aij_cr, rows):
+        crs = respondent_cr[rows]
+        return {"weights": weights, "consistency_ratio": aij_cr if method == "aij" else float(crs.max()),
+                "aij_consistency_ratio": aij_cr, "consistent_cr": _cr_summary(crs)}
+
+    weights, cr, matrix = _aggregate_weights(judgements.mean(), priorities.mean(), n, method, ahp_method)
+    result = summarise(weights, cr, kept)
+    result.update({
+        "matrix": matrix, "n": n, "method": method,
+        "respondent_cr": respondent_cr, "respondent_ids": np.concatenate(ids) if ids else np.zeros(0, dtype=str),
+        "respondent_groups": respondent_groups,
+        "n_respondents": len(respondent_cr) + invalid, "n_consistent": consistent, "n_invalid": invalid,
+        "groups": {},
+    })
+    for group in sorted(judgements.counts):
+        group_weights, group_cr, _ = _aggregate_weights(judgements.mean(group), priorities.mean(group), n, method, ahp_method)
+        result["groups"][group] = summarise(group_weights, group_cr, kept & (respondent_groups == group))
+        result["groups"][group]["n_consistent"] = judgements.counts[group]
+    return result
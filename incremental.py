@@ -0,0 +1,128 @@
+import numpy as np
+
+from rumus import rank_scores
+
+# --- TOPSIS INKREMENTAL ---
+# Menyimpan statistik kolom (jumlah kuadrat, min/maks mentah) dan kuadrat jarak tiap
+# alternatif, sehingga perubahan satu sel cukup diperbarui dalam O(n) alih-alih O(n*m).
+#
+# Karena normalisasi Euclidean + pembobotan hanya berupa skala per kolom
+# s_j = w_j / sqrt(sum_i x_ij^2), kuadrat jarak dapat ditulis sebagai
+#     d_i^2 = sum_j s_j^2 * (x_ij - p_j)^2
+# dengan p_j nilai ekstrem mentah kolom j. Suku (x_ij - p_j)^2 disimpan per sel; kolom
+# tersebut hanya dihitung ulang penuh bila titik ideal (p_j) benar-benar bergeser.
+class IncrementalTopsis:
+    def __init__(self, matrix, weights, is_benefit, refresh_every=1000):
+        self.matrix = np.array(matrix, dtype=float)
+        self.weights = np.array(weights, dtype=float)
+        self.is_benefit = np.array(is_benefit, dtype=bool)
+        self.refresh_every = refresh_every
+        self.ideal_moves = 0  # jumlah kolom yang dihitung ulang karena titik ideal bergeser
+        self.refresh()
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    # Hitung ulang seluruh keadaan dari matriks (juga membuang akumulasi galat pembulatan)
+    def refresh(self):
+        self.sumsq = (self.matrix**2).sum(axis=0)
+        self.col_max = self.matrix.max(axis=0)
+        self.col_min = self.matrix.min(axis=0)
+        self.scale2 = self.weights**2 / self.sumsq
+        self._set_ideals()
+        self.dev_pos = (self.matrix - self.ideal_pos)**2
+        self.dev_neg = (self.matrix - self.ideal_neg)**2
+        self.dist_pos2 = self.dev_pos @ self.scale2
+        self.dist_neg2 = self.dev_neg @ self.scale2
+        self._updates = 0
+
+    def _set_ideals(self):
+        self.ideal_pos = np.where(self.is_benefit, self.col_max, self.col_min)
+        self.ideal_neg = np.where(self.is_benefit, self.col_min, self.col_max)
+
+    def update_cell(self, i, j, value):
+        old = self.matrix[i, j]
+        value = float(value)
+        if value == old:
+            return
+        self.matrix[i, j] = value
+        column = self.matrix[:, j]
+
+        # Statistik kolom: jumlah kuadrat O(1), ekstrem dipindai ulang hanya bila ekstrem lama hilang
+        self.sumsq[j] += value**2 - old**2
+        if value > self.col_max[j]:
+            self.col_max[j] = value
+        elif old == self.col_max[j] and value < old:
+            self.col_max[j] = column.max()
+        if value < self.col_min[j]:
+            self.col_min[j] = value
+        elif old == self.col_min[j] and value > old:
+            self.col_min[j] = column.min()
+
+        old_pos, old_neg = self.ideal_pos[j], self.ideal_neg[j]
+        self._set_ideals()
+        old_scale2 = self.scale2[j]
+        self.scale2[j] = self.weights[j]**2 / self.sumsq[j]
+
+        # Keluarkan kontribusi lama kolom j, perbarui simpangan, lalu masukkan kontribusi baru
+        self.dist_pos2 -= self.dev_pos[:, j] * old_scale2
+        self.dist_neg2 -= self.dev_neg[:, j] * old_scale2
+        if self.ideal_pos[j] != old_pos or self.ideal_neg[j] != old_neg:
+            self.dev_pos[:, j] = (column - self.ideal_pos[j])**2
+            self.dev_neg[:, j] = (column - self.ideal_neg[j])**2
+            self.ideal_moves += 1
+        else:
+            self.dev_pos[i, j] = (value - self.ideal_pos[j])**2
+            self.dev_neg[i, j] = (value - self.ideal_neg[j])**2
+        self.dist_pos2 += self.dev_pos[:, j] * self.scale2[j]
+        self.dist_neg2 += self.dev_neg[:, j] * self.scale2[j]
+
+        self._updates += 1
+        if self._updates >= self.refresh_every:
+            self.refresh()
+
+    def update_row(self, i, values):
+        for j in np.flatnonzero(np.asarray(values, dtype=float) != self.matrix[i]):
+            self.update_cell(i, j, values[j])
+
+    # Terapkan matriks hasil edit: hanya sel yang berbeda yang diproses.
+    # Bila terlalu banyak sel berubah, hitung ulang penuh lebih murah.
+    def update(self, matrix):
+        matrix = np.asarray(matrix, dtype=float)
+        if matrix.shape != self.matrix.shape:
+            raise ValueError(f"Matrix shape changed from {self.matrix.shape} to {matrix.shape}.")
+        rows, cols = np.nonzero(matrix != self.matrix)
+        if len(rows) > self.matrix.shape[1]:
+            self.matrix = matrix.copy()
+            self.refresh()
+            return
+        for i, j in zip(rows, cols):
+            self.update_cell(i, j, matrix[i, j])
+
+    def set_weights(self, weights):
+        self.weights = np.array(weights, dtype=float)
+        self.scale2 = self.weights**2 / self.sumsq
+        self.dist_pos2 = self.dev_pos @ self.scale2
+        self.dist_neg2 = self.dev_neg @ self.scale2
+
+    def set_is_benefit(self, is_benefit):
+        is_benefit = np.array(is_benefit, dtype=bool)
+        flipped = is_benefit != self.is_benefit
+        self.is_benefit = is_benefit
+        self._set_ideals()
+        # Membalik Benefit/Cost hanya menukar simpangan ke ideal positif dan negatif
+        self.dev_pos[:, flipped], self.dev_neg[:, flipped] = self.dev_neg[:, flipped], self.dev_pos[:, flipped]
+        self.dist_pos2 = self.dev_pos @ self.scale2
+        self.dist_neg2 = self.dev_neg @ self.scale2
+
+    # Skor dan ranking, format sama dengan rumus.topsis
+    def result(self, top_k=None, return_positions=False):
+        d_pos = np.sqrt(np.maximum(self.dist_pos2, 0))
+        d_neg = np.sqrt(np.maximum(self.dist_neg2, 0))
+        scores = d_neg / (d_pos + d_neg)
+        ranking, positions = rank_scores(scores, top_k)
+
+        if return_positions:
+            return scores.tolist(), ranking.tolist(), positions.tolist()
+        return scores.tolist(), ranking.tolist()
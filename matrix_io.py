@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- IMPOR MATRIKS KEPUTUSAN ---
+# Matriks alternatif x kriteria dibaca sekaligus dari CSV, Parquet atau Excel. Kolom nama
+# alternatif dikenali dari namanya (alternative/name/site/location) atau sebagai kolom pertama
+# yang non-numerik; kolom lain dianggap kriteria. Parquet butuh pyarrow dan Excel butuh openpyxl;
+# keduanya hanya diperlukan bila format tersebut dipakai.
+
+NAME_COLUMNS = ("alternative", "alternatives", "name", "site", "location")
+ENGINES = {".parquet": "pyarrow", ".xlsx": "openpyxl", ".xls": "xlrd"}
+
+def read_matrix(source, name_col=None):
+    name = os.fspath(getattr(source, "name", source))
+    ext = os.path.splitext(name)[1].lower()
+    try:
+        if ext == ".csv":
+            frame = pd.read_csv(source)
+        elif ext == ".parquet":
+            frame = pd.read_parquet(source)
+        elif ext in (".xlsx", ".xls"):
+            frame = pd.read_excel(source)
+        else:
+            raise ValueError(f"Unsupported matrix file type: {ext or name}")
+    except ImportError as e:
+        raise ValueError(f"Reading {ext} files needs the optional package '{ENGINES[ext]}' ({e}).") from e
+
+    if name_col is None:
+        columns = {str(c).strip().lower(): c for c in frame.columns}
+        name_col = next((columns[c] for c in NAME_COLUMNS if c in columns), None)
+        if name_col is None and len(frame.columns) and not pd.api.types.is_numeric_dtype(frame.iloc[:, 0]):
+            name_col = frame.columns[0]
+    if name_col is not None:
+        names = frame[name_col].astype(str).to_numpy()
+        frame = frame.drop(columns=[name_col])
+    else:
+        names = np.array([f"Alternative {i + 1}" for i in range(len(frame))])
+
+    # Sel non-numerik menjadi NaN dan dilaporkan oleh validate_matrix
+    values = frame.apply(pd.to_numeric, errors="coerce")
+    values.index = names
+    values.columns = [str(c).strip() for c in values.columns]
+    return values
+
+# Kolom diurutkan sesuai kriteria AHP (nama tanpa membedakan huruf besar/kecil); bila tidak ada
+# nama yang cocok tetapi jumlah kolom sama, kolom dipakai sesuai urutan.
+def align_criteria(frame, criteria):
+    lookup = {c.lower(): c for c in frame.columns}
+    matched = [lookup.get(str(c).strip().lower()) for c in criteria]
+    if all(m is not None for m in matched):
+        aligned = frame[matched]
+    elif not any(m is not None for m in matched) and frame.shape[1] == len(criteria):
+        aligned = frame
+    else:
+        missing = [c for c, m in zip(criteria, matched) if m is None]
+        raise ValueError(f"Missing criteria columns: {', '.join(map(str, missing))}")
+    aligned = aligned.copy()
+    aligned.columns = list(criteria)
+    return aligned
+
+# --- VALIDASI ---
+# Semua sel diperiksa sekaligus: kosong / non-numerik, di bawah `low`, di atas `high`. Sel yang
+# salah dikoreksi (kosong -> `low`, lalu dipotong ke [low, high]) dan dilaporkan per sel.
+def validate_matrix(values, low, high, index=None, columns=None):
+    values = np.asarray(values, dtype=float)
+    missing = ~np.isfinite(values)
+    with np.errstate(invalid="ignore"):
+        below, above = values < low, values > high
+    invalid = missing | below | above
+    # Tanpa sel bermasalah, matriks dikembalikan apa adanya (tanpa salinan, mis. untuk memmap)
+    clipped = np.clip(np.where(missing, low, values), low, high) if invalid.any() else values
+
+    rows, cols = np.nonzero(invalid)
+    issue = np.where(missing[rows, cols], "missing or not a number",
+                     np.where(below[rows, cols], f"below {low}", f"above {high}"))
+    report = pd.DataFrame({
+        "Alternative": np.asarray(index)[rows] if index is not None else rows,
+        "Criterion": np.asarray(columns)[cols] if columns is not None else cols,
+        "Value": values[rows, cols],
+        "Issue": issue,
+        "Corrected To": clipped[rows, cols],
+    })
+    return clipped, report
+
+# --- PAGINASI ---
+def page_count(n, page_size):
+    return max(1, -(-n // page_size))
+
+# Potongan baris untuk halaman `page` (mulai dari 1)
+def page_slice(n, page, page_size):
+    page = min(max(int(page), 1), page_count(n, page_size))
+    return slice((page - 1) * page_size, min(page * page_size, n))
@@ -0,0 +1,134 @@
+import numpy as np
+
+from rumus import rank_scores
+
+# --- MULTI METODE ---
+# Satu matriks keputusan dinilai dengan beberapa metode sekaligus. Statistik kolom (maks, min,
+# jumlah kuadrat) dan matriks jarak ter-normalisasi min-maks dihitung satu kali lalu dipakai
+# bersama oleh semua metode:
+#   TOPSIS  closeness ke solusi ideal (normalisasi Euclidean)
+#   SAW     jumlah terbobot normalisasi linear (x / maks untuk Benefit, min / x untuk Cost)
+#   WP      hasil kali x^w (pangkat -w untuk Cost), dinormalisasi agar berjumlah 1
+#   VIKOR   1 - Q dengan Q = v·(S - S*) / (S- - S*) + (1 - v)·(R - R*) / (R- - R*)
+# Semua skor berarah sama: semakin tinggi semakin baik.
+
+METHODS = ("TOPSIS", "SAW", "WP", "VIKOR")
+
+def shared_preprocessing(matrix, weights, is_benefit):
+    matrix = np.asarray(matrix, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+    is_benefit = np.asarray(is_benefit, dtype=bool)
+
+    col_max, col_min = matrix.max(axis=0), matrix.min(axis=0)
+    best = np.where(is_benefit, col_max, col_min)
+    worst = np.where(is_benefit, col_min, col_max)
+    spread = best - worst
+    # Jarak ke nilai terbaik per kolom dalam [0, 1]; kolom konstan tidak membedakan alternatif
+    with np.errstate(invalid="ignore", divide="ignore"):
+        regret = np.where(spread != 0, (best - matrix) / spread, 0.0)
+    return {
+        "matrix": matrix, "weights": weights, "is_benefit": is_benefit,
+        "col_max": col_max, "col_min": col_min, "best": best, "worst": worst,
+        "norm": np.sqrt(np.einsum("ij,ij->j", matrix, matrix)),
+        "weighted_regret": regret * weights,
+    }
+
+def _topsis(pre):
+    scale = pre["weights"] / pre["norm"]
+    weighted = pre["matrix"] * scale
+    d_pos = np.sqrt(((weighted - pre["best"] * scale)**2).sum(axis=1))
+    d_neg = np.sqrt(((weighted - pre["worst"] * scale)**2).sum(axis=1))
+    return d_neg / (d_pos + d_neg)
+
+def _saw(pre):
+    matrix, is_benefit = pre["matrix"], pre["is_benefit"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        linear = np.where(is_benefit, matrix / pre["col_max"], pre["col_min"] / matrix)
+    return linear @ pre["weights"]
+
+def _wp(pre):
+    # Dihitung di ruang log agar hasil kali banyak kriteria tidak underflow
+    exponents = np.where(pre["is_benefit"], pre["weights"], -pre["weights"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_s = np.log(pre["matrix"]) @ exponents
+    finite = np.isfinite(log_s)
+    s = np.exp(log_s - (log_s[finite].max() if finite.any() else 0.0))
+    return s / s.sum()
+
+def _vikor(pre, v=0.5):
+    s = pre["weighted_regret"].sum(axis=1)
+    r = pre["weighted_regret"].max(axis=1)
+
+    def scaled(x):
+        span = x.max() - x.min()
+        return (x - x.min()) / span if span > 0 else np.zeros_like(x)
+
+    return 1 - (v * scaled(s) + (1 - v) * scaled(r))
+
+_SCORERS = {"TOPSIS": _topsis, "SAW": _saw, "WP": _wp, "VIKOR": _vikor}
+
+# Skor semua metode terpilih dari satu preprocessing -> {metode: skor (n,)}
+def multi_method_scores(matrix, weights, is_benefit, methods=METHODS, vikor_v=0.5):
+    unknown = [m for m in methods if m not in _SCORERS]
+    if unknown:
+        raise ValueError(f"Unknown method(s): {', '.join(unknown)}")
+    pre = shared_preprocessing(matrix, weights, is_benefit)
+    return {m: _vikor(pre, vikor_v) if m == "VIKOR" else _SCORERS[m](pre) for m in methods}
+
+# Peringkat 1-based per metode (k, n); skor NaN diletakkan di urutan terakhir
+def method_positions(scores):
+    stacked = np.vstack([np.nan_to_num(s, nan=-np.inf) for s in scores.values()])
+    return rank_scores(stacked)[1]
+
+# --- KONSENSUS ---
+# Borda: jumlah poin (n - peringkat) dari setiap metode.
+def borda(positions):
+    positions = np.atleast_2d(positions)
+    return (positions.shape[1] - positions).sum(axis=0).astype(float)
+
+# Copeland: jumlah lawan yang dikalahkan oleh mayoritas metode dikurangi jumlah lawan yang
+# mengalahkannya. Matriks duel (k, blok, n) dibangun per blok baris agar memori tetap terbatas.
+def copeland(positions, block_cells=1 << 22):
+    positions = np.atleast_2d(positions)
+    k, n = positions.shape
+    block = max(1, block_cells // (k * n))
+    result = np.zeros(n)
+    for start in range(0, n, block):
+        rows = positions[:, start:start + block]
+        wins = (rows[:, :, None] < positions[:, None, :]).sum(axis=0)
+        losses = (rows[:, :, None] > positions[:, None, :]).sum(axis=0)
+        result[start:start + block] = (wins > losses).sum(axis=1) - (losses > wins).sum(axis=1)
+    return result
+
+CONSENSUS = {"Borda": borda, "Copeland": copeland}
+
+# Batas jumlah alternatif untuk Copeland (k·n² perbandingan)
+COPELAND_MAX_ALTERNATIVES = 10_000
+
+# Hasil lengkap untuk tab perbandingan: skor, peringkat per metode, skor dan peringkat konsensus,
+# rentang peringkat tiap alternatif, dan korelasi peringkat Spearman antar metode.
+def compare_methods(matrix, weights, is_benefit, methods=METHODS, consensus="Borda", vikor_v=0.5):
+    if consensus not in CONSENSUS:
+        raise ValueError(f"Unknown consensus rule: {consensus}")
+    if consensus == "Copeland" and len(matrix) > COPELAND_MAX_ALTERNATIVES:
+        raise ValueError(f"Copeland consensus is limited to {COPELAND_MAX_ALTERNATIVES:,} alternatives "
+                         f"(got {len(matrix):,}); use Borda instead.")
+    scores = multi_method_scores(matrix, weights, is_benefit, methods, vikor_v)
+    positions = method_positions(scores)
+    consensus_scores = CONSENSUS[consensus](positions)
+    _, consensus_positions = rank_scores(consensus_scores)
+
+    # Tanpa seri, Spearman = korelasi Pearson dari peringkat
+    if len(methods) > 1 and positions.shape[1] > 1:
+        agreement = np.corrcoef(positions)
+    else:
+        agreement = np.ones((len(methods), len(methods)))
+    return {
+        "scores": scores,
+        "positions": positions,
+        "consensus_scores": consensus_scores,
+        "consensus_positions": consensus_positions,
+        "rank_spread": positions.max(axis=0) - positions.min(axis=0),
+        "agreement": agreement,
+    }
@@ -1,12 +1,31 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-from rumus import calculate_ahp_weights, topsis, profile_matching 
-import matplotlib.pyplot as plt
-from io import BytesIO
+from rumus import calculate_ahp_weights, profile_matching, compile_gap_weight, pairwise_from_upper, rank_scores, GAP_WEIGHTS
+from sensitivity import monte_carlo_sensitivity
+from incremental import IncrementalTopsis
+from result_cache import RESULT_CACHE, content_hash
+from charts import bar_chart_png, radar_chart_png
+from tracing import begin_trace, end_trace, current_trace, span, chrome_trace_events, enabled_by_env
+from spatial import load_candidates, load_points, spatial_criteria, rescale
+from stability import topsis_weight_stability, profile_matching_weight_stability
+from group_ahp import aggregate_group_ahp
+from skyline import topsis_prefiltered, profile_matching_prefiltered
+from multi_method import METHODS, COPELAND_MAX_ALTERNATIVES, compare_methods
+from rank_reversal import topsis_leave_one_out
+from matrix_io import read_matrix, align_criteria, validate_matrix, page_count, page_slice
+from project_store import save_snapshot, load_snapshot, list_projects, list_versions, diff_snapshots
+from export import FORMATS, available_formats, export_tempfile, topsis_breakdown, profile_matching_breakdown
+from collections import deque
+from fractions import Fraction
 import base64
+import functools
+import json
+import os
+import time
 
-# Fungsi untuk encode gambar lokal sebagai base64
+# Fungsi untuk encode gambar lokal sebagai base64 (di-cache sekali per proses)
+@st.cache_resource
 def get_base64_of_bin_file(bin_file_path):
     with open(bin_file_path, 'rb') as f:
         return base64.b64encode(f.read()).decode()
@@ -14,14 +33,53 @@ def get_base64_of_bin_file(bin_file_path):
 # Ganti dengan nama file gambar kamu
 image_path = "kopi.jpg"
 overlay_image_path = "biji_kopi.jpg"
-sidebar_base64 = get_base64_of_bin_file(overlay_image_path)
-background_base64 = get_base64_of_bin_file(image_path)
 # background_base64 = sidebar_base64  # Use the same image for background, or load a different one if desired
 
 st.set_page_config(page_title="📍 Decision Support System for Coffee Shop Site Selection in D.I. Yogyakarta", layout="wide")
 
-# Sisipkan CSS dengan gambar sebagai latar belakang halaman utama
-st.markdown(f"""
+# Rerun penuh sedang berjalan (dibersihkan di akhir skrip); rerun fragment tidak menyentuhnya
+st.session_state["full_rerun"] = True
+
+# Opt-in profiling: one trace per rerun, with named spans around each stage (no-op when disabled)
+profiling_enabled = st.session_state.get("profiling", enabled_by_env())
+if profiling_enabled:
+    begin_trace(time.strftime("rerun %H:%M:%S"))
+else:
+    end_trace()
+
+# Riwayat trace per sesi untuk panel profiling (N rerun terakhir)
+def record_trace(trace):
+    if trace is None:
+        return
+    history_size = st.session_state.get("profiling_history", 10)
+    traces = st.session_state.get("traces")
+    if traces is None or traces.maxlen != history_size:
+        traces = deque(traces or [], maxlen=history_size)
+        st.session_state["traces"] = traces
+    traces.append(trace)
+
+# Fragment yang di-rerun sendiri tidak melewati begin_trace / end_trace di level skrip, jadi
+# fragment membuka trace sendiri bila profiling aktif dan belum ada trace (rerun penuh sudah punya)
+def profiled_fragment(key):
+    def decorate(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if not st.session_state.get("profiling", enabled_by_env()) or current_trace() is not None:
+                return func(*args, **kwargs)
+            begin_trace(f"{key} " + time.strftime("%H:%M:%S"))
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_trace(end_trace())
+        return st.fragment(run, key=key)
+    return decorate
+
+# Sisipkan CSS dengan gambar sebagai latar belakang halaman utama (string CSS dibangun sekali per proses)
+@st.cache_resource
+def build_page_css(image_path, overlay_image_path):
+    background_base64 = get_base64_of_bin_file(image_path)
+    sidebar_base64 = get_base64_of_bin_file(overlay_image_path)
+    return f"""
     <style>
     /* Set background image for main app */
     .stApp {{
@@ -85,229 +143,530 @@ st.markdown(f"""
         border-radius: 10px;
     }}
     </style>
-""", unsafe_allow_html=True)
-
-# Set the title and subheader for the app
-st.title("📍 Decision Support System for Coffee Shop Site Selection in D.I. Yogyakarta")
-st.subheader("🔎 AHP-Weighted Decision Making Using TOPSIS and Profile Matching")
-st.markdown("---")
-
-# Sidebar Navigation
-tabs = ["☕ Weighting", "☕ AHP + TOPSIS", "☕ AHP + Profile Matching"]
-selected_tab = st.sidebar.radio("Select Tab", tabs)
-
-# Tab 1: Weighting (AHP)
-if selected_tab == "☕ Weighting":
-    st.header("☕ Weighting Criteria with AHP")
-    st.subheader("1️⃣ Input Criteria and Alternatives")
-
-    # Input for criteria and alternatives
-    num_criteria = st.number_input("Number of Criteria", min_value=2, value=3, step=1, key="num_criteria")
-    num_alternatives = st.number_input("Number of Alternatives", min_value=2, value=3, step=1, key="num_alternatives")
-
-    criteria = [st.text_input(f"Criterion Name {i+1}", key=f"crit_{i}") for i in range(num_criteria)]
-    alternatives = [st.text_input(f"Alternative Name {i+1}", key=f"alt_{i}") for i in range(num_alternatives)]
-    
-    # Ensure criteria names are unique and non-empty
-    if len(set([c.strip() for c in criteria if c.strip() != ""])) != len(criteria) or any(c.strip() == "" for c in criteria):
-        st.error("All criteria names must be unique and non-empty.")
-    
-    if all(criteria) and all(alternatives) and len(set([c.strip() for c in criteria])) == len(criteria):
-        st.markdown("---")
-        st.header("2️⃣ Pairwise Comparison of Criteria")
-    
-    # if all(criteria) and all(alternatives):
-    #     st.markdown("---")
-    #     st.header("2️⃣ Pairwise Comparison of Criteria")
-
-        A = np.ones((num_criteria, num_criteria))
-        # Pairwise comparison (AHP)
-        st.write("""
-        **Pairwise Comparison Scale:**
-        - **1**: Equally Preferred
-        - **2**: Equally to Moderately
-        - **3**: Moderately Preferred
-        - **4**: Moderately to Strongly
-        - **5**: Strongly Preferred
-        - **6**: Strongly to Very Strongly
-        - **7**: Very Strongly Preferred
-        - **8**: Very Strongly to Extremely
-        - **9**: Extremely Preferred
-        """)
-        for i in range(num_criteria):
-            for j in range(i + 1, num_criteria):
-                with st.expander(f"Compare {criteria[i]} vs {criteria[j]}"):
-                    col1, col2 = st.columns([1, 3])
-
-                    with col1:
-                        higher_priority = st.radio(
-                            "Select the more important criterion",
-                            [criteria[i], criteria[j]],
-                            # index=0 if default_radio == criteria[i] else 1,
-                            key=f"crit_radio_{i}_{j}",
-                            horizontal=True
-                        )
-
-                    with col2:
-                        if higher_priority == criteria[i]:
-                            prompt = f"How much more important is {criteria[i]} compared to {criteria[j]}?"
-                        else:
-                            prompt = f"How much more important is {criteria[j]} compared to {criteria[i]}?"
-
-                        value = st.slider(prompt, 1, 9, key=f"crit_slider_{i}_{j}")
-
-                        if higher_priority == criteria[i]:
-                            A[i][j] = value
-                            A[j][i] = 1 / value
-                        else:
-                            A[j][i] = value
-                            A[i][j] = 1 / value
-
-        weights, cr = calculate_ahp_weights(A)
-
-        st.subheader("⚖️  Criteria Weights")
-        weight_table = {"Criteria": criteria, "Weight": [round(w, 4) for w in weights]}
-        st.dataframe(weight_table, use_container_width=True)
-
-        st.info(f"Consistency Ratio (CR): {cr:.4f}")
-        if cr > 0.1:
-            st.error("Consistency Ratio exceeds 0.1. Please review your pairwise comparisons for consistency.")
+"""
+
+with span("app.assets_css"):
+    st.markdown(build_page_css(image_path, overlay_image_path), unsafe_allow_html=True)
+
+# Kriteria spasial opsional: kandidat lokasi + layer titik (kompetitor, kampus, halte) diunggah,
+# lalu kolom matriks keputusan diisi dari kueri indeks grid dan diskalakan ke [low, high]
+def spatial_criteria_input(criteria, alternatives, low, high, key, decimals=None):
+    with st.expander("🗺️ Spatial Criteria from Point Layers (optional)"):
+        st.markdown("Upload candidate sites and point layers to compute proximity and density criteria automatically.")
+        candidates_file = st.file_uploader("Candidate sites (CSV with name, lat, lon)", type=["csv"], key=f"{key}_candidates")
+        layer_files = st.file_uploader("Point layers (CSV with lat/lon or GeoJSON points)", type=["csv", "geojson", "json"],
+                                       accept_multiple_files=True, key=f"{key}_layers")
+        if candidates_file is None or not layer_files:
+            return alternatives, {}
+
+        try:
+            names, coords = load_candidates(candidates_file)
+            layers = {os.path.splitext(f.name)[0]: load_points(f) for f in layer_files}
+        except (ValueError, KeyError) as e:
+            st.error(f"Could not read spatial data: {e}")
+            return alternatives, {}
+
+        if st.checkbox(f"Use the {len(names)} candidate sites as alternatives", key=f"{key}_use_candidates"):
+            alternatives = names
         else:
-            st.success("Consistency Ratio is within acceptable limits. Weights calculated successfully.")
-
-        # Save weights and criteria for use in the next tab
-        st.session_state["criteria"] = criteria
-        st.session_state["weights"] = weights
-        st.session_state["alternatives"] = alternatives
-
-# Tab 2: TOPSIS
-elif selected_tab == "☕ AHP + TOPSIS":
-    st.header("☕ TOPSIS Method")
-
-    if "criteria" not in st.session_state or "alternatives" not in st.session_state or "weights" not in st.session_state:
-        st.warning("Please complete the data in the Weighting tab first.")
+            missing = [a for a in alternatives if a not in names]
+            if missing:
+                st.warning(f"No coordinates for: {', '.join(missing)}. Their spatial values stay manual.")
+
+        options = ["Manual input"]
+        for layer in layers:
+            options += [f"Distance to nearest: {layer}", f"Count within radius: {layer}"]
+        specs = []
+        for i, crit in enumerate(criteria):
+            cols = st.columns([3, 1])
+            choice = cols[0].selectbox(f"Source for '{crit}'", options, key=f"{key}_source_{i}")
+            if choice.startswith("Distance"):
+                specs.append({"name": crit, "layer": choice.split(": ", 1)[1], "kind": "nearest"})
+            elif choice.startswith("Count"):
+                radius = cols[1].number_input("Radius (m)", min_value=10, value=500, step=50, key=f"{key}_radius_{i}")
+                specs.append({"name": crit, "layer": choice.split(": ", 1)[1], "kind": "count", "radius": radius})
+        if not specs:
+            return alternatives, {}
+
+        with span("app.spatial_criteria"):
+            raw = RESULT_CACHE.call(spatial_criteria, coords, layers, specs)
+        st.caption(f"Values are rescaled linearly to {low}-{high}; larger distances and counts give larger values, "
+                   "so set distance-to-competitor as Benefit and distance-to-campus as Cost where appropriate.")
+
+        position = {name: i for i, name in enumerate(names)}
+        rows = [position.get(a) for a in alternatives]
+        found = np.array([r is not None for r in rows])
+        index = np.array([r for r in rows if r is not None], dtype=int)
+        columns = {}
+        for spec in specs:
+            values = np.full(len(alternatives), np.nan)
+            values[found] = rescale(raw[spec["name"]].to_numpy()[index], low, high, decimals)
+            columns[spec["name"]] = values
+        return alternatives, columns
+
+# Nilai perbandingan dari sel tabel / CSV: angka atau pecahan seperti "1/3"; NaN bila tidak terbaca
+def parse_judgement(value):
+    try:
+        return float(Fraction(str(value).strip()))
+    except (ValueError, ZeroDivisionError):
+        return np.nan
+
+# Matriks perbandingan berpasangan dalam satu tabel: hanya segitiga atas yang dibaca, kebalikannya
+# diisi otomatis. Satu widget editor menggantikan n(n-1)/2 expander berisi radio + slider.
+def pairwise_matrix_input(criteria):
+    n = len(criteria)
+    upper = np.triu(np.ones((n, n), dtype=bool), 1)
+    csv_file = st.file_uploader("Pairwise matrix CSV (optional: full or upper-triangle matrix, labels allowed)",
+                                type=["csv"], key="pairwise_csv")
+    initial = np.ones((n, n))
+    loaded = st.session_state.get("pairwise_loaded")
+    if csv_file is None and loaded is not None and np.shape(loaded) == (n, n):
+        initial = np.asarray(loaded, dtype=float)
+    if csv_file is not None:
+        table = pd.read_csv(csv_file, header=None, dtype=str, keep_default_na=False).to_numpy()
+        values = np.vectorize(parse_judgement, otypes=[float])(table)
+        # Baris / kolom label (nama kriteria) dilewati
+        if table.shape[0] > 1 and np.isnan(values[0, 1:]).all():
+            values = values[1:]
+        if table.shape[1] > 1 and np.isnan(values[:, 0]).all():
+            values = values[:, 1:]
+        if values.shape != (n, n):
+            st.error(f"The CSV holds a {values.shape[0]}x{values.shape[1]} matrix, but {n} criteria are defined above.")
+            return None
+        lower = values.T[upper]
+        if np.isfinite(lower).all() and not np.allclose(lower * values[upper], 1, rtol=1e-2):
+            st.warning("The lower triangle of the CSV is not the reciprocal of the upper triangle; only the upper triangle is used.")
+        initial = values
+
+    st.caption("Enter how much more important the row criterion is than the column criterion, above the diagonal only "
+               "(e.g. 3, or 0.333 when the column criterion is moderately preferred). Reciprocals are filled in automatically.")
+    editor_df = pd.DataFrame(np.where(upper, initial, np.nan), index=criteria, columns=criteria)
+    source_id = getattr(csv_file, "file_id", None) or (csv_file.name if csv_file is not None
+                                                         else st.session_state.get("project_loaded_id", "manual"))
+    edited = st.data_editor(
+        editor_df, use_container_width=True, num_rows="fixed", key=f"pairwise_editor_{n}_{source_id}",
+        column_config={c: st.column_config.NumberColumn(c, min_value=0.11, max_value=9.0, format="%.3f") for c in criteria}
+    )
+
+    judgements = edited.to_numpy(dtype=float)[upper]
+    if not (np.isfinite(judgements) & (judgements > 0)).all():
+        st.error("Every cell above the diagonal needs a positive value.")
+        return None
+    if ((judgements < 1 / 9 - 1e-3) | (judgements > 9)).any():
+        st.warning("Values outside the Saaty scale 1/9 to 9 have been clipped.")
+    A = pairwise_from_upper(np.clip(judgements, 1 / 9, 9), n)
+    with st.expander("Completed reciprocal matrix"):
+        st.dataframe(pd.DataFrame(np.round(A, 4), index=criteria, columns=criteria), use_container_width=True)
+    return A
+
+# Matriks default bernilai 1 (atau matriks hasil impor), dengan kolom spasial (bila ada) terisi
+# untuk alternatif yang ditemukan
+def default_matrix(criteria, alternatives, spatial_columns, base=None):
+    if base is None:
+        matrix_df = pd.DataFrame(np.ones((len(alternatives), len(criteria))), columns=criteria, index=alternatives)
+    elif list(base.index) == list(alternatives):
+        # Salinan dangkal: matriks hasil impor / memmap proyek tidak disalin; kolom spasial yang
+        # ditimpa di bawah hanya menyalin kolom tersebut
+        matrix_df = base.copy(deep=False)
     else:
-        criteria = st.session_state.criteria
-        alternatives = st.session_state.alternatives
-        weights = st.session_state.weights
-
-        st.subheader("📈 Define Criteria Type (Benefit or Cost)")
+        matrix_df = base.reindex(alternatives)
+    for crit, values in spatial_columns.items():
+        matrix_df[crit] = np.where(np.isnan(values), matrix_df[crit].fillna(1.0), values)
+    return matrix_df
+
+# Impor matriks alternatif x kriteria dari file; alternatif diambil dari kolom nama di file
+def import_matrix_input(criteria, key):
+    with st.expander("📂 Import Decision Matrix (CSV / Parquet / Excel)"):
+        matrix_file = st.file_uploader("Alternatives x criteria file with an alternative name column",
+                                       type=["csv", "parquet", "xlsx", "xls"], key=f"{key}_file")
+        if matrix_file is None:
+            # Matriks dari proyek yang dimuat (memmap, tanpa salinan)
+            return st.session_state.get(f"{key}_loaded")
+        try:
+            with span("app.matrix_import"):
+                imported = RESULT_CACHE.get_or_compute(
+                    content_hash("matrix_import", matrix_file.getvalue(), matrix_file.name, list(criteria)),
+                    lambda: align_criteria(read_matrix(matrix_file), criteria)
+                )
+        except ValueError as e:
+            st.error(f"Could not import the decision matrix: {e}")
+            return None
+        st.caption(f"Imported {len(imported):,} alternatives; they replace the alternatives entered in the Weighting tab.")
+        return imported
+
+# Editor matriks keputusan. Matriks besar diedit per halaman: hanya potongan halaman yang dikirim
+# ke browser, dan hanya halaman yang diubah yang disalin ke session state. Matriks dasar (mis. memmap
+# proyek yang dimuat) tidak pernah ditulis; salinan penuh baru dibuat bila ada halaman yang diedit.
+def matrix_editor(matrix_df, key, page_size=200):
+    if len(matrix_df) <= page_size:
+        return st.data_editor(matrix_df, use_container_width=True, num_rows="fixed", key=key)
+
+    base_hash = content_hash(matrix_df.to_numpy(), list(matrix_df.index), list(matrix_df.columns))
+    store = st.session_state.get(f"{key}_store")
+    if store is None or store["base"] != base_hash:
+        store = {"base": base_hash, "pages": {}, "merged": None}
+        st.session_state[f"{key}_store"] = store
+
+    pages = page_count(len(matrix_df), page_size)
+    page = st.number_input(f"Page (of {pages:,}; {page_size} alternatives per page, {len(matrix_df):,} in total)",
+                           min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    rows = page_slice(len(matrix_df), page, page_size)
+    page_df = matrix_df.iloc[rows]
+    if page in store["pages"]:
+        page_df = pd.DataFrame(store["pages"][page], index=page_df.index, columns=page_df.columns)
+    edited = st.data_editor(page_df, use_container_width=True, num_rows="fixed", key=f"{key}_page_{page}").to_numpy(dtype=float)
+
+    # Simpan halaman hanya bila berbeda dari matriks dasar
+    original = matrix_df.iloc[rows].to_numpy()
+    if not np.array_equal(edited, original, equal_nan=True):
+        if page not in store["pages"] or not np.array_equal(edited, store["pages"][page], equal_nan=True):
+            store["pages"][page] = edited.copy()
+            store["merged"] = None
+    elif store["pages"].pop(page, None) is not None:
+        store["merged"] = None
+
+    if not store["pages"]:
+        return matrix_df
+    if store["merged"] is None:
+        merged = matrix_df.to_numpy(dtype=float, copy=True)
+        for p, values in store["pages"].items():
+            merged[page_slice(len(matrix_df), p, page_size)] = values
+        store["merged"] = pd.DataFrame(merged, index=matrix_df.index, columns=matrix_df.columns, copy=False)
+    return store["merged"]
+
+# Validasi rentang seluruh matriks sekaligus; sel yang dikoreksi dilaporkan per sel
+def validated_matrix(matrix_df, low, high, max_report=1000):
+    values, report = validate_matrix(matrix_df.to_numpy(), low, high, matrix_df.index, matrix_df.columns)
+    if len(report):
+        st.warning(f"{len(report):,} cells were empty or outside {low} to {high} and have been corrected.")
+        with st.expander("🧾 Validation report"):
+            st.dataframe(report.head(max_report), use_container_width=True, hide_index=True)
+            if len(report) > max_report:
+                st.caption(f"Showing the first {max_report:,} of {len(report):,} corrected cells.")
+    return pd.DataFrame(values, index=matrix_df.index, columns=matrix_df.columns, copy=False)
+
+# Unduhan tabel peringkat: file baru ditulis (per chunk, ke file sementara) saat tombol diklik
+# Tabel peringkat: hanya top-N dan satu halaman yang dikirim ke browser, bukan seluruh baris.
+# `build(rows)` membuat DataFrame untuk potongan peringkat `rows` (slice posisi 0-based).
+def ranked_table(build, n, key, top_n=10, page_size=200):
+    st.dataframe(build(slice(0, min(top_n, n))), use_container_width=True, hide_index=True)
+    if n > top_n:
+        with st.expander(f"📄 Browse all {n:,} ranked alternatives"):
+            pages = page_count(n, page_size)
+            page = st.number_input(f"Page (of {pages:,}; {page_size} alternatives per page)",
+                                   min_value=1, max_value=pages, value=1, key=f"{key}_page")
+            st.dataframe(build(page_slice(n, page, page_size)), use_container_width=True, hide_index=True)
+
+def ranking_downloads(alternatives, scores, ranking, breakdown, file_stem, key):
+    st.markdown("📥 Download ranked results (scores, ranks and per-criterion breakdown):")
+    formats = available_formats()
+    for col, fmt in zip(st.columns(len(formats)), formats):
+        ext, mime = FORMATS[fmt]
+        col.download_button(
+            fmt,
+            data=lambda fmt=fmt: export_tempfile(fmt, alternatives, scores, ranking, breakdown),
+            file_name=f"{file_stem}{ext}",
+            mime=mime,
+            on_click="ignore",
+            key=f"{key}_{fmt}"
+        )
 
+# --- PROYEK ---
+# Snapshot state sesi ke project_store: nilai kecil di meta.json, matriks / skor / nama alternatif
+# sebagai .npy yang dibuka kembali dengan memmap
+PROJECT_META_KEYS = ["criteria", "alternatives", "weights", "is_benefit", "pm_ideal", "cf_sf_grouping", "pm_gap_settings"]
+PROJECT_ARRAY_KEYS = ["pairwise_matrix", "topsis_matrix", "topsis_alternatives", "topsis_scores",
+                      "decision_matrix", "pm_alternatives", "pm_scores"]
+
+def save_project_snapshot(project, note=""):
+    meta = {}
+    for key in PROJECT_META_KEYS:
+        if key not in st.session_state:
+            continue
+        value = st.session_state[key]
+        if key == "pm_gap_settings":
+            # Kunci dict berupa angka; disimpan sebagai pasangan agar tidak berubah menjadi string di JSON
+            meta[key] = {"mapping": [[float(g), float(w)] for g, w in value["mapping"].items()],
+                         "interpolate": bool(value["interpolate"])}
+        else:
+            meta[key] = np.asarray(value).tolist()
+    arrays = {key: st.session_state[key] for key in PROJECT_ARRAY_KEYS if key in st.session_state}
+    return save_snapshot(project, meta, arrays, note=note)
+
+# Dipanggil sebagai on_click sehingga state widget dapat diisi sebelum widget dibuat ulang
+def load_project_snapshot(project, version):
+    try:
+        meta, arrays, info = load_snapshot(project, version)
+    except (ValueError, OSError) as e:
+        st.session_state["project_message"] = ("error", f"Could not load the project: {e}")
+        return
+
+    for key in ["topsis_scorer", "topsis_result", "pm_result", "topsis_import_loaded", "pm_import_loaded", "pairwise_loaded"]:
+        st.session_state.pop(key, None)
+    for key, value in meta.items():
+        st.session_state[key] = value
+    if "pm_gap_settings" in meta:
+        st.session_state["pm_gap_settings"] = {"mapping": dict(map(tuple, meta["pm_gap_settings"]["mapping"])),
+                                               "interpolate": meta["pm_gap_settings"]["interpolate"]}
+    for key, value in arrays.items():
+        st.session_state[key] = value
+
+    # Widget di tab-tab diisi ulang dari snapshot
+    criteria = meta.get("criteria", [])
+    st.session_state["num_criteria"] = max(len(criteria), 2)
+    for i, crit in enumerate(criteria):
+        st.session_state[f"crit_{i}"] = crit
+    alternatives = meta.get("alternatives", [])
+    st.session_state["num_alternatives"] = max(len(alternatives), 2)
+    for i, alt in enumerate(alternatives):
+        st.session_state[f"alt_{i}"] = alt
+    for i, benefit in enumerate(meta.get("is_benefit", [])):
+        st.session_state[f"type_{i}"] = "Benefit" if benefit else "Cost"
+    for i, ideal in enumerate(meta.get("pm_ideal", [])):
+        st.session_state[f"ideal_{i}"] = int(ideal)
+    for i, group in enumerate(meta.get("cf_sf_grouping", [])):
+        st.session_state[f"cf_sf_{i}"] = "CF (Core Factor)" if group == "CF" else "SF (Secondary Factor)"
+    if "pairwise_matrix" in arrays:
+        st.session_state["pairwise_input_mode"] = "Matrix (table / CSV)"
+        st.session_state["pairwise_loaded"] = arrays["pairwise_matrix"]
+    for prefix, matrix_key, names_key in (("topsis", "topsis_matrix", "topsis_alternatives"), ("pm", "decision_matrix", "pm_alternatives")):
+        if matrix_key in arrays and names_key in arrays and len(criteria) == np.shape(arrays[matrix_key])[1]:
+            st.session_state[f"{prefix}_import_loaded"] = pd.DataFrame(arrays[matrix_key], index=arrays[names_key],
+                                                                       columns=criteria, copy=False)
+    st.session_state["project_loaded_id"] = f"{project}-v{info['version']}"
+    st.session_state["project_message"] = ("success", f"Loaded {project} v{info['version']} ({info['saved_at']}).")
+
+# --- FRAGMENT TAB TOPSIS & PROFILE MATCHING ---
+# Tiap tab dibagi menjadi fragment agar sebuah interaksi hanya menjalankan ulang bagian yang
+# bergantung padanya: tipe kriteria / sel matriks hanya menjalankan fragment input, opsi dan
+# tombol hitung hanya fragment hasil (CSS, sidebar dan fragment lain tidak ikut dijalankan).
+# Fragment bertukar data lewat session state. Hasil perhitungan disimpan bersama input yang
+# dipakainya dan dirender ulang pada setiap rerun; bila input sudah berubah, hasil lama tetap
+# tampil dengan catatan.
+STALE_RESULT_NOTE = "The inputs have changed since these results were calculated. Press the calculate button to update them."
+
+# True bila salah satu input saat ini berbeda dari input yang dipakai untuk menghitung `result`
+def inputs_changed(result, **current):
+    return any(not np.array_equal(np.asarray(result["inputs"][name]), np.asarray(value))
+               for name, value in current.items())
+
+# Disimpan di akhir fragment input. Fragment hasil tidak ikut dijalankan saat fragment input
+# di-rerun sendiri, jadi bila perubahan ini membuat hasil tersimpan usang, membuatnya kembali
+# sesuai (catatan harus hilang), atau mengubah jumlah alternatif yang menjadi batas widget di
+# fragment hasil, seluruh aplikasi di-rerun sekali.
+# Pada rerun penuh fragment hasil memang dijalankan setelahnya, jadi tidak perlu rerun lagi.
+def publish_inputs(inputs_key, result_key, inputs):
+    previous = st.session_state.get(inputs_key)
+    st.session_state[inputs_key] = inputs
+    result = st.session_state.get(result_key)
+    if previous is None or result is None or st.session_state.get("full_rerun"):
+        return
+    shared = {name: value for name, value in inputs.items() if name in result["inputs"]}
+    if not inputs_changed({"inputs": previous}, **shared):
+        return
+    was_current = not inputs_changed(result, **{name: previous[name] for name in shared})
+    if was_current != (not inputs_changed(result, **shared)) or len(previous.get("alternatives", ())) != len(inputs.get("alternatives", ())):
+        st.rerun(scope="app")
+
+@profiled_fragment("topsis_inputs_fragment")
+def topsis_inputs(criteria, alternatives, weights):
+    st.subheader("📈 Define Criteria Type (Benefit or Cost)")
+
+    with span("app.topsis_inputs"):
         is_benefit = []
         for i in range(len(criteria)):
-            previous_type = st.session_state.get(f"type_{i}", "Benefit")
             ctype = st.selectbox(f"Criteria Type for '{criteria[i]}'", ["Benefit", "Cost"], key=f"type_{i}")
             is_benefit.append(ctype == "Benefit")
 
         st.subheader("📥 Input Decision Matrix")
+        imported = import_matrix_input(criteria, key="topsis_import")
+        if imported is not None:
+            alternatives = list(imported.index)
+        alternatives, spatial_columns = spatial_criteria_input(criteria, alternatives, 1, 10, key="topsis_spatial")
         st.markdown("🧾 Please fill in values for each alternative against the criteria (in scale 1 to 10):")
 
-        matrix_df = pd.DataFrame(np.ones((len(alternatives), len(criteria))),
-                     columns=criteria, index=alternatives)
-        
-        matrix_df = st.data_editor(matrix_df, use_container_width=True, num_rows="fixed")
-
-        # Check if any value exceeds 10
-        if (matrix_df > 10).any().any():
-            st.warning("Some values exceed 10 and have been automatically capped at 10.")
-
-        # Cap values at a maximum of 10
-        matrix_df = matrix_df.clip(upper=10)
-
-        if st.button("🔍 Calculate Location Ranking (TOPSIS)"):
-            st.subheader("🏆 TOPSIS Calculation Results")
-            decision_matrix = matrix_df.values.tolist()
-            scores, ranking = topsis(decision_matrix, weights, is_benefit)
-
-            result_df = pd.DataFrame({
-                "Alternative": alternatives,
-                "TOPSIS Score": [round(score, 4) for score in scores],
-                "Ranking": [ranking.index(i) + 1 for i in range(len(alternatives))]
-            })
-
-            st.dataframe(result_df.sort_values(by="Ranking"), use_container_width=True)
-            st.success("TOPSIS calculation completed successfully.")
-            best_alternative = result_df[result_df["Ranking"] == 1].iloc[0]
-            st.success(f"⭐ The best alternative is **{best_alternative['Alternative']}** with a score of {best_alternative['TOPSIS Score']:.4f}.")
-            
-            # Visualization of TOPSIS Scores
-            st.subheader("📊 Visualization of TOPSIS Scores")
-
-            # Create a bar chart using matplotlib
-            fig, ax = plt.subplots()
-            result_df_sorted = result_df.sort_values(by="Ranking")
-            ax.bar(result_df_sorted["Alternative"], result_df_sorted["TOPSIS Score"], color='saddlebrown')
-            ax.set_title("TOPSIS Scores")
-            ax.set_xlabel("Alternative")
-            ax.set_ylabel("Score")
-            fig.set_size_inches(5, 3)
-            plt.xticks(rotation=45, ha='right')
-
-            # Display the chart in Streamlit
-            st.pyplot(fig)
-
-            # Add a download button for the chart
-            buf = BytesIO()
-            fig.savefig(buf, format="png")
-            buf.seek(0)
-            st.download_button(
-                label="📥 Download Chart as Image",
-                data=buf,
-                file_name="topsis_scores.png",
-                mime="image/png"
-            )
-        
-            # # Map Overlay (Yogyakarta with Pins)
-            # st.subheader("🗺️ Location Overlay: Yogyakarta Map")
-
-            # # Central Yogyakarta coordinate
-            # map_center = [-7.7956, 110.3695]
-            # m = folium.Map(location=map_center, zoom_start=12, tiles="CartoDB dark_matter")  # dark coffee style
-
-            # # Add pins for each alternative (you can assign coords manually or load from CSV)
-            # coords = {
-            #     "Malioboro": [-7.7928, 110.3658],
-            #     "Sleman": [-7.7160, 110.3550],
-            #     "Kotagede": [-7.8269, 110.4029]
-            # }
-
-            # for alt in alternatives:
-            #     location = coords.get(alt, map_center)  # fallback if unknown
-            #     folium.Marker(
-            #         location,
-            #         popup=f"{alt}",
-            #         icon=folium.Icon(color="beige", icon="coffee", prefix="fa")
-            #     ).add_to(m)
-
-            # # Display map in Streamlit
-            # st_folium(m, width=700, height=450)
-
-
-# Tab 3: Profile Matching 
-elif selected_tab == "☕ AHP + Profile Matching":
-    st.header("☕ Profile Matching Method")
+        matrix_df = default_matrix(criteria, alternatives, spatial_columns, imported)
 
-    if "criteria" not in st.session_state or "weights" not in st.session_state:
-        st.warning("Please complete the data in the 'Weighting' tab first.")
-    else:
-        criteria = st.session_state.criteria
-        weights = st.session_state.weights
-        alternatives = st.session_state.alternatives
+        matrix_df = matrix_editor(matrix_df, key="topsis_matrix_input")
 
-        # Ideal values for Profile Matching (to be input by user)
-        st.subheader("🎯 Define Profile Ideal Values")
-        st.markdown(f"**Ideal Values Scale:** 1 (lowest) to 5 (highest)")
+        # Values outside 1 to 10 are corrected and reported per cell
+        matrix_df = validated_matrix(matrix_df, 1, 10)
 
+    # Keep an incremental scorer across reruns so an edit only updates the changed cells
+    with span("app.topsis_incremental_update"):
+        scorer = st.session_state.get("topsis_scorer")
+        if scorer is None or scorer.shape != matrix_df.shape:
+            scorer = IncrementalTopsis(matrix_df.values, weights, is_benefit)
+            st.session_state["topsis_scorer"] = scorer
+        else:
+            if not np.array_equal(scorer.weights, weights):
+                scorer.set_weights(weights)
+            if not np.array_equal(scorer.is_benefit, is_benefit):
+                scorer.set_is_benefit(is_benefit)
+            scorer.update(matrix_df.values)
+
+    publish_inputs("topsis_inputs", "topsis_result",
+                   {"alternatives": list(alternatives), "matrix": matrix_df.values, "is_benefit": is_benefit})
+
+@profiled_fragment("topsis_results_fragment")
+def topsis_results(criteria, weights):
+    inputs = st.session_state["topsis_inputs"]
+    alternatives, matrix, is_benefit = inputs["alternatives"], inputs["matrix"], inputs["is_benefit"]
+
+    # Prefilter skyline: hanya alternatif yang tidak didominasi (k-skyband) yang diskor
+    use_skyline = st.checkbox("🧹 Score only non-dominated alternatives (Pareto skyline prefilter)", key="topsis_skyline")
+    skyband_k = None
+    if use_skyline:
+        skyband_k = int(st.number_input("Guarantee the exact top-k (keep alternatives dominated by fewer than k others)",
+                                        min_value=1, max_value=max(len(alternatives), 1), value=1, key="topsis_skyband_k"))
+        st.caption("Column norms and ideal solutions are still taken from all alternatives, so the scores shown are identical "
+                   "to a full TOPSIS run and the top-k is exact; positions beyond k are relative to the kept alternatives only.")
+
+    reversal_k = None
+    if st.checkbox("🔁 Check leave-one-out rank reversal", key="topsis_rank_reversal"):
+        reversal_k = int(st.number_input("Top-k to protect", min_value=1, max_value=max(len(alternatives) - 1, 1),
+                                         value=1, key="topsis_reversal_k"))
+
+    if st.button("🔍 Calculate Location Ranking (TOPSIS)"):
+        st.session_state["topsis_matrix"] = matrix
+        st.session_state["topsis_alternatives"] = list(alternatives)
+        st.session_state["is_benefit"] = is_benefit
+        kept = None
+        with span("app.topsis_scoring"):
+            if use_skyline:
+                candidates, scores, ranking = RESULT_CACHE.call(topsis_prefiltered, matrix, weights,
+                                                                is_benefit, top_k=skyband_k)
+                kept = len(candidates)
+                full_scores = np.full(len(alternatives), np.nan)
+                full_scores[candidates] = scores
+            else:
+                scorer = st.session_state["topsis_scorer"]
+                scores, ranking, _ = RESULT_CACHE.get_or_compute(
+                    content_hash("topsis", matrix, weights, is_benefit),
+                    lambda: scorer.result(return_positions=True)
+                )
+                full_scores = np.asarray(scores, dtype=float)
+            st.session_state["topsis_scores"] = full_scores
+        st.session_state["topsis_result"] = {
+            "inputs": {"alternatives": list(alternatives), "matrix": matrix, "weights": weights,
+                       "is_benefit": is_benefit, "skyline": skyband_k},
+            "ranking": ranking, "full_scores": full_scores, "kept": kept,
+        }
+
+    result = st.session_state.get("topsis_result")
+    if result is None:
+        return
+    if inputs_changed(result, alternatives=alternatives, matrix=matrix, weights=weights, is_benefit=is_benefit, skyline=skyband_k):
+        st.info(STALE_RESULT_NOTE)
+    render_topsis_result(result, criteria, reversal_k)
+
+def render_topsis_result(result, criteria, reversal_k=None):
+    inputs = result["inputs"]
+    alternatives = inputs["alternatives"]
+
+    st.subheader("🏆 TOPSIS Calculation Results")
+    if result["kept"] is not None:
+        st.info(f"Skyline prefilter kept {result['kept']:,} of {len(alternatives):,} alternatives.")
+
+    names = np.asarray(alternatives)
+    scores, ranking = np.asarray(result["full_scores"]), np.asarray(result["ranking"])
+    with span("app.topsis_dataframe"):
+        ranked_table(lambda rows: pd.DataFrame({
+            "Alternative": names[ranking[rows]],
+            "TOPSIS Score": np.round(scores[ranking[rows]], 4),
+            "Ranking": np.arange(rows.start + 1, rows.stop + 1)
+        }), len(ranking), key="topsis_table")
+    st.success("TOPSIS calculation completed successfully.")
+    st.success(f"⭐ The best alternative is **{names[ranking[0]]}** with a score of {scores[ranking[0]]:.4f}.")
+
+    # Visualization of TOPSIS Scores
+    st.subheader("📊 Visualization of TOPSIS Scores")
+
+    # Render the bar chart once; the same PNG bytes serve display and download
+    with span("app.topsis_charts"):
+        top = ranking[:30]
+        chart_png = bar_chart_png(names[top].tolist(), np.round(scores[top], 4), "TOPSIS Scores", max_bars=30)
+
+    # Display the chart in Streamlit
+    st.image(chart_png)
+
+    # Add a download button for the chart
+    st.download_button(
+        label="📥 Download Chart as Image",
+        data=chart_png,
+        file_name="topsis_scores.png",
+        mime="image/png"
+    )
+
+    ranking_downloads(alternatives, scores, ranking,
+                      topsis_breakdown(inputs["matrix"], inputs["weights"], inputs["is_benefit"], criteria),
+                      "topsis_ranking", key="topsis_export")
+
+    # Rank reversal: apakah menghapus satu alternatif mengubah urutan alternatif lain
+    if reversal_k is not None and len(alternatives) > 1:
+        with st.expander("🔁 Leave-one-out Rank Reversal", expanded=True):
+            with span("app.topsis_rank_reversal"):
+                reversal = RESULT_CACHE.call(topsis_leave_one_out, inputs["matrix"], inputs["weights"], inputs["is_benefit"],
+                                             top_k=reversal_k)
+            names = np.array(alternatives)
+            changed = np.flatnonzero(reversal["top_k_changed"])
+            st.markdown(f"Removing one alternative at a time ({len(alternatives):,} variants): "
+                        f"**{int(reversal['winner_changed'].sum()):,}** removals change the winner and "
+                        f"**{len(changed):,}** change the top-{reversal['new_top'].shape[1]} "
+                        "among the remaining alternatives.")
+            if len(changed) == 0:
+                st.success("No rank reversal: the ranking of the remaining alternatives is stable under every single removal.")
+            else:
+                reversal_df = pd.DataFrame({
+                    "Removed Alternative": names[changed],
+                    "Winner Changes": reversal["winner_changed"][changed],
+                    "Expected Top-k": [", ".join(names[row]) for row in reversal["expected_top"][changed]],
+                    "Top-k After Removal": [", ".join(names[row]) for row in reversal["new_top"][changed]],
+                })
+                st.dataframe(reversal_df, use_container_width=True, hide_index=True)
+
+    # # Map Overlay (Yogyakarta with Pins)
+    # st.subheader("🗺️ Location Overlay: Yogyakarta Map")
+
+    # # Central Yogyakarta coordinate
+    # map_center = [-7.7956, 110.3695]
+    # m = folium.Map(location=map_center, zoom_start=12, tiles="CartoDB dark_matter")  # dark coffee style
+
+    # # Add pins for each alternative (you can assign coords manually or load from CSV)
+    # coords = {
+    #     "Malioboro": [-7.7928, 110.3658],
+    #     "Sleman": [-7.7160, 110.3550],
+    #     "Kotagede": [-7.8269, 110.4029]
+    # }
+
+    # for alt in alternatives:
+    #     location = coords.get(alt, map_center)  # fallback if unknown
+    #     folium.Marker(
+    #         location,
+    #         popup=f"{alt}",
+    #         icon=folium.Icon(color="beige", icon="coffee", prefix="fa")
+    #     ).add_to(m)
+
+    # # Display map in Streamlit
+    # st_folium(m, width=700, height=450)
+
+@profiled_fragment("pm_profile_fragment")
+def pm_profile(criteria, weights):
+    # Ideal values for Profile Matching (to be input by user)
+    st.subheader("🎯 Define Profile Ideal Values")
+    st.markdown(f"**Ideal Values Scale:** 1 (lowest) to 5 (highest)")
+
+    with span("app.pm_inputs"):
         ideal_values = []
         for i, crit in enumerate(criteria):
             ideal_value = st.number_input(f"Enter ideal value for '{crit}' (1-5)", min_value=1, max_value=5, key=f"ideal_{i}")
-            
+
             # Error check: Ensure ideal value is within range
             if ideal_value < 1 or ideal_value > 5:
                 st.error(f"Ideal value for '{crit}' must be between 1 and 5.")
             else:
                 ideal_values.append(ideal_value)
-        
+
         # st.markdown(f"**Ideal Values Scale:** 1 (lowest) to 5 (highest)")
 
         # Input for core and secondary factors
@@ -327,6 +686,24 @@ elif selected_tab == "☕ AHP + Profile Matching":
         cf_weight = sum(w for w, is_cf in zip(weights, cf_flags) if is_cf)
         sf_weight = total_weight - cf_weight
 
+        # Gap weight table used to convert each gap into a score
+        with st.expander("📐 Gap Weight Table"):
+            st.markdown("Absolute gap between actual and ideal value → weight. Add negative gaps to weight shortfalls differently from surpluses.")
+            gap_table_df = st.data_editor(
+                pd.DataFrame({"Gap": list(GAP_WEIGHTS.keys()), "Weight": list(GAP_WEIGHTS.values())}),
+                use_container_width=True,
+                num_rows="dynamic",
+                key="pm_gap_table"
+            )
+            interpolate_gap = st.checkbox("Interpolate fractional gaps", value=True, key="pm_gap_interpolate")
+
+        gap_table_df = gap_table_df.dropna()
+        gap_table = None
+        try:
+            gap_table = compile_gap_weight(dict(zip(gap_table_df["Gap"], gap_table_df["Weight"])), interpolate=interpolate_gap)
+        except ValueError as e:
+            st.error(f"Invalid gap weight table: {e}")
+
         st.markdown("---")
         st.write("📊 Factor Summary:")
         factor_df = pd.DataFrame({
@@ -343,216 +720,731 @@ elif selected_tab == "☕ AHP + Profile Matching":
             st.error("⚠️ The total CF weight must be greater than 50%. Please adjust the CF/SF selection.")
         else:
             st.success("✅ CF/SF selection is valid. You can proceed to the next step.")
-        
-        # Input for decision matrix
-        st.subheader("📥 Input Decision Matrix")
 
-        # Limit number of alternatives
-        if len(alternatives) > 5:
-            st.warning("⚠️ Maximum of 5 alternatives allowed. Extra alternatives will be ignored.")
-            alternatives = alternatives[:5]
+    publish_inputs("pm_profile", "pm_result", {
+        "ideal": ideal_values,
+        "cf_sf_grouping": ["CF" if is_cf else "SF" for is_cf in cf_flags],
+        "gap_mapping": dict(zip(gap_table_df["Gap"], gap_table_df["Weight"])),
+        "interpolate": interpolate_gap,
+        "gap_table": gap_table,
+    })
 
-        num_alternatives = len(alternatives)
-        num_criteria = len(criteria)
+@profiled_fragment("pm_matrix_fragment")
+def pm_matrix(criteria, alternatives):
+    # Input for decision matrix
+    st.subheader("📥 Input Decision Matrix")
 
-        # Create default decision matrix (all values set to 1)
-        decision_matrix_df = pd.DataFrame(
-            np.ones((num_alternatives, num_criteria)),
-            columns=criteria,
-            index=alternatives
-        )
+    with span("app.pm_inputs"):
+        imported = import_matrix_input(criteria, key="pm_import")
+        if imported is not None:
+            alternatives = list(imported.index)
+        alternatives, spatial_columns = spatial_criteria_input(criteria, alternatives, 1, 5, key="pm_spatial", decimals=0)
+
+        # Create default decision matrix (all values set to 1 or imported, spatial criteria pre-filled)
+        decision_matrix_df = default_matrix(criteria, alternatives, spatial_columns, imported)
 
         st.markdown("🧾 Please fill in values for each alternative against the criteria (in scale 1 to 5):")
-        decision_matrix_df = st.data_editor(
-            decision_matrix_df,
-            use_container_width=True,
-            num_rows="fixed",
-            key="pm_matrix_input"
-        )
-        # Check if any value exceeds 5
-        if (decision_matrix_df > 5).any().any():
-            st.warning("Some values exceed 5 and have been automatically capped at 5.")
-        
-        # Auto-correct any input values outside the range [1, 5]
-        decision_matrix_df = decision_matrix_df.clip(lower=1, upper=5)
+        decision_matrix_df = matrix_editor(decision_matrix_df, key="pm_matrix_input")
+
+        # Auto-correct any input values outside the range [1, 5], reported per cell
+        decision_matrix_df = validated_matrix(decision_matrix_df, 1, 5)
 
         # Save to session state for further processing
-        st.session_state["decision_matrix"] = decision_matrix_df.values.tolist()
-
-        # Setelah input Core Factor (CF) dan Secondary Factor (SF) oleh pengguna
-        cf_sf_grouping = ["CF" if is_cf else "SF" for is_cf in cf_flags]
-        
-        # Button to calculate Profile Matching
-        if st.button("🔍 Calculate Location Ranking (Profile Matching)"):
-            # ideal_profile = ideal_values
-            matrix_pm = decision_matrix_df.values.tolist()
-            cf_sf_grouping = ["CF" if is_cf else "SF" for is_cf in cf_flags]
-            
-            # Use ideal_values from user input
-            scores_pm, ranking_order_pm = profile_matching(
-                ideal=ideal_values,
-                actuals=matrix_pm,
-                weights=weights,
-                cf_sf_grouping=cf_sf_grouping
-            )
-            
-            # Sorting the scores based on profile matching
-            # ranking_order_pm = np.argsort(-np.array(scores_pm))
-            result_df_pm = pd.DataFrame({
-                "Alternative": np.array(alternatives)[ranking_order_pm],
-                "Profile Matching Score": np.round(np.array(scores_pm)[ranking_order_pm], 4),
-                "Ranking": np.arange(1, num_alternatives + 1)
-            })
-
-            # Display the results
-            st.subheader("🏆 Profile Matching Calculation Results")
-            st.dataframe(result_df_pm, use_container_width=True, hide_index=True)
-                         
-            # Display the best alternative and its score
-            best_pm = result_df_pm[result_df_pm["Ranking"] == 1].iloc[0]
-            st.success("Profile Matching calculation completed successfully.")
-            st.success(f"⭐ The best alternative is **{best_pm['Alternative']}** with a Profile Matching score of {best_pm['Profile Matching Score']:.4f}.")
-
-            # Visualization of Profile Matching Scores
-            st.subheader("📊 Visualization of Profile Matching Scores")
-
-            # Create a bar chart using matplotlib
-            fig_pm, ax_pm = plt.subplots()
-            result_df_pm_sorted = result_df_pm.sort_values(by="Ranking")
-            ax_pm.bar(result_df_pm_sorted["Alternative"], result_df_pm_sorted["Profile Matching Score"], color='saddlebrown')
-            ax_pm.set_title("Profile Matching Scores")
-            ax_pm.set_xlabel("Alternative")
-            ax_pm.set_ylabel("Score")
-            fig_pm.set_size_inches(5, 3)  # Set width=8 inches, height=5 inches
-            plt.xticks(rotation=45, ha='right')
-
-            # Display the chart in Streamlit
-            st.pyplot(fig_pm)
-
-            # Add a download button for the chart
-            buf_pm = BytesIO()
-            fig_pm.savefig(buf_pm, format="png")
-            buf_pm.seek(0)
-            st.download_button(
-                label="📥 Download Chart as Image",
-                data=buf_pm,
-                file_name="profile_matching_scores.png",
-                mime="image/png"
-            )
-            st.success("Profile Matching scores visualization generated successfully.")
-
-            # Radar chart berdasarkan kedekatan ke profil ideal
-            st.subheader("🛫️ Closeness to Ideal Profile (Radar Chart)")
-            closeness_matrix = []
-            range_scale = 4  # assuming 1-5 scale
-            for row in matrix_pm:
-                closeness_row = [1 - abs(val - ideal) / range_scale for val, ideal in zip(row, ideal_values)]
-                closeness_matrix.append(closeness_row)
-
-            fig_radar, ax_radar = plt.subplots(figsize=(8, 7), subplot_kw=dict(polar=True))
-            angles = np.linspace(0, 2 * np.pi, num_criteria, endpoint=False).tolist()
-            angles += angles[:1]
-
-            bold_colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#7a42ad']
-
-            for i, row in enumerate(closeness_matrix):
-                values = row + row[:1]
-                ax_radar.plot(angles, values, label=alternatives[i], linewidth=2.5, marker='o', color=bold_colors[i % len(bold_colors)])
-                ax_radar.fill(angles, values, alpha=0.25, color=bold_colors[i % len(bold_colors)])
-
-            ax_radar.set_thetagrids(np.degrees(angles[:-1]), criteria, fontsize=11, ha='center')
-            ax_radar.set_ylim(0, 1)
-            ax_radar.set_title("Closeness of Alternatives to Ideal Profile", size=13, pad=30)
-            ax_radar.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2, frameon=False)
-            ax_radar.grid(True, linestyle='--', alpha=0.5)
-
-            st.pyplot(fig_radar)
-
-            buf_radar = BytesIO()
-            fig_radar.savefig(buf_radar, format="png", transparent=True, bbox_inches='tight')
-            buf_radar.seek(0)
-            st.download_button(
-                label="🗕️ Download Radar Chart as Image",
-                data=buf_radar,
-                file_name="radar_closeness_to_ideal.png",
-                mime="image/png"
+        st.session_state["decision_matrix"] = decision_matrix_df.values
+        st.session_state["pm_alternatives"] = list(alternatives)
+
+    publish_inputs("pm_inputs", "pm_result", {"alternatives": list(alternatives), "matrix": decision_matrix_df.values})
+
+@profiled_fragment("pm_results_fragment")
+def pm_results(criteria, weights):
+    profile, inputs = st.session_state["pm_profile"], st.session_state["pm_inputs"]
+    alternatives, matrix_pm = inputs["alternatives"], inputs["matrix"]
+    num_alternatives = len(alternatives)
+
+    # Radar chart options (top-N filtering keeps the chart readable for many alternatives)
+    col_radar1, col_radar2 = st.columns(2)
+    with col_radar1:
+        radar_top_n = st.number_input("Alternatives shown in radar chart (top N)", min_value=1, max_value=max(num_alternatives, 1), value=min(5, max(num_alternatives, 1)), key="pm_radar_top_n")
+    with col_radar2:
+        radar_layout = st.radio("Radar layout", ["Overlay", "Small multiples"], horizontal=True, key="pm_radar_layout")
+
+    pm_skyband_k = None
+    if st.checkbox("🧹 Score only non-dominated alternatives (Pareto skyline prefilter on CF/SF averages)", key="pm_skyline"):
+        pm_skyband_k = int(st.number_input("Guarantee the exact top-k (keep alternatives dominated by fewer than k others)",
+                                           min_value=1, max_value=max(num_alternatives, 1), value=1, key="pm_skyband_k"))
+
+    ideal_values, cf_sf_grouping, gap_table = profile["ideal"], profile["cf_sf_grouping"], profile["gap_table"]
+
+    # Button to calculate Profile Matching
+    if st.button("🔍 Calculate Location Ranking (Profile Matching)", disabled=gap_table is None):
+        st.session_state["pm_ideal"] = ideal_values
+        st.session_state["cf_sf_grouping"] = cf_sf_grouping
+        st.session_state["pm_gap_settings"] = {
+            "mapping": profile["gap_mapping"],
+            "interpolate": profile["interpolate"],
+        }
+        kept = None
+
+        # Use ideal_values from user input
+        with span("app.pm_scoring"):
+            if pm_skyband_k is not None:
+                candidates, candidate_scores, ranking_order_pm = RESULT_CACHE.call(
+                    profile_matching_prefiltered, ideal_values, matrix_pm, weights, cf_sf_grouping,
+                    gap_table=gap_table, top_k=pm_skyband_k
+                )
+                scores_pm = np.full(num_alternatives, np.nan)
+                scores_pm[candidates] = candidate_scores
+                kept = len(candidates)
+            else:
+                scores_pm, ranking_order_pm = RESULT_CACHE.call(
+                    profile_matching,
+                    ideal=ideal_values,
+                    actuals=matrix_pm,
+                    weights=weights,
+                    cf_sf_grouping=cf_sf_grouping,
+                    gap_table=gap_table
+                )
+            st.session_state["pm_scores"] = np.asarray(scores_pm, dtype=float)
+        st.session_state["pm_result"] = {
+            "inputs": {"alternatives": list(alternatives), "matrix": matrix_pm, "weights": weights, "ideal": ideal_values,
+                       "cf_sf_grouping": cf_sf_grouping, "gap_mapping": profile["gap_mapping"],
+                       "interpolate": profile["interpolate"], "skyline": pm_skyband_k},
+            "gap_table": gap_table, "scores": scores_pm, "ranking": ranking_order_pm, "kept": kept,
+        }
+
+    result = st.session_state.get("pm_result")
+    if result is None:
+        return
+    if inputs_changed(result, alternatives=alternatives, matrix=matrix_pm, weights=weights, ideal=ideal_values,
+                      cf_sf_grouping=cf_sf_grouping, gap_mapping=profile["gap_mapping"],
+                      interpolate=profile["interpolate"], skyline=pm_skyband_k):
+        st.info(STALE_RESULT_NOTE)
+    render_pm_result(result, criteria, radar_top_n, radar_layout)
+
+def render_pm_result(result, criteria, radar_top_n, radar_layout):
+    inputs = result["inputs"]
+    alternatives, matrix_pm, ideal_values = inputs["alternatives"], inputs["matrix"], inputs["ideal"]
+    scores_pm, ranking_order_pm = result["scores"], result["ranking"]
+    if result["kept"] is not None:
+        st.info(f"Skyline prefilter kept {result['kept']:,} of {len(alternatives):,} alternatives.")
+
+    # Sorting the scores based on profile matching
+    # ranking_order_pm = np.argsort(-np.array(scores_pm))
+    names = np.asarray(alternatives)
+    scores_pm, ranking_order_pm = np.asarray(scores_pm, dtype=float), np.asarray(ranking_order_pm)
+
+    # Display the results
+    st.subheader("🏆 Profile Matching Calculation Results")
+    with span("app.pm_dataframe"):
+        ranked_table(lambda rows: pd.DataFrame({
+            "Alternative": names[ranking_order_pm[rows]],
+            "Profile Matching Score": np.round(scores_pm[ranking_order_pm[rows]], 4),
+            "Ranking": np.arange(rows.start + 1, rows.stop + 1)
+        }), len(ranking_order_pm), key="pm_table")
+
+    # Display the best alternative and its score
+    best_pm = ranking_order_pm[0]
+    st.success("Profile Matching calculation completed successfully.")
+    st.success(f"⭐ The best alternative is **{names[best_pm]}** with a Profile Matching score of {scores_pm[best_pm]:.4f}.")
+
+    # Visualization of Profile Matching Scores
+    st.subheader("📊 Visualization of Profile Matching Scores")
+
+    # Render the bar chart once; the same PNG bytes serve display and download
+    with span("app.pm_charts"):
+        top = ranking_order_pm[:30]
+        chart_png_pm = bar_chart_png(names[top].tolist(), np.round(scores_pm[top], 4), "Profile Matching Scores", max_bars=30)
+
+    # Display the chart in Streamlit
+    st.image(chart_png_pm)
+
+    # Add a download button for the chart
+    st.download_button(
+        label="📥 Download Chart as Image",
+        data=chart_png_pm,
+        file_name="profile_matching_scores.png",
+        mime="image/png"
+    )
+    st.success("Profile Matching scores visualization generated successfully.")
+
+    # Radar chart berdasarkan kedekatan ke profil ideal (alternatif terurut sesuai ranking)
+    st.subheader("🛫️ Closeness to Ideal Profile (Radar Chart)")
+    range_scale = 4  # assuming 1-5 scale
+    with span("app.pm_charts"):
+        # Hanya baris top-N yang digambar
+        top = ranking_order_pm[:radar_top_n]
+        closeness_matrix = 1 - np.abs(np.asarray(matrix_pm)[top] - np.asarray(ideal_values)) / range_scale
+
+        radar_png = radar_chart_png(
+            closeness_matrix,
+            names[top].tolist(),
+            criteria,
+            top_n=radar_top_n,
+            layout="small_multiples" if radar_layout == "Small multiples" else "overlay"
+        )
+    st.image(radar_png)
+
+    st.download_button(
+        label="🗕️ Download Radar Chart as Image",
+        data=radar_png,
+        file_name="radar_closeness_to_ideal.png",
+        mime="image/png"
+    )
+    st.success("Radar chart visualizing closeness to ideal profile generated successfully.")
+
+    ranking_downloads(alternatives, scores_pm, ranking_order_pm,
+                      profile_matching_breakdown(ideal_values, matrix_pm, criteria, result["gap_table"]),
+                      "profile_matching_ranking", key="pm_export")
+
+    # st.subheader("🛱️ Closeness to Ideal Profile (Radar Chart)")
+    # closeness_matrix = []
+    # range_scale = 4  # assuming 1-5 scale
+    # for row in matrix_pm:
+    #     closeness_row = [1 - abs(val - ideal) / range_scale for val, ideal in zip(row, ideal_values)]
+    #     closeness_matrix.append(closeness_row)
+
+    # fig_radar, ax_radar = plt.subplots(figsize=(8, 7), subplot_kw=dict(polar=True))
+    # angles = np.linspace(0, 2 * np.pi, num_criteria, endpoint=False).tolist()
+    # angles += angles[:1]
+
+    # bold_colors = ['#e41a1c', '#377eb8', '#4daf4a', '#984ea3', '#ff7f00']
+
+    # for i, row in enumerate(closeness_matrix):
+    #     values = row + row[:1]
+    #     ax_radar.plot(angles, values, label=alternatives[i], linewidth=2.5, marker='o', color=bold_colors[i % len(bold_colors)])
+    #     ax_radar.fill(angles, values, alpha=0.25, color=bold_colors[i % len(bold_colors)])
+
+    # ax_radar.set_thetagrids(np.degrees(angles[:-1]), criteria, fontsize=10)
+    # ax_radar.set_ylim(0, 1)
+    # ax_radar.set_title("Closeness of Alternatives to Ideal Profile", size=15, pad=20)
+    # ax_radar.legend(loc='lower center', bbox_to_anchor=(0.5, -0.15), ncol=2)
+
+    # st.pyplot(fig_radar)
+
+    # buf_radar = BytesIO()
+    # fig_radar.savefig(buf_radar, format="png")
+    # buf_radar.seek(0)
+    # st.download_button(
+    #     label="📅 Download Radar Chart as Image",
+    #     data=buf_radar,
+    #     file_name="radar_closeness_to_ideal.png",
+    #     mime="image/png"
+    # )
+    # st.success("Radar chart visualizing closeness to ideal profile generated successfully.")
+
+    # # Radar chart with enhanced style
+    # st.subheader("📡 Closeness to Ideal Profile (Radar Chart)")
+    # closeness_matrix = []
+    # range_scale = 4
+    # for row in matrix_pm:
+    #     closeness_row = [1 - abs(val - ideal) / range_scale for val, ideal in zip(row, ideal_values)]
+    #     closeness_matrix.append(closeness_row)
+
+    # fig_radar, ax_radar = plt.subplots(figsize=(7, 6), subplot_kw=dict(polar=True))
+    # angles = np.linspace(0, 2 * np.pi, num_criteria, endpoint=False).tolist()
+    # angles += angles[:1]
+
+    # custom_colors = ['#A6CEE3', '#B2DF8A', '#FDBF6F', '#CAB2D6', '#FF9999']
+
+    # for i, row in enumerate(closeness_matrix):
+    #     values = row + row[:1]
+    #     ax_radar.fill(angles, values, color='black', alpha=0.05, zorder=1)  # shadow layer
+    #     ax_radar.plot(angles, values, label=alternatives[i], linewidth=2.5, marker='o', color=custom_colors[i % len(custom_colors)], zorder=2)
+    #     ax_radar.fill(angles, values, alpha=0.25, color=custom_colors[i % len(custom_colors)], zorder=3)
+
+    # ax_radar.set_thetagrids(np.degrees(angles[:-1]), criteria, fontsize=10)
+    # ax_radar.set_ylim(0, 1)
+    # ax_radar.set_title("Closeness of Alternatives to Ideal Profile", size=15, pad=20)
+    # ax_radar.yaxis.grid(True, color='gray', linestyle='--', linewidth=0.5, alpha=0.3)
+    # ax_radar.legend(loc='upper right', bbox_to_anchor=(1.2, 1))
+
+    # st.pyplot(fig_radar)
+
+    # buf_radar = BytesIO()
+    # fig_radar.savefig(buf_radar, format="png")
+    # buf_radar.seek(0)
+    # st.download_button(
+    #     label="📅 Download Radar Chart as Image",
+    #     data=buf_radar,
+    #     file_name="radar_closeness_to_ideal.png",
+    #     mime="image/png"
+    # )
+    # st.success("Radar chart visualizing closeness to ideal profile generated successfully.")
+
+
+# Set the title and subheader for the app
+st.title("📍 Decision Support System for Coffee Shop Site Selection in D.I. Yogyakarta")
+st.subheader("🔎 AHP-Weighted Decision Making Using TOPSIS and Profile Matching")
+st.markdown("---")
+
+# Sidebar Navigation
+tabs = ["☕ Weighting", "☕ AHP + TOPSIS", "☕ AHP + Profile Matching", "☕ Sensitivity Analysis", "☕ Method Comparison"]
+selected_tab = st.sidebar.radio("Select Tab", tabs)
+
+# Proyek tersimpan: simpan / muat / bandingkan snapshot berversi
+with st.sidebar.expander("💾 Projects"):
+    project_name = st.text_input("Project name", key="project_name")
+    project_note = st.text_input("Snapshot note (optional)", key="project_note")
+    if st.button("Save snapshot", key="project_save", disabled=not project_name.strip() or "criteria" not in st.session_state):
+        try:
+            with span("app.project_save"):
+                saved_version = save_project_snapshot(project_name, project_note)
+        except (ValueError, OSError) as e:
+            st.error(f"Could not save the project: {e}")
+        else:
+            st.success(f"Saved {project_name} v{saved_version}.")
+
+    projects = list_projects()
+    if projects:
+        project = st.selectbox("Saved project", projects, key="project_selected")
+        versions = list_versions(project)
+        labels = {v["version"]: f"v{v['version']} · {v['saved_at']}" + (f" · {v['note']}" if v["note"] else "") for v in versions}
+        version = st.selectbox("Version", list(labels)[::-1], format_func=labels.get, key="project_version")
+        st.button("Load", key="project_load", on_click=load_project_snapshot, args=(project, version))
+        if len(versions) > 1:
+            compare_to = st.selectbox("Compare with", [v for v in labels if v != version][::-1],
+                                      format_func=labels.get, key="project_compare")
+            if st.button("Compare", key="project_diff"):
+                changes = diff_snapshots(project, compare_to, version)
+                if changes:
+                    st.dataframe(pd.DataFrame(changes).astype(str), use_container_width=True, hide_index=True)
+                else:
+                    st.info("The two versions are identical.")
+
+    message = st.session_state.pop("project_message", None)
+    if message is not None:
+        (st.success if message[0] == "success" else st.error)(message[1])
+
+# Tab 1: Weighting (AHP)
+if selected_tab == "☕ Weighting":
+    st.header("☕ Weighting Criteria with AHP")
+    st.subheader("1️⃣ Input Criteria and Alternatives")
+
+    # Input for criteria and alternatives
+    num_criteria = st.number_input("Number of Criteria", min_value=2, value=3, step=1, key="num_criteria")
+    num_alternatives = st.number_input("Number of Alternatives", min_value=2, value=3, step=1, key="num_alternatives")
+
+    criteria = [st.text_input(f"Criterion Name {i+1}", key=f"crit_{i}") for i in range(num_criteria)]
+    alternatives = [st.text_input(f"Alternative Name {i+1}", key=f"alt_{i}") for i in range(num_alternatives)]
+    
+    # Ensure criteria names are unique and non-empty
+    if len(set([c.strip() for c in criteria if c.strip() != ""])) != len(criteria) or any(c.strip() == "" for c in criteria):
+        st.error("All criteria names must be unique and non-empty.")
+    
+    if all(criteria) and all(alternatives) and len(set([c.strip() for c in criteria])) == len(criteria):
+        st.markdown("---")
+        st.header("2️⃣ Pairwise Comparison of Criteria")
+    
+    # if all(criteria) and all(alternatives):
+    #     st.markdown("---")
+    #     st.header("2️⃣ Pairwise Comparison of Criteria")
+
+        input_mode = st.radio("Pairwise comparison input", ["Individual (sliders)", "Matrix (table / CSV)", "Group survey (CSV/JSONL)"],
+                              horizontal=True, key="pairwise_input_mode")
+        cr_label = "Consistency Ratio (CR)"
+        if input_mode == "Individual (sliders)":
+            A = np.ones((num_criteria, num_criteria))
+            # Pairwise comparison (AHP)
+            st.write("""
+            **Pairwise Comparison Scale:**
+            - **1**: Equally Preferred
+            - **2**: Equally to Moderately
+            - **3**: Moderately Preferred
+            - **4**: Moderately to Strongly
+            - **5**: Strongly Preferred
+            - **6**: Strongly to Very Strongly
+            - **7**: Very Strongly Preferred
+            - **8**: Very Strongly to Extremely
+            - **9**: Extremely Preferred
+            """)
+            with span("app.pairwise_widgets"):
+                for i in range(num_criteria):
+                    for j in range(i + 1, num_criteria):
+                        with st.expander(f"Compare {criteria[i]} vs {criteria[j]}"):
+                            col1, col2 = st.columns([1, 3])
+
+                            with col1:
+                                higher_priority = st.radio(
+                                    "Select the more important criterion",
+                                    [criteria[i], criteria[j]],
+                                    # index=0 if default_radio == criteria[i] else 1,
+                                    key=f"crit_radio_{i}_{j}",
+                                    horizontal=True
+                                )
+
+                            with col2:
+                                if higher_priority == criteria[i]:
+                                    prompt = f"How much more important is {criteria[i]} compared to {criteria[j]}?"
+                                else:
+                                    prompt = f"How much more important is {criteria[j]} compared to {criteria[i]}?"
+
+                                value = st.slider(prompt, 1, 9, key=f"crit_slider_{i}_{j}")
+
+                                if higher_priority == criteria[i]:
+                                    A[i][j] = value
+                                    A[j][i] = 1 / value
+                                else:
+                                    A[j][i] = value
+                                    A[i][j] = 1 / value
+
+            with span("app.ahp"):
+                weights, cr = RESULT_CACHE.call(calculate_ahp_weights, A)
+        elif input_mode == "Matrix (table / CSV)":
+            weights = None
+            with span("app.pairwise_table"):
+                A = pairwise_matrix_input(criteria)
+            if A is not None:
+                with span("app.ahp"):
+                    weights, cr = RESULT_CACHE.call(calculate_ahp_weights, A)
+        else:
+            # Survei kelompok: matriks banyak responden digabung (AIJ / AIP) setelah responden
+            # yang tidak konsisten dibuang
+            survey_file = st.file_uploader("Survey file (CSV: one respondent per row, or JSONL)", type=["csv", "jsonl"], key="group_survey")
+            col1, col2 = st.columns(2)
+            with col1:
+                aggregation = st.radio("Aggregation", ["AIJ (geometric mean of judgements)", "AIP (geometric mean of priorities)"], key="group_aggregation")
+            with col2:
+                cr_threshold = st.number_input("Exclude respondents with CR above", min_value=0.0, max_value=1.0, value=0.1, step=0.01, key="group_cr_threshold")
+            st.caption("CSV columns: the upper triangle of each respondent's matrix in row order (C1/C2, C1/C3, ..., C2/C3, ...) "
+                       "or the full matrix, plus optional 'respondent' and 'group' columns.")
+
+            weights = None
+            if survey_file is not None:
+                try:
+                    with span("app.group_ahp"):
+                        group_result = RESULT_CACHE.get_or_compute(
+                            content_hash("group_ahp", survey_file.getvalue(), aggregation, cr_threshold),
+                            lambda: aggregate_group_ahp(survey_file, method=aggregation[:3].lower(), cr_threshold=cr_threshold)
+                        )
+                except ValueError as e:
+                    st.error(f"Could not aggregate the survey: {e}")
+                else:
+                    if group_result["n"] != num_criteria:
+                        st.error(f"The survey compares {group_result['n']} criteria, but {num_criteria} criteria are defined above.")
+                    else:
+                        weights = group_result["weights"].tolist()
+                        cr = group_result["consistency_ratio"]
+                        A = group_result["matrix"]
+                        spread = group_result["consistent_cr"]
+                        st.markdown(f"**Respondents:** {group_result['n_respondents']:,} · "
+                                    f"**consistent (CR ≤ {cr_threshold:.2f}):** {group_result['n_consistent']:,} · "
+                                    f"**invalid rows:** {group_result['n_invalid']:,}")
+                        st.markdown(f"**CR of the consistent respondents:** median {spread['median']:.4f} · "
+                                    f"90th percentile {spread['p90']:.4f} · max {spread['max']:.4f} · "
+                                    f"**CR of the aggregated judgement matrix (AIJ):** {group_result['aij_consistency_ratio']:.4f}")
+                        # AIP: bobot tidak berasal dari satu matriks, jadi CR yang dilaporkan adalah CR responden tertinggi
+                        if group_result["method"] == "aip":
+                            cr_label = "Highest respondent Consistency Ratio (AIP)"
+                        else:
+                            cr_label = "Consistency Ratio of the aggregated judgements (AIJ)"
+                        if len(group_result["groups"]) > 1:
+                            group_df = pd.DataFrame({f"{g} (n={v['n_consistent']:,})": np.round(v["weights"], 4)
+                                                     for g, v in group_result["groups"].items()}, index=criteria)
+                            st.dataframe(group_df, use_container_width=True)
+
+        if weights is not None:
+            st.subheader("⚖️  Criteria Weights")
+            weight_table = {"Criteria": criteria, "Weight": [round(w, 4) for w in weights]}
+            st.dataframe(weight_table, use_container_width=True)
+
+            st.info(f"{cr_label}: {cr:.4f}")
+            if cr > 0.1:
+                st.error("Consistency Ratio exceeds 0.1. Please review your pairwise comparisons for consistency.")
+            else:
+                st.success("Consistency Ratio is within acceptable limits. Weights calculated successfully.")
+
+            # Save weights and criteria for use in the next tab
+            st.session_state["criteria"] = criteria
+            st.session_state["weights"] = weights
+            st.session_state["alternatives"] = alternatives
+            st.session_state["pairwise_matrix"] = A.tolist()
+
+            # Stabilitas peringkat: seberapa jauh tiap bobot dapat bergeser sebelum top-k berubah,
+            # memakai matriks terakhir yang dihitung di tab TOPSIS / Profile Matching
+            st.markdown("---")
+            st.header("3️⃣ Rank Stability of Criteria Weights")
+            stability_sources = []
+            if "topsis_matrix" in st.session_state and np.shape(st.session_state.topsis_matrix)[1] == len(criteria):
+                stability_sources.append("TOPSIS")
+            if "decision_matrix" in st.session_state and "pm_ideal" in st.session_state \
+                    and np.shape(st.session_state.decision_matrix)[1] == len(criteria):
+                stability_sources.append("Profile Matching")
+
+            if not stability_sources:
+                st.info("Calculate a ranking in the TOPSIS or Profile Matching tab to see how far each weight can move before the ranking changes.")
+            else:
+                stability_method = st.radio("Ranking method", stability_sources, horizontal=True, key="stability_method")
+                if stability_method == "TOPSIS":
+                    ranked_alternatives = st.session_state.get("topsis_alternatives", alternatives)
+                else:
+                    ranked_alternatives = st.session_state.get("pm_alternatives", alternatives)
+                stability_top_k = st.number_input("Keep the top-k set unchanged (k)", min_value=1,
+                                                  max_value=max(len(ranked_alternatives) - 1, 1), value=1, key="stability_top_k")
+
+                with span("app.weight_stability"):
+                    if stability_method == "TOPSIS":
+                        stability = RESULT_CACHE.call(topsis_weight_stability, st.session_state.topsis_matrix, weights,
+                                                      st.session_state.is_benefit, top_k=int(stability_top_k))
+                    else:
+                        gap_settings = st.session_state.pm_gap_settings
+                        stability = RESULT_CACHE.call(profile_matching_weight_stability, st.session_state.pm_ideal,
+                                                      st.session_state.decision_matrix, weights, st.session_state.cf_sf_grouping,
+                                                      compile_gap_weight(gap_settings["mapping"], interpolate=gap_settings["interpolate"]),
+                                                      top_k=int(stability_top_k))
+
+                def entrant_name(index):
+                    return ranked_alternatives[index] if index >= 0 else "—"
+
+                current = stability["weight"]
+                stability_df = pd.DataFrame({
+                    "Criteria": criteria,
+                    "Weight": np.round(current, 4),
+                    "Min Weight": np.round(stability["lower"], 4),
+                    "Max Weight": np.round(stability["upper"], 4),
+                    "Allowed Decrease (%)": np.round((current - stability["lower"]) / current * 100, 1),
+                    "Allowed Increase (%)": np.round((stability["upper"] - current) / current * 100, 1),
+                    "Enters Top-k Below Min": [entrant_name(i) for i in stability["lower_entrant"]],
+                    "Enters Top-k Above Max": [entrant_name(i) for i in stability["upper_entrant"]],
+                })
+                st.dataframe(stability_df, use_container_width=True)
+                top_names = ", ".join(ranked_alternatives[i] for i in stability["top"])
+                st.caption(f"Current top-{int(stability_top_k)}: {top_names}. Each weight is moved on its own while the others are rescaled "
+                           "proportionally to keep the total at 1; an empty threshold means the top-k set never changes in that direction.")
+
+# Tab 2: TOPSIS
+elif selected_tab == "☕ AHP + TOPSIS":
+    st.header("☕ TOPSIS Method")
+
+    if "criteria" not in st.session_state or "alternatives" not in st.session_state or "weights" not in st.session_state:
+        st.warning("Please complete the data in the Weighting tab first.")
+    else:
+        topsis_inputs(st.session_state.criteria, st.session_state.alternatives, st.session_state.weights)
+        topsis_results(st.session_state.criteria, st.session_state.weights)
+
+
+# Tab 3: Profile Matching 
+elif selected_tab == "☕ AHP + Profile Matching":
+    st.header("☕ Profile Matching Method")
+
+    if "criteria" not in st.session_state or "weights" not in st.session_state:
+        st.warning("Please complete the data in the 'Weighting' tab first.")
+    else:
+        pm_profile(st.session_state.criteria, st.session_state.weights)
+        pm_matrix(st.session_state.criteria, st.session_state.alternatives)
+        pm_results(st.session_state.criteria, st.session_state.weights)
+
+
+# Tab 4: Sensitivity Analysis (Monte Carlo)
+elif selected_tab == "☕ Sensitivity Analysis":
+    st.header("☕ Weight Sensitivity Analysis")
+    st.markdown("Perturbs the AHP weights many times and re-ranks the alternatives to show how robust the winner is.")
+
+    available_methods = []
+    if "topsis_matrix" in st.session_state:
+        available_methods.append("TOPSIS")
+    if "pm_ideal" in st.session_state:
+        available_methods.append("Profile Matching")
+
+    if "weights" not in st.session_state or not available_methods:
+        st.warning("Please calculate a ranking in the TOPSIS or Profile Matching tab first.")
+    else:
+        weights = st.session_state.weights
+        alternatives = st.session_state.alternatives
+
+        method = st.radio("Method", available_methods, horizontal=True, key="sa_method")
+        sampling = st.radio(
+            "Sampling",
+            ["Dirichlet around AHP weights", "Perturb pairwise comparisons"],
+            horizontal=True,
+            key="sa_sampling"
+        )
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            n_draws = st.number_input("Number of draws", min_value=100, max_value=200000, value=5000, step=500, key="sa_draws")
+        with col2:
+            seed = st.number_input("Random seed", min_value=0, value=42, step=1, key="sa_seed")
+        with col3:
+            n_jobs = st.number_input("Worker processes", min_value=1, max_value=os.cpu_count() or 1, value=os.cpu_count() or 1, key="sa_jobs")
+
+        # Hanya peringkat 1..K yang dihitung per alternatif (memori O(n·K), bukan O(n²))
+        n_ranked = len(st.session_state.topsis_matrix if method == "TOPSIS" else st.session_state.decision_matrix)
+        top_ranks = st.number_input("Ranks shown in the acceptability table (top K)", min_value=1, max_value=max(n_ranked, 1),
+                                    value=min(10, max(n_ranked, 1)), key="sa_top_ranks")
+
+        if sampling.startswith("Dirichlet"):
+            concentration = st.slider("Concentration (higher = less spread)", 10, 1000, 100, key="sa_concentration")
+            spread = 0.2
+        else:
+            spread = st.slider("Log-scale spread of pairwise judgements", 0.05, 1.0, 0.2, key="sa_spread")
+            concentration = 100
+
+        if st.button("🎲 Run Sensitivity Analysis"):
+            progress_bar = st.progress(0.0, text="Sampling weights...")
+
+            def report_progress(done, total):
+                progress_bar.progress(done / total, text=f"Scored {done:,} of {total:,} draws")
+
+            if method == "TOPSIS":
+                matrix = st.session_state.topsis_matrix
+                extra = {"is_benefit": st.session_state.is_benefit}
+                alternatives = st.session_state.get("topsis_alternatives", alternatives)
+            else:
+                matrix = st.session_state.decision_matrix
+                extra = {
+                    "ideal": st.session_state.pm_ideal,
+                    "cf_sf_grouping": st.session_state.cf_sf_grouping,
+                    "gap_table": compile_gap_weight(st.session_state.pm_gap_settings["mapping"],
+                                                    interpolate=st.session_state.pm_gap_settings["interpolate"]),
+                }
+                alternatives = st.session_state.get("pm_alternatives", alternatives[:len(matrix)])
+
+            with span("app.sensitivity_run"):
+                result = monte_carlo_sensitivity(
+                    "topsis" if method == "TOPSIS" else "profile_matching",
+                    matrix,
+                    weights,
+                    n_draws=int(n_draws),
+                    pairwise=st.session_state.get("pairwise_matrix"),
+                    sampling="dirichlet" if sampling.startswith("Dirichlet") else "pairwise",
+                    concentration=concentration,
+                    spread=spread,
+                    seed=int(seed),
+                    n_jobs=int(n_jobs),
+                    progress=report_progress,
+                    top_k=int(top_ranks),
+                    **extra
+                )
+            progress_bar.progress(1.0, text="Done")
+            # Disimpan agar pergantian halaman tabel tidak membuang hasil
+            st.session_state["sa_result"] = {"method": method, "result": result, "alternatives": np.asarray(alternatives)}
+
+        if st.session_state.get("sa_result", {}).get("method") == method:
+            result, names = st.session_state["sa_result"]["result"], st.session_state["sa_result"]["alternatives"]
+            order, _ = rank_scores(result["win_probability"])
+            win, mean_rank = result["win_probability"], result["mean_rank"]
+            st.subheader("🏆 Win Probability")
+            ranked_table(lambda rows: pd.DataFrame({
+                "Alternative": names[order[rows]],
+                "Win Probability": np.round(win[order[rows]], 4),
+                "Mean Rank": np.round(mean_rank[order[rows]], 2),
+            }), len(order), key="sa_summary")
+
+            def acceptability_rows(rows):
+                frame = pd.DataFrame(np.round(result["rank_acceptability"][order[rows]], 4),
+                                     columns=[f"Rank {r + 1}" for r in range(result["top_k"])])
+                frame.insert(0, "Alternative", names[order[rows]])
+                return frame
+
+            st.subheader("📊 Rank Acceptability Index")
+            ranked_table(acceptability_rows, len(order), key="sa_acceptability")
+
+            st.success(f"⭐ **{names[order[0]]}** ranks first in {win[order[0]]:.1%} of {result['n_draws']:,} draws.")
+
+# Tab 5: Method Comparison
+elif selected_tab == "☕ Method Comparison":
+    st.header("☕ Method Comparison")
+    st.markdown("Scores the TOPSIS decision matrix with several MCDM methods from one shared preprocessing pass "
+                "and combines their rankings into a consensus ranking.")
+
+    if "weights" not in st.session_state or "topsis_matrix" not in st.session_state:
+        st.warning("Please calculate a ranking in the TOPSIS tab first.")
+    else:
+        matrix = np.asarray(st.session_state.topsis_matrix, dtype=float)
+        alternatives = st.session_state.get("topsis_alternatives", st.session_state.alternatives)
+        is_benefit = st.session_state.is_benefit
+
+        methods = st.multiselect("Methods", list(METHODS), default=list(METHODS), key="compare_methods")
+        # Copeland membandingkan semua pasangan alternatif (O(n²)); hanya ditawarkan untuk n kecil
+        consensus_rules = ["Borda", "Copeland"] if len(matrix) <= COPELAND_MAX_ALTERNATIVES else ["Borda"]
+        if st.session_state.get("compare_consensus") not in consensus_rules:
+            st.session_state.pop("compare_consensus", None)
+        col1, col2 = st.columns(2)
+        with col1:
+            consensus = st.radio("Consensus rule", consensus_rules, horizontal=True, key="compare_consensus")
+            if len(consensus_rules) == 1:
+                st.caption(f"Copeland compares every pair of alternatives and is offered up to "
+                           f"{COPELAND_MAX_ALTERNATIVES:,} alternatives.")
+        with col2:
+            vikor_v = st.slider("VIKOR strategy weight v (group utility vs. individual regret)", 0.0, 1.0, 0.5, 0.05,
+                                key="compare_vikor_v", disabled="VIKOR" not in methods)
+
+        if not methods:
+            st.warning("Select at least one method.")
+        else:
+            with span("app.method_comparison"):
+                result = RESULT_CACHE.call(compare_methods, matrix, st.session_state.weights, is_benefit,
+                                           methods=tuple(methods), consensus=consensus, vikor_v=vikor_v)
+
+            ranks_df = pd.DataFrame(result["positions"].T, columns=methods)
+            ranks_df.insert(0, "Alternative", alternatives)
+            ranks_df[f"{consensus} Consensus"] = result["consensus_positions"]
+            ranks_df["Rank Spread"] = result["rank_spread"]
+            ranks_df = ranks_df.sort_values(by=f"{consensus} Consensus")
+
+            st.subheader("🏆 Rankings per Method")
+            # Kolom progress sebagai pengganti Styler (Styler dibatasi 262.144 sel oleh Streamlit)
+            st.dataframe(
+                ranks_df, use_container_width=True, hide_index=True,
+                column_config={"Rank Spread": st.column_config.ProgressColumn(
+                    "Rank Spread", format="%d", min_value=0, max_value=max(len(ranks_df) - 1, 1))}
             )
-            st.success("Radar chart visualizing closeness to ideal profile generated successfully.")
-
-
-            # st.subheader("🛱️ Closeness to Ideal Profile (Radar Chart)")
-            # closeness_matrix = []
-            # range_scale = 4  # assuming 1-5 scale
-            # for row in matrix_pm:
-            #     closeness_row = [1 - abs(val - ideal) / range_scale for val, ideal in zip(row, ideal_values)]
-            #     closeness_matrix.append(closeness_row)
-
-            # fig_radar, ax_radar = plt.subplots(figsize=(8, 7), subplot_kw=dict(polar=True))
-            # angles = np.linspace(0, 2 * np.pi, num_criteria, endpoint=False).tolist()
-            # angles += angles[:1]
-
-            # bold_colors = ['#e41a1c', '#377eb8', '#4daf4a', '#984ea3', '#ff7f00']
-
-            # for i, row in enumerate(closeness_matrix):
-            #     values = row + row[:1]
-            #     ax_radar.plot(angles, values, label=alternatives[i], linewidth=2.5, marker='o', color=bold_colors[i % len(bold_colors)])
-            #     ax_radar.fill(angles, values, alpha=0.25, color=bold_colors[i % len(bold_colors)])
-
-            # ax_radar.set_thetagrids(np.degrees(angles[:-1]), criteria, fontsize=10)
-            # ax_radar.set_ylim(0, 1)
-            # ax_radar.set_title("Closeness of Alternatives to Ideal Profile", size=15, pad=20)
-            # ax_radar.legend(loc='lower center', bbox_to_anchor=(0.5, -0.15), ncol=2)
-
-            # st.pyplot(fig_radar)
-
-            # buf_radar = BytesIO()
-            # fig_radar.savefig(buf_radar, format="png")
-            # buf_radar.seek(0)
-            # st.download_button(
-            #     label="📅 Download Radar Chart as Image",
-            #     data=buf_radar,
-            #     file_name="radar_closeness_to_ideal.png",
-            #     mime="image/png"
-            # )
-            # st.success("Radar chart visualizing closeness to ideal profile generated successfully.")
-
-            # # Radar chart with enhanced style
-            # st.subheader("📡 Closeness to Ideal Profile (Radar Chart)")
-            # closeness_matrix = []
-            # range_scale = 4
-            # for row in matrix_pm:
-            #     closeness_row = [1 - abs(val - ideal) / range_scale for val, ideal in zip(row, ideal_values)]
-            #     closeness_matrix.append(closeness_row)
-
-            # fig_radar, ax_radar = plt.subplots(figsize=(7, 6), subplot_kw=dict(polar=True))
-            # angles = np.linspace(0, 2 * np.pi, num_criteria, endpoint=False).tolist()
-            # angles += angles[:1]
-
-            # custom_colors = ['#A6CEE3', '#B2DF8A', '#FDBF6F', '#CAB2D6', '#FF9999']
-
-            # for i, row in enumerate(closeness_matrix):
-            #     values = row + row[:1]
-            #     ax_radar.fill(angles, values, color='black', alpha=0.05, zorder=1)  # shadow layer
-            #     ax_radar.plot(angles, values, label=alternatives[i], linewidth=2.5, marker='o', color=custom_colors[i % len(custom_colors)], zorder=2)
-            #     ax_radar.fill(angles, values, alpha=0.25, color=custom_colors[i % len(custom_colors)], zorder=3)
-
-            # ax_radar.set_thetagrids(np.degrees(angles[:-1]), criteria, fontsize=10)
-            # ax_radar.set_ylim(0, 1)
-            # ax_radar.set_title("Closeness of Alternatives to Ideal Profile", size=15, pad=20)
-            # ax_radar.yaxis.grid(True, color='gray', linestyle='--', linewidth=0.5, alpha=0.3)
-            # ax_radar.legend(loc='upper right', bbox_to_anchor=(1.2, 1))
-
-            # st.pyplot(fig_radar)
-
-            # buf_radar = BytesIO()
-            # fig_radar.savefig(buf_radar, format="png")
-            # buf_radar.seek(0)
-            # st.download_button(
-            #     label="📅 Download Radar Chart as Image",
-            #     data=buf_radar,
-            #     file_name="radar_closeness_to_ideal.png",
-            #     mime="image/png"
-            # )
-            # st.success("Radar chart visualizing closeness to ideal profile generated successfully.")
-
-         
\ No newline at end of file
+
+            with st.expander("Scores per method"):
+                scores_df = pd.DataFrame({m: np.round(result["scores"][m], 4) for m in methods})
+                scores_df.insert(0, "Alternative", alternatives)
+                scores_df[f"{consensus} Score"] = result["consensus_scores"]
+                st.dataframe(scores_df, use_container_width=True, hide_index=True)
+
+            # Di mana metode tidak sepakat
+            st.subheader("⚖️ Where the Methods Disagree")
+            winners = {m: alternatives[int(np.argmin(result["positions"][k]))] for k, m in enumerate(methods)}
+            if len(set(winners.values())) == 1:
+                st.success(f"⭐ All methods rank **{next(iter(winners.values()))}** first.")
+            else:
+                st.warning("The methods pick different winners: " +
+                           ", ".join(f"{m} → **{alt}**" for m, alt in winners.items()))
+
+            disputed = ranks_df[ranks_df["Rank Spread"] > 0]
+            if disputed.empty:
+                st.info("Every alternative has the same rank under all selected methods.")
+            else:
+                st.markdown(f"{len(disputed):,} of {len(ranks_df):,} alternatives change rank between methods "
+                            "(largest spread first):")
+                st.dataframe(disputed.sort_values(by="Rank Spread", ascending=False, kind="stable").head(20),
+                             use_container_width=True, hide_index=True)
+
+            if len(methods) > 1:
+                st.markdown("Spearman rank correlation between methods (1 = identical ranking):")
+                st.dataframe(pd.DataFrame(np.round(result["agreement"], 3), index=methods, columns=methods),
+                             use_container_width=True)
+
+# Result cache counters (shared by all sessions in this server process)
+cache_stats = RESULT_CACHE.stats()
+st.sidebar.caption(
+    f"🗃️ Result cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses · "
+    f"{cache_stats['entries']} entries · {cache_stats['bytes'] / 1024**2:.1f} of {cache_stats['max_bytes'] / 1024**2:.0f} MB"
+)
+
+# Profiling panel: timing breakdown of the last N reruns of this session
+record_trace(end_trace())
+st.sidebar.checkbox("⏱️ Profile reruns", value=enabled_by_env(), key="profiling")
+st.session_state["full_rerun"] = False
+
+if profiling_enabled and st.session_state.get("traces"):
+    traces = list(st.session_state["traces"])
+    st.markdown("---")
+    with st.expander("⏱️ Profiling: timing breakdown of recent reruns (ms)", expanded=True):
+        st.number_input("Reruns to keep", min_value=1, max_value=100, value=10, key="profiling_history")
+        breakdown = {}
+        for t in traces:
+            column = {"total rerun": t.duration * 1000}
+            column.update({name: total * 1000 for name, (total, _, _) in t.summary().items()})
+            breakdown[t.label] = column
+        st.dataframe(pd.DataFrame(breakdown).round(2), use_container_width=True)
+        st.download_button(
+            label="📥 Export Traces (Chrome trace JSON)",
+            data=json.dumps({"traceEvents": chrome_trace_events(traces)}),
+            file_name="dss_traces.json",
+            mime="application/json"
+        )
@@ -0,0 +1,139 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+# --- PENYIMPANAN PROYEK ---
+# Setiap proyek adalah folder berisi snapshot berversi yang tidak pernah diubah setelah ditulis:
+#   <root>/<proyek>/v0001/meta.json      nilai kecil (kriteria, bobot, pengaturan) + ringkasan array
+#   <root>/<proyek>/v0001/<nama>.npy     array besar (matriks keputusan, skor, nama alternatif)
+# Array dibuka kembali dengan np.load(mmap_mode="r"), sehingga memuat studi jutaan baris hanya
+# memetakan file tanpa menyalin data. Snapshot ditulis ke folder sementara lalu di-rename agar
+# snapshot yang setengah jadi tidak pernah terlihat. Lokasi root diatur lewat DSS_PROJECT_DIR.
+PROJECT_ROOT = os.environ.get("DSS_PROJECT_DIR", "projects")
+
+def _root(root):
+    return root if root is not None else PROJECT_ROOT
+
+def project_slug(name):
+    slug = re.sub(r"[^\w.-]+", "_", str(name).strip()).strip("._")
+    if not slug:
+        raise ValueError("Project name must contain at least one letter or digit.")
+    return slug
+
+def _version_dir(project, version, root):
+    return os.path.join(_root(root), project_slug(project), f"v{int(version):04d}")
+
+def list_projects(root=None):
+    root = _root(root)
+    if not os.path.isdir(root):
+        return []
+    return sorted(d for d in os.listdir(root) if list_versions(d, root))
+
+def list_versions(project, root=None):
+    folder = os.path.join(_root(root), project_slug(project))
+    if not os.path.isdir(folder):
+        return []
+    versions = []
+    for entry in sorted(os.listdir(folder)):
+        path = os.path.join(folder, entry, "meta.json")
+        if re.fullmatch(r"v\d{4,}", entry) and os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                meta = json.load(f)
+            versions.append({"version": int(entry[1:]), "saved_at": meta.get("saved_at"),
+                             "note": meta.get("note", ""), "arrays": meta.get("arrays", {})})
+    return versions
+
+# meta: dict yang dapat di-JSON-kan; arrays: {nama: array-like}. Mengembalikan nomor versi baru.
+def save_snapshot(project, meta, arrays, note="", root=None):
+    folder = os.path.join(_root(root), project_slug(project))
+    os.makedirs(folder, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=folder)
+    try:
+        summary = {}
+        for name, value in arrays.items():
+            if value is None:
+                continue
+            array = np.asarray(value)
+            if array.dtype == object:
+                array = array.astype(str)
+            np.save(os.path.join(staging, f"{project_slug(name)}.npy"), array, allow_pickle=False)
+            summary[name] = {"file": f"{project_slug(name)}.npy", "shape": list(array.shape), "dtype": array.dtype.str}
+        record = {"saved_at": time.strftime("%Y-%m-%d %H:%M:%S"), "note": note, "meta": meta, "arrays": summary}
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=1)
+
+        # Nomor versi berikutnya; rename gagal bila versi yang sama baru saja ditulis proses lain
+        while True:
+            existing = [v["version"] for v in list_versions(project, root)]
+            version = max(existing, default=0) + 1
+            try:
+                os.rename(staging, _version_dir(project, version, root))
+                return version
+            except OSError:
+                if not os.path.isdir(_version_dir(project, version, root)):
+                    raise
+    finally:
+        if os.path.isdir(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+
+# Mengembalikan (meta, arrays, info); array dibuka sebagai memmap read-only bila mmap=True
+def load_snapshot(project, version=None, root=None, mmap=True):
+    if version is None:
+        versions = list_versions(project, root)
+        if not versions:
+            raise ValueError(f"Project '{project}' has no saved snapshots.")
+        version = versions[-1]["version"]
+    folder = _version_dir(project, version, root)
+    if not os.path.isfile(os.path.join(folder, "meta.json")):
+        raise ValueError(f"Project '{project}' has no version {version}.")
+    with open(os.path.join(folder, "meta.json"), encoding="utf-8") as f:
+        record = json.load(f)
+    arrays = {name: np.load(os.path.join(folder, item["file"]), mmap_mode="r" if mmap else None, allow_pickle=False)
+              for name, item in record["arrays"].items()}
+    info = {"version": int(version), "saved_at": record["saved_at"], "note": record["note"]}
+    return record["meta"], arrays, info
+
+# --- PERBANDINGAN SNAPSHOT ---
+# Jumlah sel yang berbeda dihitung per blok baris langsung dari memmap (NaN = NaN dianggap sama).
+def _changed_cells(a, b, block_rows=65536):
+    a, b = np.atleast_1d(a), np.atleast_1d(b)
+    changed = 0
+    for start in range(0, len(a), block_rows):
+        x, y = np.asarray(a[start:start + block_rows]), np.asarray(b[start:start + block_rows])
+        diff = x != y
+        if x.dtype.kind == "f" and y.dtype.kind == "f":
+            diff &= ~(np.isnan(x) & np.isnan(y))
+        changed += int(diff.sum())
+    return changed
+
+# Daftar perubahan antara dua versi: nilai meta dan array (ditambah, dihapus, bentuk berubah,
+# jumlah sel berubah)
+def diff_snapshots(project, version_a, version_b, root=None):
+    meta_a, arrays_a, _ = load_snapshot(project, version_a, root)
+    meta_b, arrays_b, _ = load_snapshot(project, version_b, root)
+
+    changes = []
+    for key in sorted(set(meta_a) | set(meta_b)):
+        old, new = meta_a.get(key), meta_b.get(key)
+        if old != new:
+            changes.append({"item": key, "kind": "setting", "change": "changed" if key in meta_a and key in meta_b
+                            else ("added" if key in meta_b else "removed"), "before": old, "after": new})
+    for name in sorted(set(arrays_a) | set(arrays_b)):
+        a, b = arrays_a.get(name), arrays_b.get(name)
+        if a is None or b is None:
+            changes.append({"item": name, "kind": "array", "change": "added" if a is None else "removed",
+                            "before": None if a is None else list(a.shape), "after": None if b is None else list(b.shape)})
+        elif a.shape != b.shape:
+            changes.append({"item": name, "kind": "array", "change": "shape changed",
+                            "before": list(a.shape), "after": list(b.shape)})
+        else:
+            cells = _changed_cells(a, b)
+            if cells:
+                changes.append({"item": name, "kind": "array", "change": f"{cells:,} of {a.size:,} cells changed",
+                                "before": list(a.shape), "after": list(b.shape)})
+    return changes
@@ -0,0 +1,119 @@
+import numpy as np
+
+from rumus import rank_scores
+
+# --- RANK REVERSAL (LEAVE-ONE-OUT) ---
+# Menghapus alternatif r dari TOPSIS mengubah dua hal:
+#   - norma kolom: S_j - x_rj² (jumlah kuadrat kolom dihitung sekali)
+#   - solusi ideal / anti-ideal: hanya bila r satu-satunya pemilik maks/min kolom j; nilai
+#     penggantinya adalah ekstrem kedua (diambil sekali dengan np.partition)
+# Jadi paling banyak 2m varian yang solusi idealnya berubah; varian ini dihitung ulang penuh.
+#
+# Untuk varian lain, jarak kuadrat menjadi d+'² = Σ_j A_ij / (S_j - x_rj²) dengan A_ij = w_j²(x_ij - x+_j)²,
+# yaitu suku d+² per kolom dikali c_rj² = S_j / (S_j - x_rj²) >= 1 (begitu juga d-'²). Dengan
+# ρ_r² = maks_j c_rj² / min_j c_rj², rasio q = d+/d- tiap alternatif hanya dapat bergeser dalam
+# faktor [1/ρ_r, ρ_r]. Alternatif dengan
+# q > ρ_r² · q(anggota top-k terakhir) tidak mungkin masuk top-k, sehingga skor persis hanya perlu
+# dihitung untuk sekelompok kecil alternatif terbaik. Total kerja O(n·m + n·L·m) dengan L jumlah
+# kandidat (kecil bila n besar, karena satu baris hanya menggeser norma kolom sedikit).
+#
+# Hasil (array berukuran n, indeks = alternatif yang dihapus):
+#   top              top-k (indeks global) tanpa penghapusan
+#   new_top          (n, k) top-k di antara alternatif yang tersisa setelah r dihapus
+#   expected_top     (n, k) top-k yang diharapkan: urutan awal tanpa r
+#   winner_changed   pemenang baru bukan alternatif terbaik berikutnya dari urutan awal
+#   top_k_changed    anggota atau urutan top-k berbeda dari yang diharapkan
+# (alternatif yang skor awalnya seri boleh bertukar tempat tanpa dihitung sebagai perubahan)
+
+def _distance_terms(matrix, weights, is_benefit, best=None, worst=None):
+    col_max, col_min = matrix.max(axis=0), matrix.min(axis=0)
+    best = np.where(is_benefit, col_max, col_min) if best is None else best
+    worst = np.where(is_benefit, col_min, col_max) if worst is None else worst
+    w2 = weights**2
+    return w2 * (matrix - best)**2, w2 * (matrix - worst)**2
+
+def _inverse(values):
+    with np.errstate(divide="ignore"):
+        return np.where(values > 0, 1 / np.where(values > 0, values, 1), 0.0)
+
+def topsis_leave_one_out(matrix, weights, is_benefit, top_k=1, block_cells=1 << 22):
+    matrix = np.asarray(matrix, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    is_benefit = np.asarray(is_benefit, dtype=bool)
+    n, m = matrix.shape
+    if n < 2:
+        raise ValueError("Leave-one-out analysis needs at least two alternatives.")
+    top_k = int(min(max(top_k, 1), n - 1))
+
+    sumsq = np.einsum("ij,ij->j", matrix, matrix)
+    A, B = _distance_terms(matrix, weights, is_benefit)
+    inv = _inverse(sumsq)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        q = np.sqrt(A @ inv) / np.sqrt(B @ inv)
+    q = np.where(np.isnan(q), np.inf, q)
+    order = np.argsort(q, kind="stable")
+    rank_of = np.empty(n, dtype=np.intp)
+    rank_of[order] = np.arange(n)
+
+    # Urutan awal tanpa r: k teratas dari `order` dengan r dilewati
+    base = np.arange(top_k)
+    expected_pos = base[None, :] + (base[None, :] >= rank_of[:, None])
+    expected_top = order[expected_pos]
+    new_top = np.empty((n, top_k), dtype=np.intp)
+
+    # Varian yang mengubah solusi ideal: r pemilik tunggal maks atau min suatu kolom
+    top2 = np.partition(matrix, (n - 2, n - 1), axis=0)[n - 2:]
+    low2 = np.partition(matrix, (0, 1), axis=0)[:2]
+    unique_max = (matrix == top2[1]) & (top2[0] < top2[1])
+    unique_min = (matrix == low2[0]) & (low2[1] > low2[0])
+    extreme = (unique_max | unique_min).any(axis=1)
+
+    for r in np.flatnonzero(extreme):
+        col_max = np.where(unique_max[r], top2[0], top2[1])
+        col_min = np.where(unique_min[r], low2[1], low2[0])
+        A_r, B_r = _distance_terms(matrix, weights, is_benefit,
+                                   np.where(is_benefit, col_max, col_min), np.where(is_benefit, col_min, col_max))
+        inv_r = _inverse(sumsq - matrix[r]**2)
+        d_pos, d_neg = np.sqrt(A_r @ inv_r), np.sqrt(B_r @ inv_r)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = d_neg / (d_pos + d_neg)
+        # Skor tak terdefinisi (semua sisa alternatif identik) tetap di atas alternatif yang dihapus
+        scores = np.where(np.isnan(scores), -1.0, scores)
+        scores[r] = -np.inf
+        new_top[r] = rank_scores(scores, top_k)[0]
+
+    # Varian lain: batas ρ_r menentukan berapa kandidat terbaik yang perlu dihitung persis
+    rows = np.flatnonzero(~extreme)
+    if len(rows):
+        inv_rows = _inverse(sumsq - matrix[rows]**2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            factor = np.where(inv > 0, inv_rows / inv, 1.0)
+        rho2 = factor.max(axis=1) / factor.min(axis=1)
+        q_last = q[expected_top[rows, -1]]
+        with np.errstate(invalid="ignore"):
+            bound = np.where(np.isfinite(q_last), rho2 * q_last, np.inf)
+        limit = np.searchsorted(q[order], bound, side="right")
+        L = int(min(n, max(top_k + 1, limit.max())))
+        cand = order[:L]
+
+        step = max(1, block_cells // (L * m))
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            inv_b = inv_rows[start:start + step]
+            d_pos, d_neg = np.sqrt(inv_b @ A[cand].T), np.sqrt(inv_b @ B[cand].T)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                scores = d_neg / (d_pos + d_neg)
+            scores = np.where(np.isnan(scores), -1.0, scores)
+            inside = rank_of[block] < L
+            scores[np.flatnonzero(inside), rank_of[block[inside]]] = -np.inf
+            new_top[block] = cand[rank_scores(scores, top_k)[0]]
+
+    # Pertukaran antar alternatif yang skor awalnya seri bukan rank reversal
+    differs = q[new_top] != q[expected_top]
+    return {
+        "top": order[:top_k],
+        "new_top": new_top,
+        "expected_top": expected_top,
+        "winner_changed": differs[:, 0],
+        "top_k_changed": differs.any(axis=1),
+    }
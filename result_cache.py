@@ -0,0 +1,161 @@
+import hashlib
+import inspect
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# --- HASH KONTEN ---
+# Kunci cache dibangun dari isi data (bytes array, dtype, shape), bukan identitas objek,
+# sehingga matriks/bobot yang sama dari sesi atau rerun berbeda menghasilkan kunci yang sama.
+def content_hash(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_hash(digest, part)
+    return digest.hexdigest()
+
+def _update_hash(digest, obj):
+    if isinstance(obj, np.ndarray) and obj.dtype != object:
+        digest.update(f"nd:{obj.dtype.str}:{obj.shape}:".encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, np.ndarray):
+        # Array objek: per elemen, masing-masing dengan tag tipenya (repr array terpotong "...")
+        digest.update(f"ndo:{obj.shape}:".encode())
+        for item in obj.ravel():
+            _update_hash(digest, item)
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        frame = obj.to_frame() if isinstance(obj, pd.Series) else obj
+        digest.update(f"pd:{type(obj).__name__}:{frame.shape}:".encode())
+        _update_hash(digest, [str(c) for c in frame.columns])
+        _update_hash(digest, [str(t) for t in frame.dtypes])
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, (bytes, bytearray)):
+        digest.update(f"bytes:{len(obj)}:".encode())
+        digest.update(obj)
+    elif isinstance(obj, (list, tuple)):
+        try:
+            array = np.asarray(obj)
+        except ValueError:
+            array = None
+        # ["1", 1] menjadi array string yang sama dengan ["1", "1"]; hanya dipakai bila semua elemen string
+        if array is not None and array.dtype.kind in "US":
+            if not all(isinstance(item, (str, bytes)) for item in np.asarray(obj, dtype=object).ravel()):
+                array = None
+        if array is not None and array.dtype != object:
+            _update_hash(digest, array)
+        else:
+            digest.update(f"seq:{len(obj)}:".encode())
+            for item in obj:
+                _update_hash(digest, item)
+    elif isinstance(obj, dict):
+        digest.update(f"dict:{len(obj)}:".encode())
+        for key in sorted(obj, key=repr):
+            _update_hash(digest, key)
+            _update_hash(digest, obj[key])
+    elif callable(obj):
+        # Fungsi hasil kompilasi (mis. tabel GAP) dapat menyertakan `cache_key`
+        key = getattr(obj, "cache_key", None)
+        name = f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+        if key is None and not _named_callable(obj):
+            # Lambda, closure, dan method terikat bergantung pada state yang tidak terlihat dari namanya
+            raise TypeError(f"Cannot build a cache key for {name}: give it a `cache_key` attribute.")
+        digest.update(f"fn:{name}:".encode())
+        if key is not None:
+            _update_hash(digest, key)
+    else:
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+# Callable yang cukup dikenali dari nama modul + qualname: fungsi/kelas level modul dan builtin
+def _named_callable(obj):
+    if not (inspect.isfunction(obj) or inspect.isbuiltin(obj) or isinstance(obj, (type, np.ufunc))):
+        return False
+    if inspect.isbuiltin(obj) and not inspect.ismodule(getattr(obj, "__self__", None)):
+        return False
+    return "<" not in getattr(obj, "__qualname__", getattr(obj, "__name__", "<"))
+
+# Perkiraan ukuran hasil di memori (byte) untuk anggaran cache
+def _size_of(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(_size_of(item) for item in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_size_of(k) + _size_of(v) for k, v in obj.items())
+    return sys.getsizeof(obj)
+
+# --- CACHE HASIL ---
+# LRU dengan anggaran memori (byte), aman dipakai bersama oleh banyak sesi (thread).
+# Nilai yang disimpan dibagikan antar pemanggil dan tidak boleh diubah (mutasi).
+class ResultCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = _size_of(value)
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    # Panggil fn(*args, **kwargs) dengan kunci = nama fungsi + hash isi argumen
+    def call(self, fn, *args, **kwargs):
+        key = content_hash(fn, args, kwargs)
+        return self.get_or_compute(key, lambda: fn(*args, **kwargs))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+# Satu instance per proses: modul ini diimpor sekali, sehingga dipakai bersama semua sesi Streamlit.
+# Anggaran memori diatur lewat variabel lingkungan DSS_CACHE_MB (default 256 MB).
+RESULT_CACHE = ResultCache(int(float(os.environ.get("DSS_CACHE_MB", 256)) * 1024 * 1024))
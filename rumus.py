@@ -1,89 +1,370 @@
+from functools import lru_cache
+
 import numpy as np
 
+from tracing import span
+
 # --- AHP ---
+RI_DICT = {1: 0.00, 2: 0.00, 3: 0.58, 4: 0.90, 5: 1.12, 6: 1.24,
+           7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49}
+
 def calculate_ahp_weights(matrix):
     matrix = np.array(matrix)
     n = matrix.shape[0]
 
-    # Normalisasi kolom
-    col_sum = matrix.sum(axis=0)
-    norm_matrix = matrix / col_sum
+    with span("ahp.weights"):
+        # Normalisasi kolom
+        col_sum = matrix.sum(axis=0)
+        norm_matrix = matrix / col_sum
+
+        # Hitung rata-rata baris sebagai bobot
+        weights = norm_matrix.mean(axis=1)
+
+    with span("ahp.consistency"):
+        # Konsistensi AHP
+        lamda_max = (np.dot(matrix, weights) / weights).mean()
+        CI = (lamda_max - n) / (n - 1) if n > 1 else 0
+        RI = random_index(n)
+        CR = CI / RI if RI != 0 else 0
+
+    return weights.tolist(), CR
+
+# --- AHP (EIGENVECTOR) ---
+# Iterasi pangkat (power iteration) untuk vektor eigen utama, bekerja juga pada tumpukan
+# matriks (..., n, n). Berhenti bila perubahan bobot maksimum < tol.
+def principal_eigenvector(matrices, tol=1e-10, max_iter=1000):
+    matrices = np.asarray(matrices, dtype=float)
+    n = matrices.shape[-1]
+    weights = np.full(matrices.shape[:-1], 1.0 / n)
+
+    for _ in range(max_iter):
+        nxt = np.einsum("...ij,...j->...i", matrices, weights)
+        nxt /= nxt.sum(axis=-1, keepdims=True)
+        delta = np.abs(nxt - weights).max()
+        weights = nxt
+        if delta < tol:
+            break
 
-    # Hitung rata-rata baris sebagai bobot
-    weights = norm_matrix.mean(axis=1)
+    # Bobot berjumlah 1, sehingga lambda_max = jumlah elemen A.w
+    lamda_max = np.einsum("...ij,...j->...", matrices, weights)
+    return weights, lamda_max
+
+def calculate_ahp_weights_eigen(matrix, tol=1e-10, max_iter=1000):
+    matrix = np.array(matrix, dtype=float)
+    n = matrix.shape[0]
+
+    weights, lamda_max = principal_eigenvector(matrix, tol, max_iter)
 
-    # Konsistensi AHP
-    lamda_max = (np.dot(matrix, weights) / weights).mean()
     CI = (lamda_max - n) / (n - 1) if n > 1 else 0
-    RI_dict = {1: 0.00, 2: 0.00, 3: 0.58, 4: 0.90, 5: 1.12, 6: 1.24,
-               7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49}
-    RI = RI_dict.get(n, 1.49)
+    RI = random_index(n)
     CR = CI / RI if RI != 0 else 0
 
-    return weights.tolist(), CR
+    return weights.tolist(), float(CR)
+
+# Indeks acak (RI) untuk n berapa pun: nilai Saaty untuk n <= 10, selebihnya dibangkitkan
+# dari rata-rata CI matriks resiprokal acak berskala 1/9..9 (seed tetap, hasil di-cache).
+SAATY_SCALE = np.array([1 / 9, 1 / 8, 1 / 7, 1 / 6, 1 / 5, 1 / 4, 1 / 3, 1 / 2,
+                        1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+@lru_cache(maxsize=None)
+def random_index(n, n_samples=2000, seed=0):
+    if n in RI_DICT:
+        return RI_DICT[n]
+    rng = np.random.default_rng(seed)
+    upper = rng.choice(SAATY_SCALE, size=(n_samples, n * (n - 1) // 2))
+    _, lamda_max = principal_eigenvector(pairwise_from_upper(upper, n), tol=1e-8)
+    return float(((lamda_max - n) / (n - 1)).mean())
+
+# --- AHP (BATCH) ---
+# Tumpukan matriks perbandingan (k, n, n) -> bobot (k, n) dan CR (k,).
+# method="mean": rata-rata baris seperti calculate_ahp_weights; "eigen": vektor eigen utama.
+def calculate_ahp_weights_batch(matrices, method="mean"):
+    matrices = np.asarray(matrices, dtype=float)
+    n = matrices.shape[-1]
+
+    if method == "eigen":
+        weights, lamda_max = principal_eigenvector(matrices)
+    elif method == "mean":
+        norm_matrix = matrices / matrices.sum(axis=-2, keepdims=True)
+        weights = norm_matrix.mean(axis=-1)
+        lamda_max = (np.einsum("...ij,...j->...i", matrices, weights) / weights).mean(axis=-1)
+    else:
+        raise ValueError(f"Unknown AHP method: {method}")
+
+    CI = (lamda_max - n) / (n - 1) if n > 1 else np.zeros_like(lamda_max)
+    RI = random_index(n)
+    CR = CI / RI if RI != 0 else np.zeros_like(CI)
+
+    return weights, CR
+
+# Menyusun matriks perbandingan resiprokal dari nilai segitiga atas (urutan baris, i < j).
+# upper: (..., n(n-1)/2) -> (..., n, n)
+def pairwise_from_upper(upper, n):
+    upper = np.asarray(upper, dtype=float)
+    iu = np.triu_indices(n, 1)
+    matrices = np.ones(upper.shape[:-1] + (n, n))
+    matrices[..., iu[0], iu[1]] = upper
+    matrices[..., iu[1], iu[0]] = 1 / upper
+    return matrices
+
+# --- RANKING ---
+# Urutan alternatif dari skor tertinggi sepanjang axis terakhir. Dengan top_k hanya k teratas
+# yang diurutkan (argpartition lalu sort kecil), bukan seluruh n alternatif.
+# positions: peringkat 1-based tiap alternatif (0 bila di luar top_k), sehingga pemanggil
+# tidak perlu membalik urutan ranking sendiri.
+def rank_scores(scores, top_k=None):
+    scores = np.asarray(scores, dtype=float)
+    n = scores.shape[-1]
+    if top_k is None or top_k >= n:
+        ranking = np.argsort(scores, axis=-1)[..., ::-1]
+    else:
+        part = np.argpartition(scores, n - top_k, axis=-1)[..., n - top_k:]
+        order = np.argsort(np.take_along_axis(scores, part, axis=-1), axis=-1)[..., ::-1]
+        ranking = np.take_along_axis(part, order, axis=-1)
+
+    positions = np.zeros(scores.shape, dtype=np.intp)
+    ranks = np.broadcast_to(np.arange(1, ranking.shape[-1] + 1), ranking.shape)
+    np.put_along_axis(positions, ranking, ranks, axis=-1)
+    return ranking, positions
 
 # --- TOPSIS ---
-def topsis(matrix, weights, is_benefit):
+def _normalisasi_euclidean(matrix):
+    # Kolom dinormalisasi terhadap alternatif (axis -2), berlaku juga untuk tumpukan matriks
+    return matrix / np.sqrt((matrix**2).sum(axis=-2, keepdims=True))
+
+def topsis(matrix, weights, is_benefit, top_k=None, return_positions=False):
     matrix = np.array(matrix, dtype=float)
     weights = np.array(weights, dtype=float)
 
     # Normalisasi Euclidean
-    norm = matrix / np.sqrt((matrix**2).sum(axis=0))
-    weighted = norm * weights
+    with span("topsis.normalisation"):
+        norm = _normalisasi_euclidean(matrix)
+        weighted = norm * weights
 
     # Solusi ideal positif dan negatif
-    is_benefit = np.array(is_benefit, dtype=bool)
-    ideal_pos = np.where(is_benefit, np.max(weighted, axis=0), np.min(weighted, axis=0))
-    ideal_neg = np.where(is_benefit, np.min(weighted, axis=0), np.max(weighted, axis=0))
+    with span("topsis.ideal"):
+        is_benefit = np.array(is_benefit, dtype=bool)
+        ideal_pos = np.where(is_benefit, np.max(weighted, axis=0), np.min(weighted, axis=0))
+        ideal_neg = np.where(is_benefit, np.min(weighted, axis=0), np.max(weighted, axis=0))
 
     # Jarak ke solusi ideal
-    d_pos = np.sqrt(((weighted - ideal_pos)**2).sum(axis=1))
-    d_neg = np.sqrt(((weighted - ideal_neg)**2).sum(axis=1))
+    with span("topsis.distance"):
+        d_pos = np.sqrt(((weighted - ideal_pos)**2).sum(axis=1))
+        d_neg = np.sqrt(((weighted - ideal_neg)**2).sum(axis=1))
 
     # Skor preferensi
-    scores = d_neg / (d_pos + d_neg)
-    ranking = np.argsort(scores)[::-1]  # descending
+    with span("topsis.ranking"):
+        scores = d_neg / (d_pos + d_neg)
+        ranking, positions = rank_scores(scores, top_k)  # descending
 
+    if return_positions:
+        return scores.tolist(), ranking.tolist(), positions.tolist()
     return scores.tolist(), ranking.tolist()
 
+# --- TOPSIS (BATCH) ---
+# matrix: (n, m) atau tumpukan (k, n, m); weights: (m,) atau (k, m); is_benefit: (m,) atau (k, m).
+# Menghasilkan skor dan ranking berukuran (k, n) untuk k skenario sekaligus.
+def topsis_batch(matrix, weights, is_benefit, top_k=None, return_positions=False):
+    matrix = np.asarray(matrix, dtype=float)
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    is_benefit = np.atleast_2d(np.asarray(is_benefit, dtype=bool))
+
+    # Normalisasi dihitung sekali per matriks dan dipakai ulang oleh semua set bobot
+    norm = _normalisasi_euclidean(matrix)
+    if norm.ndim == 2:
+        norm = norm[np.newaxis]
+    weighted = norm * weights[:, np.newaxis, :]
+
+    # Solusi ideal positif dan negatif per skenario
+    col_max = weighted.max(axis=1, keepdims=True)
+    col_min = weighted.min(axis=1, keepdims=True)
+    is_benefit = is_benefit[:, np.newaxis, :]
+    ideal_pos = np.where(is_benefit, col_max, col_min)
+    ideal_neg = np.where(is_benefit, col_min, col_max)
+
+    # Jarak ke solusi ideal
+    d_pos = np.sqrt(((weighted - ideal_pos)**2).sum(axis=-1))
+    d_neg = np.sqrt(((weighted - ideal_neg)**2).sum(axis=-1))
+
+    scores = d_neg / (d_pos + d_neg)
+    ranking, positions = rank_scores(scores, top_k)  # descending per skenario
+
+    if return_positions:
+        return scores, ranking, positions
+    return scores, ranking
+
+# --- TOPSIS (KERNEL HEMAT MEMORI) ---
+# Menghitung skor TOPSIS tanpa membuat salinan matriks berukuran penuh: dua pass per blok
+# (statistik kolom, lalu jarak) dengan buffer kerja yang dipakai ulang. Puncak memori kira-kira
+# matriks masukan + dua vektor n + dua buffer blok (block_cells elemen).
+# - float32 dan float64 dipakai apa adanya (tanpa salinan); dtype lain dikonversi ke float64.
+# - Matriks C-order diproses per blok baris, F-order per blok kolom.
+# - out: buffer skor (n,) opsional dengan dtype yang sama dengan matriks (float32 / float64),
+#   diisi di tempat dan dikembalikan.
+# Akurasi: jumlah kuadrat kolom selalu diakumulasikan dalam float64, sehingga masukan float64
+# sama dengan topsis() sampai ~1e-12. Masukan float32 menghitung jarak dalam float32; selisih
+# skor terhadap jalur float64 berorde 1e-7..1e-6 (beberapa ulp float32, lihat test_rumus.py),
+# jadi peringkat hanya dapat berbeda untuk alternatif yang skornya berselisih kurang dari itu.
+def topsis_kernel(matrix, weights, is_benefit, out=None, block_cells=1 << 20):
+    matrix = np.asarray(matrix)
+    if matrix.dtype not in (np.float32, np.float64):
+        matrix = matrix.astype(np.float64)
+    dtype = matrix.dtype
+    n, m = matrix.shape
+    weights = np.asarray(weights, dtype=np.float64)
+    is_benefit = np.asarray(is_benefit, dtype=bool)
+    if out is None:
+        out = np.empty(n, dtype=dtype)
+    elif not isinstance(out, np.ndarray) or out.dtype != dtype or out.shape != (n,):
+        # Dicek di awal: einsum/divide dengan out= lain gagal di tengah jalan dengan pesan casting
+        raise ValueError(f"out must be a {dtype} array of shape ({n},) to match the matrix, "
+                         f"got {getattr(out, 'dtype', type(out).__name__)} {np.shape(out)}")
+    elif not out.flags.writeable:
+        raise ValueError("out must be writeable")
+
+    by_columns = matrix.flags.f_contiguous and not matrix.flags.c_contiguous
+    step = max(1, block_cells // n) if by_columns else max(1, block_cells // m)
+    blocks = [(slice(None), slice(s, s + step)) for s in range(0, m, step)] if by_columns \
+        else [(slice(s, s + step), slice(None)) for s in range(0, n, step)]
+
+    # Pass 1: statistik kolom (jumlah kuadrat dalam float64, maks, min)
+    with span("topsis.normalisation"):
+        sumsq = np.zeros(m)
+        col_max = np.full(m, -np.inf)
+        col_min = np.full(m, np.inf)
+        for rows, cols in blocks:
+            block = matrix[rows, cols]
+            if by_columns:
+                sumsq[cols] = np.einsum("ij,ij->j", block, block, dtype=np.float64)
+                col_max[cols] = block.max(axis=0)
+                col_min[cols] = block.min(axis=0)
+            else:
+                sumsq += np.einsum("ij,ij->j", block, block, dtype=np.float64)
+                np.maximum(col_max, block.max(axis=0), out=col_max)
+                np.minimum(col_min, block.min(axis=0), out=col_min)
+
+    # Solusi ideal dari statistik kolom: bobot >= 0 sehingga maks/min tidak berubah setelah diskalakan
+    with span("topsis.ideal"):
+        scale = weights / np.sqrt(sumsq)
+        ideal_pos = np.where(is_benefit, scale * col_max, scale * col_min).astype(dtype)
+        ideal_neg = np.where(is_benefit, scale * col_min, scale * col_max).astype(dtype)
+        scale = scale.astype(dtype)
+
+    # Pass 2: jarak kuadrat per blok; `out` menampung d+² dan d_neg menampung d-²
+    with span("topsis.distance"):
+        d_neg = np.zeros(n, dtype=dtype)
+        if by_columns:
+            out[:] = 0
+        shape = (n, min(step, m)) if by_columns else (min(step, n), m)
+        weighted, diff = np.empty(shape, dtype=dtype), np.empty(shape, dtype=dtype)
+        for rows, cols in blocks:
+            block = matrix[rows, cols]
+            w = weighted[:block.shape[0], :block.shape[1]]
+            d = diff[:block.shape[0], :block.shape[1]]
+            np.multiply(block, scale[cols], out=w)
+            np.subtract(w, ideal_pos[cols], out=d)
+            if by_columns:
+                out += np.einsum("ij,ij->i", d, d)
+                np.subtract(w, ideal_neg[cols], out=d)
+                d_neg += np.einsum("ij,ij->i", d, d)
+            else:
+                np.einsum("ij,ij->i", d, d, out=out[rows])
+                np.subtract(w, ideal_neg[cols], out=d)
+                np.einsum("ij,ij->i", d, d, out=d_neg[rows])
+
+    # Skor preferensi di tempat: out = sqrt(d-²) / (sqrt(d+²) + sqrt(d-²))
+    with span("topsis.ranking"):
+        np.sqrt(out, out=out)
+        np.sqrt(d_neg, out=d_neg)
+        np.add(out, d_neg, out=out)
+        np.divide(d_neg, out, out=out)
+    return out
+
 # --- PROFILE MATCHING ---
+GAP_WEIGHTS = {
+    0: 5.0,
+    1: 4.5,
+    2: 4.0,
+    3: 3.5,
+    4: 3.0,
+    5: 2.5
+}
+
 def gap_weight(gap):
-    mapping = {
-        0: 5.0,
-        1: 4.5,
-        2: 4.0,
-        3: 3.5,
-        4: 3.0,
-        5: 2.5
-    }
-    return mapping.get(abs(gap), 1.0)
-
-def profile_matching(ideal, actuals, weights, cf_sf_grouping):
-    scores = []
+    return GAP_WEIGHTS.get(abs(gap), 1.0)
 
-    # Hitung total bobot CF dan SF
-    total_cf_weight = sum(w for w, g in zip(weights, cf_sf_grouping) if g == 'CF')
-    total_sf_weight = sum(w for w, g in zip(weights, cf_sf_grouping) if g == 'SF')
+# Menyusun tabel bobot GAP menjadi fungsi vektor yang bekerja pada seluruh array gap.
+# Jika tabel memuat kunci negatif, gap diperlakukan bertanda; jika tidak, dipakai |gap|.
+# interpolate=True: gap pecahan diinterpolasi linear antar kunci (dan turun ke `default`
+# dalam satu satuan gap di luar tabel); interpolate=False: lookup array untuk gap bulat,
+# gap lain mendapat `default`.
+def compile_gap_weight(mapping=None, default=1.0, interpolate=True):
+    mapping = GAP_WEIGHTS if mapping is None else mapping
+    if not mapping:
+        raise ValueError("Gap weight table must not be empty.")
+    signed = any(k < 0 for k in mapping)
+    keys = np.array(sorted(mapping), dtype=float)
+    values = np.array([mapping[k] for k in sorted(mapping)], dtype=float)
 
-    for alt in actuals:
-        cf_scores = []
-        sf_scores = []
+    if interpolate:
+        xp = np.concatenate(([keys[0] - 1], keys, [keys[-1] + 1]))
+        fp = np.concatenate(([default], values, [default]))
 
-        for ideal_val, actual_val, group in zip(ideal, alt, cf_sf_grouping):
-            gap = actual_val - ideal_val
-            score = gap_weight(gap)
+        def lookup(gap):
+            gap = np.asarray(gap, dtype=float)
+            return np.interp(gap if signed else np.abs(gap), xp, fp)
+        lookup.cache_key = (sorted((float(k), float(v)) for k, v in mapping.items()), float(default), True)
+        return lookup
 
-            if group == 'CF':
-                cf_scores.append(score)
-            else:
-                sf_scores.append(score)
+    if np.any(keys != np.floor(keys)):
+        raise ValueError("Gap keys must be integers when interpolation is disabled.")
+    offset = int(keys[0])
+    table = np.full(int(keys[-1]) - offset + 1, default, dtype=float)
+    table[keys.astype(np.intp) - offset] = values
+
+    def lookup(gap):
+        gap = np.asarray(gap, dtype=float)
+        idx = (gap if signed else np.abs(gap)) - offset
+        valid = (idx == np.floor(idx)) & (idx >= 0) & (idx < len(table))
+        return np.where(valid, table[np.where(valid, idx, 0).astype(np.intp)], default)
+    lookup.cache_key = (sorted((float(k), float(v)) for k, v in mapping.items()), float(default), False)
+    return lookup
+
+_DEFAULT_GAP_TABLE = compile_gap_weight()
+
+# Matriks bobot GAP (n, m): gap dihitung sekali untuk semua alternatif dan kriteria
+def gap_score_matrix(ideal, actuals, gap_table=None):
+    gap_table = _DEFAULT_GAP_TABLE if gap_table is None else gap_table
+    gap = np.asarray(actuals, dtype=float) - np.asarray(ideal, dtype=float)
+    return gap_table(gap)
 
-        # Rata-rata GAP score per grup
-        avg_cf = sum(cf_scores) / len(cf_scores) if cf_scores else 0
-        avg_sf = sum(sf_scores) / len(sf_scores) if sf_scores else 0
+# Rata-rata bobot GAP per grup (masked mean), kriteria selain CF dihitung sebagai SF
+def cf_sf_averages(gap_scores, cf_sf_grouping):
+    is_cf = np.asarray(cf_sf_grouping) == 'CF'
+    n_cf = is_cf.sum()
+    n_sf = is_cf.size - n_cf
+    avg_cf = gap_scores @ is_cf / n_cf if n_cf else np.zeros(gap_scores.shape[0])
+    avg_sf = gap_scores @ ~is_cf / n_sf if n_sf else np.zeros(gap_scores.shape[0])
+    return avg_cf, avg_sf
 
-        final_score = (avg_cf * total_cf_weight) + (avg_sf * total_sf_weight)
-        scores.append(final_score)
+def profile_matching(ideal, actuals, weights, cf_sf_grouping, gap_table=None, top_k=None, return_positions=False):
+    weights = np.asarray(weights, dtype=float)
+    grouping = np.asarray(cf_sf_grouping)
 
-    ranking = np.argsort(scores)[::-1]
-    return scores, ranking.tolist()
+    # Hitung total bobot CF dan SF
+    total_cf_weight = weights[grouping == 'CF'].sum()
+    total_sf_weight = weights[grouping == 'SF'].sum()
+
+    with span("pm.gap"):
+        gap_scores = gap_score_matrix(ideal, actuals, gap_table)
+
+    with span("pm.aggregate"):
+        avg_cf, avg_sf = cf_sf_averages(gap_scores, grouping)
+        scores = (avg_cf * total_cf_weight) + (avg_sf * total_sf_weight)
+
+    with span("pm.ranking"):
+        ranking, positions = rank_scores(scores, top_k)
+
+    if return_positions:
+        return scores.tolist(), ranking.tolist(), positions.tolist()
+    return scores.tolist(), ranking.tolist()
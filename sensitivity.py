@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from rumus import (calculate_ahp_weights_batch, cf_sf_averages, gap_score_matrix,
+                   pairwise_from_upper, rank_scores, topsis_batch)
+
+# --- SAMPLING BOBOT ---
+# Bobot acak dari distribusi Dirichlet yang berpusat pada bobot AHP.
+# Semakin besar `concentration`, semakin kecil sebaran bobot di sekitar bobot AHP.
+def sample_dirichlet_weights(weights, n_draws, concentration=100.0, rng=None):
+    rng = np.random.default_rng(rng)
+    weights = np.asarray(weights, dtype=float)
+    alpha = np.maximum(weights / weights.sum(), 1e-9) * concentration
+    return rng.dirichlet(alpha, size=n_draws)
+
+# Gangguan multiplikatif (log-normal) pada segitiga atas matriks perbandingan berpasangan,
+# dibatasi ke skala Saaty 1/9..9, lalu bobot dihitung ulang untuk setiap draw.
+def sample_pairwise_weights(pairwise, n_draws, spread=0.2, rng=None):
+    rng = np.random.default_rng(rng)
+    pairwise = np.asarray(pairwise, dtype=float)
+    n = pairwise.shape[0]
+    log_upper = np.log(pairwise[np.triu_indices(n, 1)])
+
+    noise = rng.normal(0.0, spread, size=(n_draws, len(log_upper)))
+    upper = np.exp(np.clip(log_upper + noise, -np.log(9), np.log(9)))
+    weights, _ = calculate_ahp_weights_batch(pairwise_from_upper(upper, n))
+    return weights
+
+# --- SKORING PER BATCH ---
+# counts[i, r]: jumlah draw dengan alternatif i berada di peringkat r + 1, hanya untuk r < top_k,
+# sehingga memori O(n·top_k) dan bukan O(n²); rank_sum[i]: jumlah peringkat i atas semua draw
+def _rank_counts(method, data, weight_batch, top_k):
+    if method == "topsis":
+        matrix, is_benefit = data
+        _, ranking, positions = topsis_batch(matrix, weight_batch, is_benefit, return_positions=True)
+    else:
+        # Rata-rata CF/SF tidak bergantung bobot, sehingga skor PM per draw cukup kombinasi linear
+        avg_cf, avg_sf, is_cf, is_sf = data
+        scores = np.outer(weight_batch @ is_cf, avg_cf) + np.outer(weight_batch @ is_sf, avg_sf)
+        ranking, positions = rank_scores(scores)
+
+    n = ranking.shape[1]
+    flat = ranking[:, :top_k] * top_k + np.arange(top_k)
+    counts = np.bincount(flat.ravel(), minlength=n * top_k).reshape(n, top_k)
+    return counts, positions.sum(axis=0)
+
+# --- MONTE CARLO ---
+# method: "topsis" (butuh matrix, is_benefit) atau "profile_matching"
+# (butuh matrix sebagai nilai aktual, ideal, cf_sf_grouping, opsional gap_table).
+# sampling: "dirichlet" (sekitar `weights`) atau "pairwise" (gangguan pada `pairwise`).
+# Semua bobot diambil di proses utama dari `seed`, sehingga hasil deterministik
+# untuk berapa pun jumlah worker. `progress(done, total)` dipanggil tiap batch selesai.
+# Hanya `top_k` peringkat teratas yang dihitung per alternatif; ukuran batch dibatasi agar
+# satu batch (draw x alternatif x kriteria) tidak melebihi `block_cells` elemen.
+def monte_carlo_sensitivity(method, matrix, weights, n_draws=5000, is_benefit=None, ideal=None,
+                            cf_sf_grouping=None, gap_table=None, pairwise=None, sampling="dirichlet",
+                            concentration=100.0, spread=0.2, seed=None, batch_size=500,
+                            n_jobs=None, progress=None, top_k=10, block_cells=1 << 22):
+    rng = np.random.default_rng(seed)
+    if sampling == "dirichlet":
+        draws = sample_dirichlet_weights(weights, n_draws, concentration, rng)
+    elif sampling == "pairwise":
+        if pairwise is None:
+            raise ValueError("Pairwise sampling requires the pairwise comparison matrix.")
+        draws = sample_pairwise_weights(pairwise, n_draws, spread, rng)
+    else:
+        raise ValueError(f"Unknown sampling mode: {sampling}")
+
+    if method == "topsis":
+        data = (np.asarray(matrix, dtype=float), np.asarray(is_benefit, dtype=bool))
+    elif method == "profile_matching":
+        grouping = np.asarray(cf_sf_grouping)
+        avg_cf, avg_sf = cf_sf_averages(gap_score_matrix(ideal, matrix, gap_table), grouping)
+        data = (avg_cf, avg_sf, (grouping == "CF").astype(float), (grouping == "SF").astype(float))
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    n_alt, n_crit = np.shape(matrix)
+    top_k = int(min(max(top_k, 1), n_alt))
+    batch_size = int(min(batch_size, max(1, block_cells // (n_alt * n_crit))))
+    batches = [draws[i:i + batch_size] for i in range(0, n_draws, batch_size)]
+    counts = np.zeros((n_alt, top_k), dtype=np.int64)
+    rank_sum = np.zeros(n_alt, dtype=np.int64)
+    done = 0
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(batches) == 1:
+        for batch in batches:
+            batch_counts, batch_ranks = _rank_counts(method, data, batch, top_k)
+            counts += batch_counts
+            rank_sum += batch_ranks
+            done += len(batch)
+            if progress:
+                progress(done, n_draws)
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(batches))) as pool:
+            futures = {pool.submit(_rank_counts, method, data, batch, top_k): len(batch) for batch in batches}
+            for future in as_completed(futures):
+                batch_counts, batch_ranks = future.result()
+                counts += batch_counts
+                rank_sum += batch_ranks
+                done += futures[future]
+                if progress:
+                    progress(done, n_draws)
+
+    acceptability = counts / n_draws
+    return {
+        "rank_acceptability": acceptability,
+        "win_probability": acceptability[:, 0],
+        "mean_rank": rank_sum / n_draws,
+        "top_k": top_k,
+        "n_draws": n_draws,
+    }
@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from rumus import (calculate_ahp_weights_batch, compile_gap_weight, profile_matching, rank_scores,
+                   topsis_batch)
+
+# --- LAYANAN JSON LOKAL ---
+# Server HTTP asyncio (hanya pustaka standar + NumPy) untuk AHP, TOPSIS dan Profile Matching.
+# Permintaan yang datang bersamaan dengan kriteria dan bobot yang sama digabung (coalescing)
+# menjadi satu panggilan NumPy ber-batch yang dijalankan di process pool, sehingga event loop
+# tidak pernah terblokir oleh perhitungan.
+#
+#   POST /ahp               {"pairwise": [[...]], "method": "mean" | "eigen"}
+#   POST /topsis            {"matrix": [[...]], "weights": [...], "is_benefit": [...], "top_k": k}
+#   POST /profile-matching  {"ideal": [...], "actuals": [[...]], "weights": [...], "cf_sf": [...],
+#                            "gap_table": {gap: bobot}, "gap_interpolate": true, "top_k": k}
+#   GET  /stats             jumlah permintaan, batch, dan latensi p50/p99 per endpoint
+#   GET  /health
+
+# --- FUNGSI BATCH (dijalankan di worker) ---
+def _batch_ahp(matrices, method):
+    weights, cr = calculate_ahp_weights_batch(np.stack(matrices), method)
+    return [{"weights": w.tolist(), "consistency_ratio": float(c)} for w, c in zip(weights, cr)]
+
+def _batch_topsis(matrices, weights, is_benefit, top_ks):
+    scores, _ = topsis_batch(np.stack(matrices), weights, is_benefit)
+    results = []
+    for row, top_k in zip(scores, top_ks):
+        ranking, positions = rank_scores(row, top_k)
+        results.append({"scores": row.tolist(), "ranking": ranking.tolist(), "positions": positions.tolist()})
+    return results
+
+# Baris dari semua permintaan digabung menjadi satu matriks; profil ideal diulang per baris
+def _batch_profile_matching(ideals, actuals, weights, cf_sf, gap_table, gap_interpolate, top_ks):
+    lengths = [len(a) for a in actuals]
+    ideal_rows = np.repeat(np.asarray(ideals, dtype=float), lengths, axis=0)
+    table = None
+    if gap_table:
+        mapping = {float(k): float(v) for k, v in gap_table.items()}
+        table = compile_gap_weight(mapping, interpolate=gap_interpolate)
+    scores, _ = profile_matching(ideal_rows, np.concatenate(actuals), weights, cf_sf, table)
+
+    results = []
+    for row, top_k in zip(np.split(np.asarray(scores), np.cumsum(lengths)[:-1]), top_ks):
+        ranking, positions = rank_scores(row, top_k)
+        results.append({"scores": row.tolist(), "ranking": ranking.tolist(), "positions": positions.tolist()})
+    return results
+
+# --- PENGGABUNGAN PERMINTAAN ---
+# Permintaan dengan kunci yang sama dalam jendela waktu `window` detik dikumpulkan,
+# lalu dijalankan sebagai satu batch di executor.
+class Coalescer:
+    def __init__(self, executor, window=0.002):
+        self.executor = executor
+        self.window = window
+        self.pending = {}
+        self.batches = 0
+        self.coalesced = 0
+
+    async def submit(self, key, item, run_batch):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        group = self.pending.get(key)
+        if group is None:
+            group = self.pending[key] = []
+            loop.call_later(self.window, lambda: asyncio.ensure_future(self._flush(key, run_batch)))
+        group.append((item, future))
+        return await future
+
+    async def _flush(self, key, run_batch):
+        group = self.pending.pop(key)
+        items = [item for item, _ in group]
+        self.batches += 1
+        self.coalesced += len(group)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, run_batch, items)
+        except Exception as e:
+            if len(group) == 1:
+                group[0][1].set_exception(e)
+                return
+            # Batch gagal: ulangi per permintaan agar setiap pemanggil hanya menerima galatnya sendiri
+            for item, future in group:
+                try:
+                    future.set_result((await loop.run_in_executor(self.executor, run_batch, [item]))[0])
+                except Exception as item_error:
+                    future.set_exception(item_error)
+            return
+        for (_, future), result in zip(group, results):
+            future.set_result(result)
+
+# Pembungkus level modul agar dapat di-pickle untuk ProcessPoolExecutor
+def _run_ahp(items):
+    return _batch_ahp([item["pairwise"] for item in items], items[0].get("method", "mean"))
+
+def _run_topsis(items):
+    first = items[0]
+    return _batch_topsis([item["matrix"] for item in items], first["weights"], first["is_benefit"],
+                         [item.get("top_k") for item in items])
+
+def _run_profile_matching(items):
+    first = items[0]
+    return _batch_profile_matching([item["ideal"] for item in items],
+                                   [np.asarray(item["actuals"], dtype=float) for item in items],
+                                   first["weights"], first["cf_sf"], first.get("gap_table"),
+                                   first.get("gap_interpolate", True), [item.get("top_k") for item in items])
+
+def _freeze(value):
+    return json.dumps(value, sort_keys=True)
+
+# --- VALIDASI INPUT ---
+# Diperiksa sebelum submit() agar satu permintaan rusak tidak menggagalkan satu batch penuh
+def _numeric(value, name, ndim):
+    array = np.asarray(value, dtype=float)
+    if array.ndim != ndim:
+        raise ValueError(f"'{name}' must be a {ndim}-dimensional array of numbers.")
+    if not np.isfinite(array).all():
+        raise ValueError(f"'{name}' must contain only finite numbers.")
+    return array
+
+def _check_top_k(body):
+    top_k = body.get("top_k")
+    if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1):
+        raise ValueError("'top_k' must be a positive integer.")
+
+def _check_gap_table(body):
+    gap_table = body.get("gap_table")
+    if gap_table is None:
+        return
+    if not isinstance(gap_table, dict):
+        raise ValueError("'gap_table' must be an object mapping gap to weight.")
+    # Kunci objek JSON selalu string
+    mapping = {float(k): float(v) for k, v in gap_table.items()}
+    compile_gap_weight(mapping, interpolate=body.get("gap_interpolate", True))
+
+class ScoringService:
+    def __init__(self, workers=None, window=0.002):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.coalescer = Coalescer(self.executor, window)
+        self.latencies = defaultdict(lambda: deque(maxlen=10000))
+        self.requests = defaultdict(int)
+
+    async def handle_ahp(self, body):
+        matrix = _numeric(body["pairwise"], "pairwise", 2)
+        if matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("'pairwise' must be a square matrix.")
+        if body.get("method", "mean") not in ("mean", "eigen"):
+            raise ValueError("'method' must be 'mean' or 'eigen'.")
+        key = ("ahp", matrix.shape[0], body.get("method", "mean"))
+        return await self.coalescer.submit(key, body, _run_ahp)
+
+    async def handle_topsis(self, body):
+        if "is_benefit" not in body and "criteria_types" in body:
+            body["is_benefit"] = [t.lower() == "benefit" for t in body["criteria_types"]]
+        shape = _numeric(body["matrix"], "matrix", 2).shape
+        _numeric(body["weights"], "weights", 1)
+        _check_top_k(body)
+        if shape[1] != len(body["weights"]) or len(body["is_benefit"]) != shape[1]:
+            raise ValueError("'matrix' must be alternatives x criteria matching 'weights' and 'is_benefit'.")
+        key = ("topsis", shape, _freeze(body["weights"]), _freeze(body["is_benefit"]))
+        return await self.coalescer.submit(key, body, _run_topsis)
+
+    async def handle_profile_matching(self, body):
+        m = len(_numeric(body["weights"], "weights", 1))
+        actuals = _numeric(body["actuals"], "actuals", 2)
+        _numeric(body["ideal"], "ideal", 1)
+        _check_top_k(body)
+        _check_gap_table(body)
+        if actuals.shape[1] != m or len(body["ideal"]) != m or len(body["cf_sf"]) != m:
+            raise ValueError("'actuals', 'ideal' and 'cf_sf' must match the number of criteria in 'weights'.")
+        key = ("profile_matching", _freeze(body["weights"]), _freeze(body["cf_sf"]),
+               _freeze(body.get("gap_table")), body.get("gap_interpolate", True))
+        return await self.coalescer.submit(key, body, _run_profile_matching)
+
+    def stats(self):
+        endpoints = {}
+        for route, samples in self.latencies.items():
+            values = np.asarray(samples) * 1000
+            endpoints[route] = {
+                "requests": self.requests[route],
+                "p50_ms": round(float(np.percentile(values, 50)), 3),
+                "p99_ms": round(float(np.percentile(values, 99)), 3),
+            }
+        return {"endpoints": endpoints, "batches": self.coalescer.batches, "coalesced_requests": self.coalescer.coalesced}
+
+    async def dispatch(self, method, path, body):
+        routes = {
+            "/ahp": self.handle_ahp,
+            "/topsis": self.handle_topsis,
+            "/profile-matching": self.handle_profile_matching,
+        }
+        if method == "GET" and path == "/stats":
+            return 200, self.stats()
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if path not in routes:
+            return 404, {"error": f"Unknown endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST."}
+
+        start = time.perf_counter()
+        try:
+            result = await routes[path](json.loads(body or b"{}"))
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            return 400, {"error": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            # Mis. BrokenProcessPool: tetap dijawab agar koneksi tidak terputus tanpa respons
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        self.latencies[path].append(time.perf_counter() - start)
+        self.requests[path] += 1
+        return 200, result
+
+    # HTTP/1.1 minimal dengan keep-alive; satu koneksi dapat mengirim banyak permintaan
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self.dispatch(method, path.split("?", 1)[0], body)
+                data = json.dumps(payload).encode()
+                reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                          500: "Internal Server Error"}[status]
+                writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Scoring service listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local JSON scoring service for AHP, TOPSIS and Profile Matching.")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: localhost only).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for batched scoring.")
+    parser.add_argument("--window-ms", type=float, default=2.0, help="Coalescing window in milliseconds.")
+    args = parser.parse_args(argv)
+
+    service = ScoringService(args.workers, args.window_ms / 1000)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.executor.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import numpy as np
+
+from rumus import cf_sf_averages, gap_score_matrix, rank_scores
+
+# --- SKYLINE (PARETO FRONT) ---
+# Alternatif p mendominasi q bila p tidak lebih buruk di semua kriteria dan lebih baik di
+# setidaknya satu (arah Benefit/Cost diperhitungkan). k-skyband = alternatif yang didominasi
+# oleh kurang dari k alternatif lain; skyline = 1-skyband.
+#
+# Untuk fungsi skor yang monoton terhadap setiap kriteria, k teratas selalu berada di dalam
+# k-skyband, sehingga pemeringkatan cukup dijalankan pada skyband (ribuan baris) alih-alih
+# seluruh kandidat (jutaan sel).
+#
+# Algoritma: sort-filter skyline (SFS). Baris diurutkan menurun menurut jumlah nilai yang
+# dinormalisasi min-maks (fungsi monoton ketat: pendominasi selalu datang lebih dulu), lalu
+# diproses per blok; setiap blok diperiksa terhadap skyband yang sudah terbentuk dan terhadap
+# dirinya sendiri dengan perbandingan dominasi ber-vektor NumPy.
+
+def _oriented(matrix, is_benefit):
+    matrix = np.asarray(matrix, dtype=float)
+    if is_benefit is None:
+        return matrix
+    return np.where(np.asarray(is_benefit, dtype=bool), matrix, -matrix)
+
+# Jumlah baris `reference` yang mendominasi tiap baris `candidates` -> (len(candidates),).
+# Perbandingan dilakukan per kriteria pada array 2-D (kandidat x referensi); reduksi all/any
+# di sumbu kriteria yang pendek jauh lebih lambat.
+def _dominator_counts(candidates, reference):
+    at_least = np.ones((len(candidates), len(reference)), dtype=bool)
+    better = np.zeros_like(at_least)
+    for j in range(candidates.shape[1]):
+        col, ref = candidates[:, j, None], reference[None, :, j]
+        at_least &= ref >= col
+        better |= ref > col
+    return (at_least & better).sum(axis=1)
+
+# Indeks (terurut naik) alternatif pada k-skyband
+def skyband(matrix, is_benefit=None, k=1, block=1024, chunk_cells=1 << 22):
+    data = _oriented(matrix, is_benefit)
+    n, m = data.shape
+    if n == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    low, high = data.min(axis=0), data.max(axis=0)
+    span = np.where(high > low, high - low, 1.0)
+    order = np.argsort(-((data - low) / span).sum(axis=1), kind="stable")
+
+    # Buffer skyband yang tumbuh berlipat dua
+    band = np.empty((min(n, block), m))
+    band_idx = np.empty(min(n, block), dtype=np.intp)
+    size = 0
+    step = max(1, chunk_cells // (block * m))
+    for start in range(0, n, block):
+        idx = order[start:start + block]
+        cand = data[idx]
+        counts = np.zeros(len(idx), dtype=np.intp)
+        alive = np.arange(len(idx))
+
+        # Terhadap skyband sejauh ini, dalam potongan yang membesar berlipat dua: anggota awal
+        # (jumlah nilai terbesar) menyingkirkan sebagian besar kandidat, dan kandidat yang sudah
+        # tersingkir tidak diperiksa lagi
+        s, chunk = 0, min(32, step)
+        while s < size and len(alive):
+            counts[alive] += _dominator_counts(cand[alive], band[s:min(s + chunk, size)])
+            alive = alive[counts[alive] < k]
+            s, chunk = s + chunk, min(2 * chunk, step)
+
+        # Di dalam blok (pendominasi di blok yang sama juga dihitung)
+        if len(alive):
+            counts[alive] += _dominator_counts(cand[alive], cand)
+            alive = alive[counts[alive] < k]
+
+        if size + len(alive) > len(band):
+            capacity = max(2 * len(band), size + len(alive))
+            band = np.resize(band, (capacity, m))
+            band_idx = np.resize(band_idx, capacity)
+        band[size:size + len(alive)] = cand[alive]
+        band_idx[size:size + len(alive)] = idx[alive]
+        size += len(alive)
+    return np.sort(band_idx[:size])
+
+def skyline(matrix, is_benefit=None, block=1024, chunk_cells=1 << 22):
+    return skyband(matrix, is_benefit, 1, block, chunk_cells)
+
+# --- PREFILTER TOPSIS ---
+# Catatan normalisasi: skor TOPSIS bergantung pada norma kolom dan solusi (anti-)ideal dari
+# seluruh alternatif. Menjalankan topsis() ulang hanya pada skyband akan mengubah norma kolom
+# dan solusi anti-ideal (alternatif terburuk biasanya tersingkir), sehingga skor dan bahkan
+# urutan dapat berbeda dari hasil penuh. Karena itu statistik kolom diambil dari matriks penuh
+# (satu pass O(n·m)), lalu hanya baris skyband yang diskor. Dengan statistik tetap, skor TOPSIS
+# monoton terhadap dominasi, sehingga:
+#   - skor kandidat identik dengan skor pada perhitungan penuh
+#   - top-k identik dengan hasil penuh bila skyband dibangun dengan k >= top_k
+#   - peringkat di luar top-k hanya berlaku di antara kandidat
+# Mengembalikan (indeks kandidat, skor kandidat, ranking indeks global menurun).
+def topsis_prefiltered(matrix, weights, is_benefit, top_k=1, candidates=None):
+    matrix = np.asarray(matrix, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    is_benefit = np.asarray(is_benefit, dtype=bool)
+    if candidates is None:
+        candidates = skyband(matrix, is_benefit, k=top_k)
+
+    scale = weights / np.sqrt(np.einsum("ij,ij->j", matrix, matrix))
+    col_max, col_min = matrix.max(axis=0) * scale, matrix.min(axis=0) * scale
+    ideal_pos = np.where(is_benefit, col_max, col_min)
+    ideal_neg = np.where(is_benefit, col_min, col_max)
+
+    weighted = matrix[candidates] * scale
+    d_pos = np.sqrt(((weighted - ideal_pos)**2).sum(axis=1))
+    d_neg = np.sqrt(((weighted - ideal_neg)**2).sum(axis=1))
+    scores = d_neg / (d_pos + d_neg)
+    ranking, _ = rank_scores(scores)
+    return candidates, scores, candidates[ranking]
+
+# --- PREFILTER PROFILE MATCHING ---
+# Skor PM = W_CF·rata2_CF + W_SF·rata2_SF naik terhadap kedua rata-rata (bobot >= 0), sehingga
+# skyband dihitung pada dua kolom (rata2_CF, rata2_SF). Nilai GAP tidak monoton terhadap nilai
+# aktual (puncak di profil ideal), jadi dominasi tidak diperiksa pada matriks aktual mentah.
+# Skyband ini tidak bergantung bobot: dapat dipakai ulang untuk bobot apa pun dengan
+# pengelompokan CF/SF yang sama. Skor PM tidak dinormalisasi, sehingga skor kandidat identik.
+def profile_matching_prefiltered(ideal, actuals, weights, cf_sf_grouping, gap_table=None, top_k=1, candidates=None):
+    weights = np.asarray(weights, dtype=float)
+    grouping = np.asarray(cf_sf_grouping)
+    avg_cf, avg_sf = cf_sf_averages(gap_score_matrix(ideal, actuals, gap_table), grouping)
+    if candidates is None:
+        candidates = skyband(np.column_stack([avg_cf, avg_sf]), k=top_k)
+
+    scores = avg_cf[candidates] * weights[grouping == 'CF'].sum() + avg_sf[candidates] * weights[grouping == 'SF'].sum()
+    ranking, _ = rank_scores(scores)
+    return candidates, scores, candidates[ranking]
@@ -0,0 +1,262 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- KRITERIA SPASIAL ---
+# Memuat layer titik lokal (kompetitor, kampus, halte, ...) dari CSV atau GeoJSON,
+# membangun indeks grid, lalu menghitung kriteria kedekatan (jarak ke titik terdekat)
+# dan kepadatan (jumlah titik dalam radius) untuk ribuan kandidat lokasi sekaligus.
+# Hasilnya berupa kolom matriks keputusan untuk topsis / profile_matching.
+
+YOGYAKARTA_CENTER = (-7.7956, 110.3695)
+EARTH_RADIUS_M = 6_371_000.0
+
+LAT_COLUMNS = ("lat", "latitude", "y")
+LON_COLUMNS = ("lon", "lng", "long", "longitude", "x")
+
+def _find_column(frame, name, aliases):
+    if name is not None:
+        return name
+    lookup = {str(c).strip().lower(): c for c in frame.columns}
+    for alias in aliases:
+        if alias in lookup:
+            return lookup[alias]
+    raise ValueError(f"No coordinate column found; expected one of {', '.join(aliases)}.")
+
+# Titik (lat, lon) dari CSV (kolom lat/lon dikenali otomatis) atau GeoJSON (Point/MultiPoint).
+# `source` dapat berupa path atau objek file (mis. hasil st.file_uploader) yang memiliki `.name`.
+def load_points(source, lat_col=None, lon_col=None):
+    ext = os.path.splitext(os.fspath(getattr(source, "name", source)))[1].lower()
+    if ext in (".geojson", ".json"):
+        if hasattr(source, "read"):
+            return points_from_geojson(json.load(source))
+        with open(source, encoding="utf-8") as f:
+            return points_from_geojson(json.load(f))
+    frame = pd.read_csv(source)
+    return frame[[_find_column(frame, lat_col, LAT_COLUMNS), _find_column(frame, lon_col, LON_COLUMNS)]].to_numpy(dtype=float)
+
+# Kandidat lokasi: CSV dengan kolom nama (default kolom pertama yang bukan koordinat) dan lat/lon
+def load_candidates(source, name_col=None, lat_col=None, lon_col=None):
+    frame = pd.read_csv(source)
+    lat_col = _find_column(frame, lat_col, LAT_COLUMNS)
+    lon_col = _find_column(frame, lon_col, LON_COLUMNS)
+    if name_col is None:
+        others = [c for c in frame.columns if c not in (lat_col, lon_col)]
+        names = frame[others[0]].astype(str).tolist() if others else [f"Site {i + 1}" for i in range(len(frame))]
+    else:
+        names = frame[name_col].astype(str).tolist()
+    # Nama kandidat menjadi indeks matriks keputusan, jadi harus unik
+    counts = pd.Series(names).value_counts(sort=False)
+    duplicated = counts.index[counts > 1].tolist()
+    if duplicated:
+        shown = ", ".join(duplicated[:5]) + (", ..." if len(duplicated) > 5 else "")
+        raise ValueError(f"Candidate names must be unique; {len(duplicated)} name(s) appear more than once: {shown}")
+    return names, frame[[lat_col, lon_col]].to_numpy(dtype=float)
+
+def points_from_geojson(data):
+    features = data.get("features", [data]) if isinstance(data, dict) else data
+    coords = []
+    for feature in features:
+        geometry = feature.get("geometry", feature)
+        if geometry["type"] == "Point":
+            coords.append(geometry["coordinates"][:2])
+        elif geometry["type"] == "MultiPoint":
+            coords.extend(c[:2] for c in geometry["coordinates"])
+    # GeoJSON menyimpan [lon, lat]
+    return np.asarray(coords, dtype=float).reshape(-1, 2)[:, ::-1]
+
+# Proyeksi equirectangular lokal ke meter; galat kecil untuk cakupan satu provinsi
+def project(latlon, origin=YOGYAKARTA_CENTER):
+    latlon = np.asarray(latlon, dtype=float).reshape(-1, 2)
+    lat0, lon0 = np.radians(origin)
+    lat, lon = np.radians(latlon[:, 0]), np.radians(latlon[:, 1])
+    return np.column_stack(((lon - lon0) * np.cos(lat0) * EARTH_RADIUS_M, (lat - lat0) * EARTH_RADIUS_M))
+
+# --- INDEKS GRID ---
+# Titik dikelompokkan per sel persegi berukuran `cell_size` meter dan diurutkan berdasarkan
+# kunci sel. Kueri memeriksa sel per "cincin" (jarak Chebyshev dalam satuan sel) dengan
+# searchsorted ber-vektor untuk semua kandidat sekaligus.
+class GridIndex:
+    def __init__(self, points_xy, cell_size=None):
+        self.points = np.asarray(points_xy, dtype=float).reshape(-1, 2)
+        if cell_size is None:
+            # Sekitar dua titik per sel untuk sebaran seragam
+            extent = np.maximum(np.ptp(self.points, axis=0), 1.0) if len(self.points) else np.ones(2)
+            cell_size = max(np.sqrt(extent[0] * extent[1] * 2 / max(len(self.points), 1)), 1.0)
+        self.cell_size = float(cell_size)
+
+        cells = np.floor(self.points / self.cell_size).astype(np.int64)
+        self.origin = cells.min(axis=0) if len(cells) else np.zeros(2, dtype=np.int64)
+        self.shape = (cells.max(axis=0) - self.origin + 1) if len(cells) else np.ones(2, dtype=np.int64)
+        keys = self._keys(cells)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        # Tabel awal-sel padat (gaya CSR) bila jumlah sel wajar: rentang sel cukup dibaca per indeks.
+        # Grid yang sangat renggang (pencilan jauh) tetap memakai searchsorted.
+        n_cells = int(np.prod(self.shape))
+        self.cell_start = None
+        if n_cells <= max(4 * len(self.points), 1 << 20):
+            self.cell_start = np.searchsorted(self.sorted_keys, np.arange(n_cells + 1))
+
+    def _keys(self, cells):
+        local = cells - self.origin
+        return local[:, 0] * self.shape[1] + local[:, 1]
+
+    @staticmethod
+    def _ring_offsets(ring):
+        if ring == 0:
+            return [(0, 0)]
+        span = range(-ring, ring + 1)
+        return [(dx, dy) for dx in span for dy in span if max(abs(dx), abs(dy)) == ring]
+
+    # Rentang [lo, hi) pada urutan titik untuk sel kueri yang digeser (dx, dy); hanya sel di dalam grid
+    def _cell_ranges(self, query_cells, dx, dy):
+        cells = query_cells + (dx, dy)
+        local = cells - self.origin
+        valid = np.flatnonzero((local >= 0).all(axis=1) & (local < self.shape).all(axis=1))
+        keys = self._keys(cells[valid])
+        if self.cell_start is not None:
+            return valid, self.cell_start[keys], self.cell_start[keys + 1]
+        return valid, np.searchsorted(self.sorted_keys, keys, "left"), np.searchsorted(self.sorted_keys, keys, "right")
+
+    # Perluas rentang [lo, hi) tiap kueri menjadi pasangan (indeks kueri, indeks titik) tanpa loop Python
+    def _expand(self, valid, lo, hi):
+        counts = hi - lo
+        total = counts.sum()
+        starts = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        return np.repeat(valid, counts), self.order[starts + np.arange(total)]
+
+    # Pasangan (indeks kueri, indeks titik) untuk titik-titik di sel pada cincin `ring`
+    def _ring_pairs(self, query_cells, ring):
+        query_idx, point_idx = [], []
+        for dx, dy in self._ring_offsets(ring):
+            valid, lo, hi = self._cell_ranges(query_cells, dx, dy)
+            if len(valid) and (hi > lo).any():
+                q, p = self._expand(valid, lo, hi)
+                query_idx.append(q)
+                point_idx.append(p)
+        if not query_idx:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate(query_idx), np.concatenate(point_idx)
+
+    def _query_cells(self, query_xy):
+        return np.floor(np.asarray(query_xy, dtype=float).reshape(-1, 2) / self.cell_size).astype(np.int64)
+
+    # Jumlah titik dalam radius (meter) untuk setiap kueri. Sel yang seluruhnya berada di dalam
+    # lingkaran dihitung langsung dari panjang rentangnya; hanya sel yang terpotong tepi lingkaran
+    # yang jaraknya diperiksa per titik. Kueri diproses per blok agar memori pasangan terbatas.
+    def count_within(self, query_xy, radius, block=4096):
+        query_xy = np.asarray(query_xy, dtype=float).reshape(-1, 2)
+        counts = np.zeros(len(query_xy), dtype=np.int64)
+        rings = int(np.ceil(radius / self.cell_size)) + 1
+        r2 = radius**2
+        for start in range(0, len(query_xy), block):
+            chunk = query_xy[start:start + block]
+            out = counts[start:start + block]
+            query_cells = self._query_cells(chunk)
+            for ring in range(rings):
+                for dx, dy in self._ring_offsets(ring):
+                    # Batas jarak yang berlaku untuk posisi kueri mana pun di dalam selnya
+                    gap = self.cell_size**2 * (max(abs(dx) - 1, 0)**2 + max(abs(dy) - 1, 0)**2)
+                    if gap > r2:
+                        continue
+                    valid, lo, hi = self._cell_ranges(query_cells, dx, dy)
+                    if len(valid) == 0:
+                        continue
+                    if self.cell_size**2 * ((abs(dx) + 1)**2 + (abs(dy) + 1)**2) <= r2:
+                        out[valid] += hi - lo
+                        continue
+                    # Jarak terdekat dan terjauh dari kueri ke persegi sel
+                    low = (query_cells[valid] + (dx, dy)) * self.cell_size
+                    rel_lo = low - chunk[valid]
+                    rel_hi = rel_lo + self.cell_size
+                    near = np.maximum(np.maximum(rel_lo, -rel_hi), 0)
+                    far = np.maximum(np.abs(rel_lo), np.abs(rel_hi))
+                    inside = (far**2).sum(axis=1) <= r2
+                    partial = ~inside & ((near**2).sum(axis=1) <= r2) & (hi > lo)
+                    out += np.bincount(valid[inside], hi[inside] - lo[inside], minlength=len(chunk)).astype(np.int64)
+                    if partial.any():
+                        q, p = self._expand(valid[partial], lo[partial], hi[partial])
+                        d2 = ((self.points[p] - chunk[q])**2).sum(axis=1)
+                        out += np.bincount(q[d2 <= r2], minlength=len(chunk))
+        return counts
+
+    # Jarak (meter) ke titik terdekat untuk setiap kueri (inf bila layer kosong).
+    # Kueri yang belum selesai setelah `max_rings` cincin (jauh dari semua titik) dihitung
+    # brute force per blok agar jumlah cincin tidak meledak untuk layer yang jarang. Kueri dan
+    # titik sama-sama dibagi blok sehingga matriks jarak sementara paling banyak `block_cells` sel.
+    def nearest_distance(self, query_xy, max_rings=8, block_cells=1 << 22):
+        query_xy = np.asarray(query_xy, dtype=float).reshape(-1, 2)
+        best = np.full(len(query_xy), np.inf)
+        if len(self.points) == 0:
+            return best
+        query_cells = self._query_cells(query_xy)
+
+        # Cincin terjauh yang mungkin masih memuat titik, per kueri
+        local = query_cells - self.origin
+        outside = np.maximum(np.maximum(-local, local - (self.shape - 1)), 0).max(axis=1)
+        max_ring = outside + int(self.shape.max())
+
+        active = np.arange(len(query_xy))
+        ring = 0
+        while len(active):
+            q, p = self._ring_pairs(query_cells[active], ring)
+            if len(q):
+                d = np.sqrt(((self.points[p] - query_xy[active][q])**2).sum(axis=1))
+                np.minimum.at(best, active[q], d)
+            # Titik di cincin berikutnya berjarak >= ring * cell_size dari kueri
+            done = (best[active] <= ring * self.cell_size) | (ring >= max_ring[active])
+            active = active[~done]
+            ring += 1
+            if ring > max_rings:
+                break
+
+        point_block = min(len(self.points), block_cells)
+        query_block = max(1, block_cells // point_block)
+        for start in range(0, len(active), query_block):
+            chunk = active[start:start + query_block]
+            d2 = np.full(len(chunk), np.inf)
+            for p_start in range(0, len(self.points), point_block):
+                points = self.points[p_start:p_start + point_block]
+                d2 = np.minimum(d2, ((query_xy[chunk, None, :] - points[None, :, :])**2).sum(axis=2).min(axis=1))
+            best[chunk] = np.sqrt(d2)
+        return best
+
+# --- PEMBENTUK KRITERIA ---
+# layers: dict nama_layer -> array (lat, lon)
+# specs: daftar dict {"name", "layer", "kind": "nearest" | "count", "radius": meter (untuk count)}
+# Mengembalikan DataFrame kandidat x kriteria (jarak dalam meter, kepadatan dalam jumlah titik).
+def spatial_criteria(candidates_latlon, layers, specs, origin=YOGYAKARTA_CENTER, index=None):
+    query_xy = project(candidates_latlon, origin)
+    index = {} if index is None else index
+    columns = {}
+    for spec in specs:
+        points_xy = project(layers[spec["layer"]], origin)
+        if spec["kind"] == "count":
+            radius = float(spec["radius"])
+            key = (spec["layer"], radius)
+            if key not in index:
+                # Sel seperempat radius: sebagian besar titik jatuh di sel yang utuh di dalam lingkaran
+                index[key] = GridIndex(points_xy, cell_size=radius / 4)
+            columns[spec["name"]] = index[key].count_within(query_xy, radius)
+        elif spec["kind"] == "nearest":
+            key = (spec["layer"], None)
+            if key not in index:
+                index[key] = GridIndex(points_xy)
+            columns[spec["name"]] = index[key].nearest_distance(query_xy)
+        else:
+            raise ValueError(f"Unknown spatial criterion kind: {spec['kind']}")
+    return pd.DataFrame(columns)
+
+# Skala linear min-maks ke rentang skala matriks keputusan (1-10 untuk TOPSIS, 1-5 untuk PM)
+def rescale(values, low, high, decimals=None):
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return np.full(values.shape, float(low))
+    vmin, vmax = values[finite].min(), values[finite].max()
+    span = vmax - vmin
+    scaled = np.where(finite, low + (values - vmin) / span * (high - low) if span > 0 else (low + high) / 2, high)
+    return np.round(scaled, decimals) if decimals is not None else scaled
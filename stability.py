@@ -0,0 +1,155 @@
+import numpy as np
+
+from rumus import _normalisasi_euclidean, cf_sf_averages, gap_score_matrix
+
+# --- STABILITAS BOBOT ---
+# Untuk setiap kriteria j, bobot w_j digeser sepanjang t ∈ [0, 1] sementara bobot kriteria lain
+# diskalakan proporsional dengan (1 - t) / (1 - w_j) sehingga jumlah bobot tetap 1. Dicari ambang t
+# terdekat di bawah dan di atas w_j tempat himpunan top-k (top-1 bila k = 1) berubah.
+#
+# Hasil berupa dict berisi array berukuran m (jumlah kriteria):
+#   weight                 bobot saat ini (dinormalisasi)
+#   lower, upper           ambang bawah / atas (NaN bila peringkat tetap sampai 0 / 1)
+#   lower_entrant, upper_entrant
+#                          alternatif yang masuk top-k tepat setelah ambang (-1 bila tidak ada)
+#   top                    indeks top-k saat ini, urut dari skor tertinggi
+
+def _top_mask(scores, k):
+    idx = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    mask = np.zeros(scores.shape, dtype=bool)
+    np.put_along_axis(mask, idx, True, axis=-1)
+    return mask
+
+def _entrant(mask, orig_mask):
+    entering = mask & ~orig_mask
+    return np.where(entering.any(axis=-1), entering.argmax(axis=-1), -1)
+
+# --- TOPSIS ---
+# Dengan normalisasi yang tidak bergantung bobot, jarak kuadrat ke solusi ideal adalah
+# d+² = Σ_k w_k² (r_ik - r+_k)², sehingga sepanjang lintasan kriteria j:
+#   d+²(t) = t² a_ij + s(t)² P_ij,   s(t) = (1 - t) / (1 - w_j)
+# dengan P_ij = kontribusi kriteria lain pada bobot saat ini (begitu juga d-²). Skor closeness
+# tidak linear terhadap t, jadi perubahan dicari dengan sapuan grid ber-vektor (semua kriteria
+# dan alternatif sekaligus) lalu dipersempit dengan biseksi. Dua perubahan yang saling
+# membatalkan di dalam satu langkah grid (lebar ≤ 1/grid) tidak terdeteksi.
+def topsis_weight_stability(matrix, weights, is_benefit, top_k=1, grid=200, tol=1e-9, max_iter=60, block_cells=4_000_000):
+    matrix = np.asarray(matrix, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+    is_benefit = np.asarray(is_benefit, dtype=bool)
+
+    norm = _normalisasi_euclidean(matrix)
+    best = np.where(is_benefit, norm.max(axis=0), norm.min(axis=0))
+    worst = np.where(is_benefit, norm.min(axis=0), norm.max(axis=0))
+    a = ((norm - best)**2).T  # (m, n)
+    b = ((norm - worst)**2).T
+    w2 = weights[:, None]**2
+    P = (w2 * a).sum(axis=0) - w2 * a
+    Q = (w2 * b).sum(axis=0) - w2 * b
+
+    # Skor closeness untuk kriteria `rows` pada titik lintasan t berukuran (len(rows), G) -> (len(rows), G, n)
+    def scores_at(rows, t):
+        s2 = ((1 - t) / (1 - weights[rows, None]))[..., None]**2
+        t2 = t[..., None]**2
+        d_pos = np.sqrt(t2 * a[rows, None, :] + s2 * P[rows, None, :])
+        d_neg = np.sqrt(t2 * b[rows, None, :] + s2 * Q[rows, None, :])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return d_neg / (d_pos + d_neg)
+
+    d_pos = np.sqrt((w2 * a).sum(axis=0))
+    d_neg = np.sqrt((w2 * b).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = d_neg / (d_pos + d_neg)
+    return _sweep_thresholds(scores_at, scores, weights, top_k, grid, tol, max_iter, block_cells)
+
+def _sweep_thresholds(scores_at, scores, weights, top_k, grid, tol, max_iter, block_cells):
+    m, n = len(weights), len(scores)
+    top_k = int(min(max(top_k, 1), n))
+    orig_mask = _top_mask(scores, top_k)
+    result = {"weight": weights, "top": np.argsort(-scores, kind="stable")[:top_k]}
+
+    # Ujung atas sedikit di bawah 1 agar bobot kriteria lain tidak tepat nol
+    for side, stop in (("lower", np.zeros(m)), ("upper", np.full(m, 1 - 1e-9))):
+        threshold = np.full(m, np.nan)
+        entrant = np.full(m, -1)
+        frac = np.linspace(0, 1, grid + 1)[1:]
+        t = weights[:, None] + (stop - weights)[:, None] * frac  # (m, grid), menjauh dari w_j
+
+        # Sapuan grid per blok kriteria agar array (blok, grid, n) tetap terbatas
+        changed = np.zeros((m, grid), dtype=bool)
+        step = max(1, block_cells // (grid * n))
+        for start in range(0, m, step):
+            rows = np.arange(start, min(start + step, m))
+            changed[rows] = (_top_mask(scores_at(rows, t[rows]), top_k) != orig_mask).any(axis=-1)
+
+        rows = np.flatnonzero(changed.any(axis=1))
+        if len(rows):
+            first = changed[rows].argmax(axis=1)
+            inside = np.where(first > 0, t[rows, np.maximum(first - 1, 0)], weights[rows])
+            outside = t[rows, first]
+
+            # Biseksi serentak untuk semua kriteria yang berubah
+            for _ in range(max_iter):
+                if np.all(np.abs(outside - inside) <= tol):
+                    break
+                mid = (inside + outside) / 2
+                flipped = (_top_mask(scores_at(rows, mid[:, None])[:, 0], top_k) != orig_mask).any(axis=-1)
+                outside = np.where(flipped, mid, outside)
+                inside = np.where(flipped, inside, mid)
+
+            threshold[rows] = (inside + outside) / 2
+            entrant[rows] = _entrant(_top_mask(scores_at(rows, outside[:, None])[:, 0], top_k), orig_mask)
+
+        result[side] = threshold
+        result[f"{side}_entrant"] = entrant
+    return result
+
+# --- PROFILE MATCHING ---
+# Skor PM = W_CF(w)·CF_i + W_SF(w)·SF_i linear terhadap bobot, sehingga sepanjang lintasan
+# kriteria j skor tiap alternatif adalah garis α_i + β_i t dan ambang dapat dihitung tertutup
+# dari perpotongan garis anggota top-k dengan garis non-anggota.
+def profile_matching_weight_stability(ideal, actuals, weights, cf_sf_grouping, gap_table=None, top_k=1):
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+    grouping = np.asarray(cf_sf_grouping)
+    is_cf = grouping == 'CF'
+    is_sf = grouping == 'SF'
+
+    avg_cf, avg_sf = cf_sf_averages(gap_score_matrix(ideal, actuals, gap_table), grouping)
+    total_cf, total_sf = weights[is_cf].sum(), weights[is_sf].sum()
+    scores = avg_cf * total_cf + avg_sf * total_sf
+
+    # Bagian skor dari kriteria lain (diskalakan s(t)) dan dari kriteria j sendiri (dikali t)
+    base = (total_cf - weights * is_cf)[:, None] * avg_cf + (total_sf - weights * is_sf)[:, None] * avg_sf
+    own = np.where(is_cf[:, None], avg_cf, np.where(is_sf[:, None], avg_sf, 0.0))
+    alpha = base / (1 - weights)[:, None]
+    beta = own - alpha
+
+    m, n = alpha.shape
+    top_k = int(min(max(top_k, 1), n))
+    orig_mask = _top_mask(scores, top_k)
+    members, others = np.flatnonzero(orig_mask), np.flatnonzero(~orig_mask)
+    result = {"weight": weights, "top": np.argsort(-scores, kind="stable")[:top_k]}
+    for side in ("lower", "upper"):
+        result[side] = np.full(m, np.nan)
+        result[f"{side}_entrant"] = np.full(m, -1)
+    if len(others) == 0:
+        return result
+
+    for j in range(m):
+        # Perpotongan anggota p dengan non-anggota q: t* = (α_q - α_p) / (β_p - β_q)
+        d_alpha = alpha[j, others][None, :] - alpha[j, members][:, None]
+        d_beta = beta[j, members][:, None] - beta[j, others][None, :]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cross = d_alpha / d_beta
+        # Naik: q menyalip p bila β_q > β_p; turun: bila β_q < β_p. Seri tepat di t = 0 atau 1
+        # (hanya satu kelompok bobot tersisa) bukan perubahan peringkat di dalam lintasan.
+        up = np.where((d_beta < 0) & (cross > weights[j]) & (cross < 1 - 1e-12), cross, np.inf)
+        down = np.where((d_beta > 0) & (cross < weights[j]) & (cross > 1e-12), cross, -np.inf)
+        if np.isfinite(up).any():
+            idx = np.unravel_index(np.argmin(up), up.shape)
+            result["upper"][j], result["upper_entrant"][j] = up[idx], others[idx[1]]
+        if np.isfinite(down).any():
+            idx = np.unravel_index(np.argmax(down), down.shape)
+            result["lower"][j], result["lower_entrant"][j] = down[idx], others[idx[1]]
+    return result
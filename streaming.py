@@ -0,0 +1,106 @@
+import heapq
+import os
+
+import numpy as np
+
+# --- SUMBER DATA BERTAHAP ---
+# Membaca matriks keputusan per potongan baris (chunk) dari:
+# - np.ndarray / np.memmap yang sudah terbuka
+# - file .npy (dibuka dengan memory mapping, tidak disalin ke RAM)
+# - file .csv (dibaca per chunk melalui pandas; `usecols` memilih kolom kriteria)
+# - file biner mentah (np.memmap), wajib menyertakan `shape` dan `dtype`
+def iter_chunks(source, chunksize=100_000, usecols=None, shape=None, dtype=np.float64):
+    if isinstance(source, np.ndarray):
+        data = source
+    else:
+        path = os.fspath(source)
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".csv":
+            import pandas as pd
+
+            for frame in pd.read_csv(path, chunksize=chunksize, usecols=usecols):
+                yield frame.to_numpy(dtype=float)
+            return
+        if ext == ".npy":
+            data = np.load(path, mmap_mode="r")
+        elif shape is not None:
+            data = np.memmap(path, dtype=dtype, mode="r", shape=tuple(shape))
+        else:
+            raise ValueError(f"Cannot read '{path}': use .csv or .npy, or pass shape/dtype for a raw memory-mapped file.")
+
+    if data.ndim != 2:
+        raise ValueError("Decision matrix must be 2-dimensional (alternatives x criteria).")
+    if usecols is not None:
+        data = data[:, usecols]
+    for start in range(0, data.shape[0], chunksize):
+        yield np.asarray(data[start:start + chunksize], dtype=float)
+
+# Menyimpan top-k (skor, indeks) dalam min-heap berukuran tetap.
+# Elemen heap berupa (skor, indeks) sehingga skor sama dimenangkan indeks yang lebih besar,
+# sama seperti urutan rank_scores/topsis di rumus.py.
+def _push_top_k(heap, scores, offset, top_k):
+    valid = np.flatnonzero(~np.isnan(scores))
+    if len(valid) > top_k:
+        part = np.argpartition(scores[valid], len(valid) - top_k)[len(valid) - top_k:]
+        valid = valid[part]
+    for i in valid:
+        item = (float(scores[i]), offset + int(i))
+        if len(heap) < top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+# --- TOPSIS STREAMING ---
+# Dua lintasan atas data:
+# 1) jumlah kuadrat kolom serta nilai min/maks mentah per kolom
+# 2) skor per chunk, top-k disimpan dalam heap berukuran tetap
+# Memori puncak sebanding dengan `chunksize`, bukan dengan jumlah baris.
+# `scores_out` (opsional) berupa path .npy atau array berukuran n untuk menampung semua skor.
+def topsis_stream(source, weights, is_benefit, top_k=10, chunksize=100_000, scores_out=None, **read_kwargs):
+    weights = np.asarray(weights, dtype=float)
+    is_benefit = np.asarray(is_benefit, dtype=bool)
+
+    # Lintasan 1: statistik kolom
+    n = 0
+    sumsq = np.zeros(len(weights))
+    col_min = np.full(len(weights), np.inf)
+    col_max = np.full(len(weights), -np.inf)
+    for chunk in iter_chunks(source, chunksize, **read_kwargs):
+        sumsq += np.einsum("ij,ij->j", chunk, chunk)
+        np.minimum(col_min, chunk.min(axis=0), out=col_min)
+        np.maximum(col_max, chunk.max(axis=0), out=col_max)
+        n += chunk.shape[0]
+
+    if n == 0:
+        return [], []
+
+    # Normalisasi Euclidean + pembobotan cukup berupa skala per kolom,
+    # sehingga min/maks terbobot dapat diturunkan dari min/maks mentah
+    scale = weights / np.sqrt(sumsq)
+    low = np.minimum(col_min * scale, col_max * scale)
+    high = np.maximum(col_min * scale, col_max * scale)
+    ideal_pos = np.where(is_benefit, high, low)
+    ideal_neg = np.where(is_benefit, low, high)
+
+    if isinstance(scores_out, (str, os.PathLike)):
+        scores_out = np.lib.format.open_memmap(scores_out, mode="w+", dtype=np.float64, shape=(n,))
+
+    # Lintasan 2: skor per chunk
+    heap = []
+    offset = 0
+    for chunk in iter_chunks(source, chunksize, **read_kwargs):
+        weighted = chunk * scale
+        d_pos = np.sqrt(((weighted - ideal_pos)**2).sum(axis=1))
+        d_neg = np.sqrt(((weighted - ideal_neg)**2).sum(axis=1))
+        scores = d_neg / (d_pos + d_neg)
+
+        if scores_out is not None:
+            scores_out[offset:offset + len(scores)] = scores
+        _push_top_k(heap, scores, offset, top_k)
+        offset += len(scores)
+
+    if isinstance(scores_out, np.memmap):
+        scores_out.flush()
+
+    top = sorted(heap, reverse=True)
+    return [score for score, _ in top], [index for _, index in top]
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from ahp_hierarchy import HierarchicalAHP
+from rumus import calculate_ahp_weights_eigen
+
+ROOT = np.array([[1, 3, 5], [1 / 3, 1, 2], [1 / 5, 1 / 2, 1]])
+LOCATION = np.array([[1, 2, 4], [1 / 2, 1, 3], [1 / 4, 1 / 3, 1]])
+MARKET = np.array([[1, 5], [1 / 5, 1]])
+
+
+def _build(method="eigen", market=MARKET, root=ROOT):
+    ahp = HierarchicalAHP(method=method)
+    ahp.add_children("Goal", ["Location", "Cost", "Market"], root)
+    ahp.add_children("Location", ["Traffic", "Parking", "Visibility"], LOCATION)
+    ahp.add_children("Cost", ["Rent"])
+    ahp.add_children("Market", ["Students", "Offices"], market)
+    return ahp
+
+
+def test_global_weights_are_products_of_local_priorities():
+    ahp = _build()
+    weights = ahp.global_weights()
+
+    root, _ = calculate_ahp_weights_eigen(ROOT)
+    location, _ = calculate_ahp_weights_eigen(LOCATION)
+    market, _ = calculate_ahp_weights_eigen(MARKET)
+    expected = dict(zip(["Traffic", "Parking", "Visibility"], root[0] * np.asarray(location)))
+    expected["Rent"] = root[1]
+    expected.update(zip(["Students", "Offices"], root[2] * np.asarray(market)))
+
+    assert list(weights) == ["Traffic", "Parking", "Visibility", "Rent", "Students", "Offices"]
+    np.testing.assert_allclose([weights[k] for k in expected], list(expected.values()))
+    assert sum(weights.values()) == pytest.approx(1.0)
+    assert set(ahp.consistency()) == {"Goal", "Location", "Cost", "Market"}
+
+
+def test_replacing_a_matrix_recomputes_only_that_subtree():
+    ahp = _build()
+    ahp.global_weights()
+    assert ahp.recomputed == 4
+
+    new_market = np.array([[1, 1 / 3], [3, 1]])
+    ahp.set_matrix("Market", new_market)
+
+    # Bobot global di luar subtree Market tetap tersimpan; di dalamnya dibuang
+    assert {"Traffic", "Parking", "Visibility", "Rent", "Market"} <= set(ahp._global)
+    assert not {"Students", "Offices"} & set(ahp._global)
+    weights = ahp.global_weights()
+    assert ahp.recomputed == 5
+
+    np.testing.assert_allclose(list(weights.values()), list(_build(market=new_market).global_weights().values()))
+
+
+def test_replacing_the_root_matrix_keeps_lower_local_priorities():
+    ahp = _build(method="mean")
+    ahp.global_weights()
+
+    new_root = np.array([[1, 1 / 2, 1 / 3], [2, 1, 1 / 2], [3, 2, 1]])
+    ahp.set_matrix("Goal", new_root)
+    weights = ahp.global_weights()
+
+    assert ahp.recomputed == 5
+    np.testing.assert_allclose(list(weights.values()),
+                               list(_build(method="mean", root=new_root).global_weights().values()))
+
+
+def test_adding_children_invalidates_the_parent():
+    ahp = _build()
+    ahp.global_weights()
+    ahp.add_children("Cost", ["Utilities"])
+
+    with pytest.raises(ValueError):
+        ahp.global_weights()
+    ahp.set_matrix("Cost", [[1, 4], [1 / 4, 1]])
+    weights = ahp.global_weights()
+    assert weights["Rent"] + weights["Utilities"] == pytest.approx(ahp.global_weight("Cost"))
+
+
+def test_adding_children_drops_an_existing_matrix():
+    ahp = _build()
+    ahp.global_weights()
+    ahp.add_children("Market", ["Tourists"])
+
+    assert "Market" not in ahp.matrices
+    with pytest.raises(ValueError, match="No comparison matrix set for 'Market'"):
+        ahp.global_weights()
+    ahp.set_matrix("Market", [[1, 5, 3], [1 / 5, 1, 1 / 2], [1 / 3, 2, 1]])
+    assert set(ahp.local_priorities("Market")[0]) == {"Students", "Offices", "Tourists"}
+
+
+def test_invalid_trees_raise():
+    ahp = _build()
+    with pytest.raises(ValueError):
+        ahp.set_matrix("Market", np.eye(3))
+    with pytest.raises(ValueError):
+        ahp.add_children("Goal", ["Rent"])
+    with pytest.raises(KeyError):
+        ahp.add_children("Missing", ["X"])
+    with pytest.raises(ValueError):
+        ahp.local_priorities("Rent")
+    with pytest.raises(ValueError):
+        HierarchicalAHP(method="geometric")
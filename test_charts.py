@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import charts
+from charts import bar_chart_png, radar_chart_png
+from result_cache import ResultCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ResultCache(max_bytes=64 << 20)
+    monkeypatch.setattr(charts, "CHART_CACHE", cache)
+    return cache
+
+
+# Argumen yang benar-benar sampai ke renderer, tanpa menggambar
+@pytest.fixture
+def rendered(monkeypatch):
+    calls = []
+    monkeypatch.setattr(charts, "_render_bar", lambda *args: calls.append(args) or b"bar")
+    monkeypatch.setattr(charts, "_render_radar", lambda *args: calls.append(args) or b"radar")
+    return calls
+
+
+def test_bar_chart_draws_at_most_max_bars(cache, rendered):
+    labels = [f"Site {i}" for i in range(100)]
+    values = np.linspace(1, 0, 100)
+
+    bar_chart_png(labels, values, "Scores", max_bars=30)
+    bar_chart_png(labels[:30], values[:30], "Scores", max_bars=30)
+
+    # 30 batang pertama saja, sehingga potongan yang sama memakai entri cache yang sama
+    assert len(rendered) == 1
+    drawn_labels, drawn_values = rendered[0][:2]
+    assert drawn_labels == labels[:30]
+    np.testing.assert_array_equal(drawn_values, values[:30])
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("layout", ["overlay", "small_multiples"])
+def test_radar_chart_draws_only_the_top_n_rows(cache, rendered, layout):
+    closeness = np.random.default_rng(0).uniform(size=(12, 4))
+    labels = [f"Site {i}" for i in range(12)]
+
+    radar_chart_png(closeness, labels, ["C1", "C2", "C3", "C4"], top_n=3, layout=layout)
+
+    drawn, drawn_labels, criteria, drawn_layout, _ = rendered[0]
+    np.testing.assert_array_equal(drawn, closeness[:3])
+    assert drawn_labels == labels[:3] and criteria == ["C1", "C2", "C3", "C4"] and drawn_layout == layout
+
+
+def test_chart_cache_hits_return_the_same_png(cache):
+    labels, values = ["A", "B", "C"], [0.9, 0.5, 0.1]
+
+    first = bar_chart_png(labels, values, "Scores")
+    again = bar_chart_png(list(labels), np.array(values), "Scores")
+    other = bar_chart_png(labels, values, "Other title")
+
+    assert first.startswith(b"\x89PNG") and again is first and other != first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+    closeness = np.random.default_rng(1).uniform(size=(5, 3))
+    for layout in ("overlay", "small_multiples"):
+        png = radar_chart_png(closeness, list("ABCDE"), ["x", "y", "z"], top_n=4, layout=layout)
+        assert png.startswith(b"\x89PNG")
+        assert radar_chart_png(closeness[:4], list("ABCD"), ["x", "y", "z"], top_n=4, layout=layout) is png
+    assert cache.stats()["hits"] == 3
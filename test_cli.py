@@ -0,0 +1,106 @@
+import csv
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cli import main
+from rumus import calculate_ahp_weights, compile_gap_weight, profile_matching, topsis
+
+PAIRWISE = [[1, 3, 5], [1 / 3, 1, 2], [1 / 5, 1 / 2, 1]]
+
+
+@pytest.fixture
+def matrices(tmp_path):
+    rng = np.random.default_rng(0)
+    topsis_matrix = rng.uniform(1, 10, size=(12, 3))
+    pd.DataFrame(topsis_matrix, index=[f"Site {i}" for i in range(12)], columns=["Rent", "Traffic", "Parking"]).to_csv(tmp_path / "sites.csv")
+    pm_matrix = rng.uniform(1, 5, size=(8, 3))
+    np.save(tmp_path / "pm.npy", pm_matrix)
+    return topsis_matrix, pm_matrix
+
+
+def _read_ranking(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return [row["Alternative"] for row in rows], [float(row["Score"]) for row in rows]
+
+
+def _topsis_job(**extra):
+    return {"name": "sites", "matrix": "sites.csv", "pairwise": PAIRWISE,
+            "criteria_types": ["cost", "benefit", "benefit"], **extra}
+
+
+def _pm_job(**extra):
+    return {"name": "pm", "matrix": "pm.npy", "weights": [0.5, 0.3, 0.2], "ideal": [3, 4, 2],
+            "cf_sf": ["CF", "SF", "CF"], "gap_table": {"0": 5, "1": 4, "-1": 3.5, "2": 2}, **extra}
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_json_jobs_write_ranked_csvs_and_summary(tmp_path, matrices, workers):
+    topsis_matrix, pm_matrix = matrices
+    (tmp_path / "jobs.json").write_text(json.dumps([_topsis_job(), _pm_job(top_k=3)]))
+    out = tmp_path / "out"
+
+    assert main([str(tmp_path / "jobs.json"), "-o", str(out), "-j", workers]) == 0
+
+    weights, cr = calculate_ahp_weights(PAIRWISE)
+    scores, ranking = topsis(topsis_matrix, weights, [False, True, True])
+    names, written = _read_ranking(out / "sites_topsis.csv")
+    assert names == [f"Site {i}" for i in ranking]
+    np.testing.assert_allclose(written, np.asarray(scores)[ranking], atol=1e-6)
+
+    table = compile_gap_weight({0: 5, 1: 4, -1: 3.5, 2: 2})
+    scores, ranking = profile_matching([3, 4, 2], pm_matrix, [0.5, 0.3, 0.2], ["CF", "SF", "CF"], table, top_k=3)
+    names, written = _read_ranking(out / "pm_profile_matching.csv")
+    assert names == [f"A{i + 1}" for i in ranking]
+    np.testing.assert_allclose(written, np.asarray(scores)[ranking], atol=1e-6)
+
+    summary = json.loads((out / "summary.json").read_text())
+    assert [s["name"] for s in summary] == ["pm", "sites"]
+    assert summary[1]["consistency_ratio"] == pytest.approx(cr)
+    assert summary[1]["weights"] == pytest.approx(dict(zip(["Rent", "Traffic", "Parking"], weights)))
+    assert (out / "sites_weights.csv").exists()
+
+
+def test_jsonl_with_a_failing_job_exits_non_zero_and_keeps_the_others(tmp_path, matrices, capsys):
+    jobs = [_topsis_job(name="ok"), {"name": "broken", "matrix": "sites.csv", "criteria_types": ["cost"] * 3},
+            _pm_job(name="missing", matrix="missing.npy")]
+    (tmp_path / "jobs.jsonl").write_text("\n".join(json.dumps(job) for job in jobs) + "\n\n")
+    out = tmp_path / "out"
+
+    assert main([str(tmp_path / "jobs.jsonl"), "-o", str(out), "-j", "1"]) == 1
+
+    assert [s["name"] for s in json.loads((out / "summary.json").read_text())] == ["ok"]
+    assert (out / "ok_topsis.csv").exists() and not (out / "broken_topsis.csv").exists()
+    err = capsys.readouterr().err
+    assert "[FAILED] broken" in err and "[FAILED] missing" in err
+
+
+@pytest.mark.parametrize("name", ["../escape", "sub/dir", "..", "", "C:evil", 3])
+def test_job_names_with_folders_are_rejected_before_running(tmp_path, matrices, capsys, name):
+    (tmp_path / "jobs.json").write_text(json.dumps([_topsis_job(name=name)]))
+    out = tmp_path / "out"
+
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(tmp_path / "jobs.json"), "-o", str(out)])
+
+    assert exit_info.value.code == 2 and "Invalid job name" in capsys.readouterr().err
+    assert not out.exists() and not (tmp_path / "escape_topsis.csv").exists()
+
+
+def test_duplicate_job_names_are_rejected_and_defaults_are_unique_across_specs(tmp_path, matrices, capsys):
+    (tmp_path / "dup.json").write_text(json.dumps([_topsis_job(), _pm_job(name="sites")]))
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "dup.json"), "-o", str(tmp_path / "out")])
+    assert "Duplicate job name 'sites'" in capsys.readouterr().err
+
+    # Tanpa nama di dua file spesifikasi: job1 dan job2, bukan job1 dua kali
+    unnamed = _topsis_job()
+    del unnamed["name"]
+    (tmp_path / "a.json").write_text(json.dumps(unnamed))
+    (tmp_path / "b.json").write_text(json.dumps(unnamed))
+    out = tmp_path / "out"
+    assert main([str(tmp_path / "a.json"), str(tmp_path / "b.json"), "-o", str(out), "-j", "1"]) == 0
+    assert [s["name"] for s in json.loads((out / "summary.json").read_text())] == ["job1", "job2"]
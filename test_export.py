@@ -0,0 +1,102 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import export
+from export import available_formats, export_ranking, export_tempfile, profile_matching_breakdown, topsis_breakdown
+from rumus import compile_gap_weight, profile_matching, topsis
+
+CRITERIA = ["Rent", "Traffic", "Parking"]
+
+
+@pytest.fixture
+def ranked(topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(n=103, m=3)
+    scores, ranking = topsis(matrix, weights, is_benefit)
+    alternatives = [f"Site {i}" for i in range(len(matrix))]
+    return matrix, weights, is_benefit, alternatives, np.asarray(scores), ranking
+
+
+# Tabel pembanding: DataFrame penuh di memori, diurutkan menurut ranking
+def _expected_frame(matrix, weights, is_benefit, alternatives, scores, ranking):
+    weighted = matrix / np.sqrt((matrix**2).sum(axis=0)) * weights
+    best = np.where(is_benefit, weighted.max(axis=0), weighted.min(axis=0))
+    worst = np.where(is_benefit, weighted.min(axis=0), weighted.max(axis=0))
+    frame = pd.DataFrame({"Alternative": alternatives, "Score": scores})
+    for j, c in enumerate(CRITERIA):
+        frame[f"{c} d+"] = np.abs(weighted[:, j] - best[j])
+    for j, c in enumerate(CRITERIA):
+        frame[f"{c} d-"] = np.abs(weighted[:, j] - worst[j])
+    frame = frame.iloc[ranking].reset_index(drop=True)
+    frame.insert(0, "Ranking", np.arange(1, len(frame) + 1))
+    return frame
+
+
+def _read(fmt, handle):
+    if fmt == "CSV":
+        return pd.read_csv(handle)
+    if fmt == "Parquet":
+        return pd.read_parquet(handle)
+    import pyarrow as pa
+
+    return pa.ipc.open_file(handle).read_pandas()
+
+
+@pytest.mark.parametrize("fmt", list(export.FORMATS))
+def test_chunked_writers_match_sorted_dataframe(ranked, fmt):
+    if fmt not in available_formats():
+        pytest.skip("pyarrow is not installed")
+    matrix, weights, is_benefit, alternatives, scores, ranking = ranked
+    breakdown = topsis_breakdown(matrix, weights, is_benefit, CRITERIA)
+
+    # chunksize 10 tidak membagi n = 103
+    with export_tempfile(fmt, alternatives, scores, ranking, breakdown, chunksize=10) as handle:
+        written = _read(fmt, handle)
+
+    expected = _expected_frame(matrix, weights, is_benefit, alternatives, scores, ranking)
+    pd.testing.assert_frame_equal(written, expected, check_dtype=False, check_exact=False, rtol=1e-12)
+
+
+def test_csv_falls_back_to_pandas_without_pyarrow(ranked, tmp_path, monkeypatch):
+    matrix, weights, is_benefit, alternatives, scores, ranking = ranked
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name, *args: None if name == "pyarrow" else find_spec(name, *args))
+    breakdown = topsis_breakdown(matrix, weights, is_benefit, CRITERIA)
+
+    assert available_formats() == ["CSV"]
+    export_ranking(tmp_path / "ranked.csv", "CSV", alternatives, scores, ranking, breakdown, chunksize=7)
+    with pytest.raises(ValueError, match="pyarrow"):
+        export_ranking(tmp_path / "ranked.parquet", "Parquet", alternatives, scores, ranking)
+
+    expected = _expected_frame(matrix, weights, is_benefit, alternatives, scores, ranking)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "ranked.csv"), expected, check_exact=False, rtol=1e-12)
+
+
+def test_top_k_ranking_without_breakdown_and_unknown_format(ranked, tmp_path):
+    _, _, _, alternatives, scores, ranking = ranked
+
+    export_ranking(tmp_path / "top.csv", "CSV", alternatives, scores, ranking[:5], chunksize=2)
+    written = pd.read_csv(tmp_path / "top.csv")
+
+    assert written.columns.tolist() == ["Ranking", "Alternative", "Score"]
+    assert written["Ranking"].tolist() == [1, 2, 3, 4, 5]
+    assert written["Alternative"].tolist() == [alternatives[i] for i in ranking[:5]]
+    with pytest.raises(ValueError):
+        export_ranking(tmp_path / "x", "Excel", alternatives, scores, ranking)
+
+
+def test_profile_matching_breakdown_columns():
+    rng = np.random.default_rng(1)
+    actuals = rng.integers(1, 6, size=(20, 3))
+    ideal, table = [3, 4, 2], compile_gap_weight({0: 5, 1: 4, -1: 3.5})
+    scores, ranking = profile_matching(ideal, actuals, [0.5, 0.3, 0.2], ["CF", "SF", "CF"], table)
+    names, rows = profile_matching_breakdown(ideal, actuals, CRITERIA, table)
+
+    chunk = next(export.ranked_chunks([f"A{i}" for i in range(20)], scores, ranking, (names, rows), chunksize=6))
+
+    assert list(chunk) == ["Ranking", "Alternative", "Score"] + names
+    top = np.asarray(ranking[:6])
+    np.testing.assert_array_equal(np.column_stack([chunk[f"{c} gap"] for c in CRITERIA]), actuals[top] - ideal)
+    np.testing.assert_array_equal(np.column_stack([chunk[f"{c} gap weight"] for c in CRITERIA]), table(actuals[top] - ideal))
@@ -0,0 +1,162 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from group_ahp import aggregate_group_ahp, iter_respondents
+from rumus import calculate_ahp_weights_batch, pairwise_from_upper
+
+N = 4
+IU = np.triu_indices(N, 1)
+
+
+# Responden hampir konsisten (dari vektor bobot dengan derau kecil) dan beberapa yang acak
+def _survey(seed=0, consistent=40, inconsistent=8):
+    rng = np.random.default_rng(seed)
+    base = rng.dirichlet(np.full(N, 5.0))
+    uppers = []
+    for _ in range(consistent):
+        w = base * np.exp(rng.normal(scale=0.1, size=N))
+        uppers.append((w[:, None] / w[None, :])[IU] * np.exp(rng.normal(scale=0.05, size=len(IU[0]))))
+    for _ in range(inconsistent):
+        uppers.append(rng.choice([1 / 9, 1 / 7, 7.0, 9.0], size=len(IU[0])))
+    uppers = np.array(uppers)
+    groups = np.array(["owner", "barista", "customer"])[rng.integers(3, size=len(uppers))]
+    return uppers, groups
+
+
+def _expected(uppers, groups, method, cr_threshold=0.1):
+    weights, cr = calculate_ahp_weights_batch(pairwise_from_upper(uppers, N))
+    keep = cr <= cr_threshold
+
+    def combine(rows):
+        if method == "aij":
+            return calculate_ahp_weights_batch(pairwise_from_upper(np.exp(np.log(uppers[rows]).mean(axis=0)), N))[0]
+        aip = np.exp(np.log(weights[rows]).mean(axis=0))
+        return aip / aip.sum()
+
+    by_group = {g: combine(keep & (groups == g)) for g in np.unique(groups[keep])}
+    return combine(keep), cr, keep, by_group
+
+
+def _csv(uppers, groups, full=False):
+    values = pairwise_from_upper(uppers, N).reshape(len(uppers), -1) if full else uppers
+    frame = pd.DataFrame(values, columns=[f"q{i}" for i in range(values.shape[1])])
+    frame.insert(0, "Respondent", [f"r{i}" for i in range(len(uppers))])
+    frame["Stakeholder"] = groups
+    source = io.StringIO(frame.to_csv(index=False))
+    source.name = "survey.csv"
+    return source
+
+
+def _jsonl(uppers, groups, with_ids=True, key="upper"):
+    lines = []
+    for i, (upper, group) in enumerate(zip(uppers, groups)):
+        record = {"group": group}
+        record[key] = pairwise_from_upper(upper, N).tolist() if key == "matrix" else upper.tolist()
+        if with_ids:
+            record["respondent"] = f"r{i}"
+        lines.append(json.dumps(record))
+    source = io.StringIO("\n".join(lines) + "\n")
+    source.name = "survey.jsonl"
+    return source
+
+
+@pytest.mark.parametrize("method", ["aij", "aip"])
+def test_aggregation_and_cr_filtering_match_per_respondent_computation(method):
+    uppers, groups = _survey()
+    weights, cr, keep, by_group = _expected(uppers, groups, method)
+
+    result = aggregate_group_ahp(_csv(uppers, groups), method=method, chunksize=7)
+
+    assert 0 < keep.sum() < len(uppers)
+    np.testing.assert_allclose(result["weights"], weights)
+    np.testing.assert_allclose(result["respondent_cr"], cr)
+    assert result["n_respondents"] == len(uppers) and result["n_consistent"] == keep.sum()
+    assert result["respondent_ids"].tolist() == [f"r{i}" for i in range(len(uppers))]
+    assert set(result["groups"]) == set(by_group)
+    for group, expected in by_group.items():
+        np.testing.assert_allclose(result["groups"][group]["weights"], expected)
+        assert result["groups"][group]["n_consistent"] == (keep & (groups == group)).sum()
+
+
+def test_csv_full_matrix_and_jsonl_inputs_give_the_same_result():
+    uppers, groups = _survey(seed=1)
+    expected = aggregate_group_ahp(_csv(uppers, groups), chunksize=5)
+
+    for source in (_csv(uppers, groups, full=True), _jsonl(uppers, groups), _jsonl(uppers, groups, key="matrix")):
+        result = aggregate_group_ahp(source, chunksize=5)
+        np.testing.assert_allclose(result["weights"], expected["weights"])
+        np.testing.assert_allclose(result["respondent_cr"], expected["respondent_cr"])
+        assert result["respondent_groups"].tolist() == groups.tolist()
+
+
+def test_default_respondent_ids_continue_across_chunks():
+    uppers, groups = _survey(seed=2, consistent=10, inconsistent=1)
+
+    jsonl_ids = np.concatenate([ids for ids, _, _ in iter_respondents(_jsonl(uppers, groups, with_ids=False), chunksize=4)])
+    frame = pd.DataFrame(uppers)
+    source = io.StringIO(frame.to_csv(index=False))
+    source.name = "survey.csv"
+    csv_ids = np.concatenate([ids for ids, _, _ in iter_respondents(source, chunksize=4)])
+
+    expected = [str(i) for i in range(len(uppers))]
+    assert jsonl_ids.tolist() == expected
+    assert csv_ids.tolist() == expected
+
+
+@pytest.mark.parametrize("method", ["aij", "aip"])
+def test_reported_consistency_ratio_matches_the_aggregation(method):
+    uppers, groups = _survey(seed=5)
+    _, cr, keep, _ = _expected(uppers, groups, method)
+    aij_cr = calculate_ahp_weights_batch(pairwise_from_upper(np.exp(np.log(uppers[keep]).mean(axis=0)), N))[1]
+
+    result = aggregate_group_ahp(_csv(uppers, groups), method=method)
+
+    assert result["aij_consistency_ratio"] == pytest.approx(aij_cr)
+    assert result["consistency_ratio"] == pytest.approx(aij_cr if method == "aij" else cr[keep].max())
+    assert result["consistent_cr"]["median"] == pytest.approx(np.median(cr[keep]))
+    assert result["consistent_cr"]["max"] == pytest.approx(cr[keep].max())
+    for group, summary in result["groups"].items():
+        assert summary["consistent_cr"]["max"] == pytest.approx(cr[keep & (groups == group)].max())
+
+
+def test_csv_fraction_judgements_are_parsed():
+    text = "respondent,note,c01,c02,c12\nr0,first,1/3,5,2\nr1,second,0.5, 1 / 4 ,3\n"
+    source = io.StringIO(text)
+    source.name = "survey.csv"
+
+    (_, _, upper), = iter_respondents(source)
+
+    np.testing.assert_allclose(upper, [[1 / 3, 5, 2], [0.5, 0.25, 3]])
+
+    source = io.StringIO("respondent,c01,c02,c12\nr0,1/3,5,2\nr1,one third,5,2\n")
+    source.name = "survey.csv"
+    with pytest.raises(ValueError, match="Column 'c01'.*one third"):
+        aggregate_group_ahp(source)
+
+
+def test_invalid_judgements_are_counted_and_skipped():
+    uppers, groups = _survey(seed=3, consistent=10, inconsistent=0)
+    uppers[2, 0] = np.nan
+    uppers[5, 1] = 0
+
+    result = aggregate_group_ahp(_csv(uppers, groups))
+
+    assert result["n_invalid"] == 2 and result["n_respondents"] == 10
+    assert "r2" not in result["respondent_ids"] and "r5" not in result["respondent_ids"]
+
+
+def test_unreadable_or_fully_inconsistent_surveys_raise():
+    with pytest.raises(ValueError):
+        aggregate_group_ahp(_csv(*_survey(seed=4, consistent=0, inconsistent=5)))
+
+    source = io.StringIO("a,b\n1,2\n")
+    source.name = "survey.csv"
+    with pytest.raises(ValueError):
+        aggregate_group_ahp(source)
+
+    with pytest.raises(ValueError):
+        aggregate_group_ahp(_csv(*_survey()), method="median")
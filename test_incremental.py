@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from incremental import IncrementalTopsis
+from rumus import topsis
+
+
+def _assert_matches_topsis(scorer, matrix, weights, is_benefit):
+    expected_scores, expected_ranking = topsis(matrix, weights, is_benefit)
+    scores, ranking = scorer.result()
+    np.testing.assert_allclose(scores, expected_scores, rtol=1e-10, atol=1e-12)
+    assert ranking == expected_ranking
+
+
+def test_single_cell_edits_match_full_topsis_after_each_step(topsis_problem):
+    matrix, weights, is_benefit = topsis_problem()
+    scorer = IncrementalTopsis(matrix, weights, is_benefit)
+    rng = np.random.default_rng(1)
+
+    for _ in range(200):
+        i, j = rng.integers(matrix.shape[0]), rng.integers(matrix.shape[1])
+        matrix[i, j] = rng.uniform(1, 10)
+        scorer.update_cell(i, j, matrix[i, j])
+        _assert_matches_topsis(scorer, matrix, weights, is_benefit)
+
+
+@pytest.mark.parametrize("j", [0, 1])
+def test_edits_that_move_the_column_max_and_min(j, topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(seed=2)
+    scorer = IncrementalTopsis(matrix, weights, is_benefit)
+    column = matrix[:, j]
+
+    edits = [
+        (int(column.argmax()), 12.0),   # ekstrem baru di atas maks lama
+        (int(column.argmax()), 5.0),    # maks lama hilang, kolom dipindai ulang
+        (int(column.argmin()), 0.5),    # ekstrem baru di bawah min lama
+        (int(column.argmin()), 6.0),    # min lama hilang
+        (3, float(column[3]) + 0.1),    # sel di tengah, titik ideal tetap
+    ]
+    moves = []
+    for i, value in edits:
+        matrix[i, j] = value
+        scorer.update_cell(i, j, value)
+        moves.append(scorer.ideal_moves)
+        _assert_matches_topsis(scorer, matrix, weights, is_benefit)
+        assert scorer.col_max[j] == matrix[:, j].max() and scorer.col_min[j] == matrix[:, j].min()
+
+    assert moves[:4] == [1, 2, 3, 4]
+    assert moves[4] == 4
+
+
+def test_weight_changes_and_benefit_cost_flips_match_full_topsis(topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(seed=3)
+    scorer = IncrementalTopsis(matrix, weights, is_benefit)
+    rng = np.random.default_rng(4)
+
+    for step in range(10):
+        weights = rng.dirichlet(np.ones(len(weights)))
+        scorer.set_weights(weights)
+        _assert_matches_topsis(scorer, matrix, weights, is_benefit)
+
+        is_benefit = is_benefit.copy()
+        is_benefit[step % len(is_benefit)] ^= True
+        scorer.set_is_benefit(is_benefit)
+        _assert_matches_topsis(scorer, matrix, weights, is_benefit)
+
+        # Edit sel setelah flip memakai ideal yang sudah ditukar
+        i, j = rng.integers(matrix.shape[0]), step % matrix.shape[1]
+        matrix[i, j] = rng.uniform(0.5, 11)
+        scorer.update_cell(i, j, matrix[i, j])
+        _assert_matches_topsis(scorer, matrix, weights, is_benefit)
+
+
+def test_update_with_edited_matrix_and_periodic_refresh(topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(seed=5)
+    scorer = IncrementalTopsis(matrix, weights, is_benefit, refresh_every=3)
+
+    edited = matrix.copy()
+    edited[[0, 7], [1, 2]] = [9.5, 1.5]
+    scorer.update(edited)
+    _assert_matches_topsis(scorer, edited, weights, is_benefit)
+
+    # Banyak sel berubah: hitung ulang penuh
+    rewritten = np.random.default_rng(6).uniform(1, 10, size=matrix.shape)
+    scorer.update(rewritten)
+    _assert_matches_topsis(scorer, rewritten, weights, is_benefit)
+
+    for i in range(5):
+        rewritten[i, 0] += 0.25
+        scorer.update_row(i, rewritten[i])
+        _assert_matches_topsis(scorer, rewritten, weights, is_benefit)
+
+    with pytest.raises(ValueError):
+        scorer.update(rewritten[:-1])
+
+
+def test_result_top_k_and_positions_match_rumus(topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(seed=7)
+    scorer = IncrementalTopsis(matrix, weights, is_benefit)
+
+    scores, ranking, positions = scorer.result(top_k=5, return_positions=True)
+    expected_scores, expected_ranking, expected_positions = topsis(matrix, weights, is_benefit, top_k=5, return_positions=True)
+
+    np.testing.assert_allclose(scores, expected_scores, rtol=1e-12)
+    assert ranking == expected_ranking and len(ranking) == 5
+    assert positions == expected_positions
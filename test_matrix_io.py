@@ -0,0 +1,93 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from matrix_io import align_criteria, page_count, page_slice, read_matrix, validate_matrix
+
+
+def _csv(text, name="matrix.csv"):
+    source = io.StringIO(text)
+    source.name = name
+    return source
+
+
+def test_validate_matrix_reports_and_corrects_every_bad_cell():
+    values = np.array([[5.0, np.nan, 11.0],
+                       [0.0, 3.0, 10.0],
+                       [1.0, np.inf, -2.0]])
+
+    clipped, report = validate_matrix(values, 1, 10, index=["A", "B", "C"], columns=["x", "y", "z"])
+
+    np.testing.assert_array_equal(clipped, [[5, 1, 10], [1, 3, 10], [1, 1, 1]])
+    assert report[["Alternative", "Criterion", "Issue"]].values.tolist() == [
+        ["A", "y", "missing or not a number"],
+        ["A", "z", "above 10"],
+        ["B", "x", "below 1"],
+        ["C", "y", "missing or not a number"],
+        ["C", "z", "below 1"],
+    ]
+    assert report["Corrected To"].tolist() == [1, 10, 1, 1, 1]
+    np.testing.assert_array_equal(report["Value"], [np.nan, 11, 0, np.inf, -2])
+
+
+def test_validate_matrix_without_issues_returns_the_input_unchanged():
+    values = np.random.default_rng(0).uniform(1, 5, size=(50, 3))
+
+    clipped, report = validate_matrix(values, 1, 5)
+
+    assert clipped is values
+    assert len(report) == 0 and list(report.columns) == ["Alternative", "Criterion", "Value", "Issue", "Corrected To"]
+
+
+def test_validate_matrix_uses_positions_without_labels():
+    _, report = validate_matrix([[1.0, 7.0]], 1, 5)
+    assert report[["Alternative", "Criterion"]].values.tolist() == [[0, 1]]
+
+
+def test_read_matrix_detects_the_name_column_and_coerces_cells():
+    frame = read_matrix(_csv("Rent,Site,Traffic\n3,North,7\nx,South,8\n"))
+
+    assert frame.index.tolist() == ["North", "South"]
+    assert frame.columns.tolist() == ["Rent", "Traffic"]
+    assert np.isnan(frame.loc["South", "Rent"]) and frame.loc["North", "Traffic"] == 7
+
+    # Tanpa kolom nama: kolom pertama non-numerik, atau nomor urut bila semua numerik
+    assert read_matrix(_csv("label,a\nP,1\n")).index.tolist() == ["P"]
+    assert read_matrix(_csv("a,b\n1,2\n3,4\n")).index.tolist() == ["Alternative 1", "Alternative 2"]
+    with pytest.raises(ValueError):
+        read_matrix(_csv("a\n1\n", name="matrix.txt"))
+
+
+def test_read_matrix_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    pd.DataFrame({"name": ["A", "B"], "Rent": [1.0, 2.0], "Traffic": [3.0, 4.0]}).to_parquet(tmp_path / "m.parquet")
+
+    frame = read_matrix(str(tmp_path / "m.parquet"))
+
+    assert frame.index.tolist() == ["A", "B"] and frame.values.tolist() == [[1, 3], [2, 4]]
+
+
+def test_align_criteria_by_name_and_by_position():
+    frame = pd.DataFrame([[1.0, 2.0, 3.0]], index=["A"], columns=["traffic", "RENT", "Parking"])
+
+    by_name = align_criteria(frame, ["Rent", " Parking", "Traffic"])
+    assert by_name.columns.tolist() == ["Rent", " Parking", "Traffic"]
+    assert by_name.values.tolist() == [[2, 3, 1]]
+
+    by_position = align_criteria(frame, ["C1", "C2", "C3"])
+    assert by_position.columns.tolist() == ["C1", "C2", "C3"] and by_position.values.tolist() == [[1, 2, 3]]
+    assert frame.columns.tolist() == ["traffic", "RENT", "Parking"]
+
+    with pytest.raises(ValueError, match="Missing criteria columns: Visibility"):
+        align_criteria(frame, ["Rent", "Traffic", "Visibility"])
+    with pytest.raises(ValueError):
+        align_criteria(frame, ["C1", "C2"])
+
+
+def test_pagination():
+    assert page_count(0, 200) == 1 and page_count(401, 200) == 3
+    assert page_slice(401, 3, 200) == slice(400, 401)
+    assert page_slice(401, 9, 200) == slice(400, 401)
+    assert page_slice(401, 0, 200) == slice(0, 200)
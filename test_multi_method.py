@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+import multi_method
+from multi_method import borda, compare_methods, copeland, method_positions, multi_method_scores
+from rumus import topsis
+
+# Matriks kecil yang dihitung dengan tangan: C1 Benefit, C2 Cost, bobot 0.6 / 0.4
+MATRIX = [[1, 2], [2, 1], [4, 4]]
+WEIGHTS = [0.6, 0.4]
+IS_BENEFIT = [True, False]
+
+
+def test_each_method_matches_hand_computed_scores():
+    scores = multi_method_scores(MATRIX, WEIGHTS, IS_BENEFIT)
+
+    # SAW: C1 / 4 dan 1 / C2
+    np.testing.assert_allclose(scores["SAW"], [0.6 * 0.25 + 0.4 * 0.5, 0.6 * 0.5 + 0.4 * 1, 0.6 * 1 + 0.4 * 0.25])
+    # WP: C1^0.6 · C2^-0.4, dinormalisasi berjumlah 1
+    wp = np.array([2**-0.4, 2**0.6, 4**0.2])
+    np.testing.assert_allclose(scores["WP"], wp / wp.sum())
+    # VIKOR: S = [0.733, 0.4, 0.4], R = [0.6, 0.4, 0.4] -> Q = [1, 0, 0]
+    np.testing.assert_allclose(scores["VIKOR"], [0, 1, 1], atol=1e-12)
+    # TOPSIS: jarak dalam satuan 1 / sqrt(21)
+    expected = [0.8 / (np.sqrt(3.4) + 0.8), np.sqrt(1.8) / (1.2 + np.sqrt(1.8)), 1.8 / 3.0]
+    np.testing.assert_allclose(scores["TOPSIS"], expected)
+    np.testing.assert_allclose(scores["TOPSIS"], topsis(MATRIX, WEIGHTS, IS_BENEFIT)[0])
+
+
+def test_weights_are_normalised_and_unknown_methods_raise():
+    scaled = multi_method_scores(MATRIX, [3, 2], IS_BENEFIT, methods=("SAW",))
+    np.testing.assert_allclose(scaled["SAW"], multi_method_scores(MATRIX, WEIGHTS, IS_BENEFIT)["SAW"])
+    with pytest.raises(ValueError, match="ELECTRE"):
+        multi_method_scores(MATRIX, WEIGHTS, IS_BENEFIT, methods=("SAW", "ELECTRE"))
+
+
+def test_nan_scores_are_ranked_last():
+    positions = method_positions({"A": np.array([0.2, np.nan, 0.5])})
+    assert positions.tolist() == [[2, 3, 1]]
+
+
+def test_borda_and_copeland_with_ties():
+    # Dua metode berbeda pendapat tentang A0 dan A1: seri di Borda maupun Copeland
+    positions = np.array([[1, 2, 3], [2, 1, 3]])
+
+    assert borda(positions).tolist() == [3, 3, 0]
+    assert copeland(positions).tolist() == [1, 1, -2]
+
+    # Tiga metode: mayoritas memilih A1 atas A0
+    positions = np.array([[1, 2, 3], [2, 1, 3], [3, 1, 2]])
+    assert borda(positions).tolist() == [3, 5, 1]
+    assert copeland(positions).tolist() == [0, 2, -2]
+
+
+def test_copeland_blocks_match_a_single_block(topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(n=40)
+    positions = method_positions(multi_method_scores(matrix, weights, is_benefit))
+
+    np.testing.assert_array_equal(copeland(positions, block_cells=7), copeland(positions))
+
+
+def test_compare_methods_consensus_and_agreement():
+    result = compare_methods(MATRIX, WEIGHTS, IS_BENEFIT, consensus="Copeland")
+
+    assert result["positions"].shape == (4, 3)
+    # A1 dan A2 seri (1 : 1); seperti rank_scores, indeks yang lebih besar didahulukan
+    assert result["consensus_scores"].tolist() == [-2, 1, 1]
+    assert result["consensus_positions"].tolist() == [3, 2, 1]
+    assert result["rank_spread"].tolist() == [0, 1, 1]
+    np.testing.assert_allclose(np.diag(result["agreement"]), 1)
+
+
+def test_copeland_size_limit_raises(monkeypatch, topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(n=6)
+    monkeypatch.setattr(multi_method, "COPELAND_MAX_ALTERNATIVES", 5)
+
+    with pytest.raises(ValueError, match="Copeland"):
+        compare_methods(matrix, weights, is_benefit, consensus="Copeland")
+    assert len(compare_methods(matrix, weights, is_benefit, consensus="Borda")["consensus_scores"]) == 6
+    with pytest.raises(ValueError):
+        compare_methods(matrix, weights, is_benefit, consensus="Kemeny")
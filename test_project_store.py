@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+
+import project_store
+from project_store import diff_snapshots, list_projects, list_versions, load_snapshot, save_snapshot
+
+
+def test_save_load_round_trip_keeps_meta_and_maps_arrays(tmp_path):
+    matrix = np.random.default_rng(0).uniform(1, 10, size=(50, 4))
+    meta = {"criteria": ["C1", "C2", "C3", "C4"], "weights": [0.4, 0.3, 0.2, 0.1], "is_benefit": [True, False, True, True]}
+
+    version = save_snapshot("Studi Sleman", meta, {"topsis_matrix": matrix, "topsis_alternatives": ["A", "B"] * 25,
+                                                  "pm_scores": None}, note="first", root=tmp_path)
+    loaded_meta, arrays, info = load_snapshot("Studi Sleman", root=tmp_path)
+
+    assert version == 1
+    assert loaded_meta == meta
+    assert info["version"] == 1 and info["note"] == "first"
+    assert set(arrays) == {"topsis_matrix", "topsis_alternatives"}
+    assert isinstance(arrays["topsis_matrix"], np.memmap)
+    assert not arrays["topsis_matrix"].flags.writeable
+    np.testing.assert_array_equal(arrays["topsis_matrix"], matrix)
+    assert arrays["topsis_alternatives"].tolist() == ["A", "B"] * 25
+    assert list_projects(tmp_path) == ["Studi_Sleman"]
+
+
+def test_versions_are_numbered_in_order_and_loaded_by_number(tmp_path):
+    for i in range(3):
+        assert save_snapshot("p", {"i": i}, {"x": np.arange(i + 1)}, root=tmp_path) == i + 1
+
+    assert [v["version"] for v in list_versions("p", tmp_path)] == [1, 2, 3]
+    assert load_snapshot("p", root=tmp_path)[0] == {"i": 2}
+    meta, arrays, _ = load_snapshot("p", 2, root=tmp_path, mmap=False)
+    assert meta == {"i": 1} and arrays["x"].tolist() == [0, 1]
+    with pytest.raises(ValueError):
+        load_snapshot("p", 9, root=tmp_path)
+    with pytest.raises(ValueError):
+        load_snapshot("missing", root=tmp_path)
+
+
+def test_failed_save_leaves_no_partial_version_or_staging_folder(tmp_path, monkeypatch):
+    save_snapshot("p", {}, {"x": np.ones(3)}, root=tmp_path)
+
+    def broken_save(path, *args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "save", broken_save)
+    with pytest.raises(OSError):
+        save_snapshot("p", {}, {"x": np.ones(3)}, root=tmp_path)
+
+    assert sorted(os.listdir(tmp_path / "p")) == ["v0001"]
+    assert [v["version"] for v in list_versions("p", tmp_path)] == [1]
+
+
+def test_staged_rename_takes_the_next_free_version_when_one_appears_concurrently(tmp_path, monkeypatch):
+    save_snapshot("p", {"by": "a"}, {}, root=tmp_path)
+    list_versions = project_store.list_versions
+    calls = []
+
+    # Proses lain menulis v0002 di antara penghitungan versi dan rename
+    def racing_list_versions(project, root=None):
+        versions = list_versions(project, root)
+        if not calls:
+            calls.append(1)
+            monkeypatch.setattr(project_store, "list_versions", list_versions)
+            save_snapshot("p", {"by": "b"}, {}, root=tmp_path)
+        return versions
+
+    monkeypatch.setattr(project_store, "list_versions", racing_list_versions)
+    assert save_snapshot("p", {"by": "c"}, {}, root=tmp_path) == 3
+    assert [load_snapshot("p", v, root=tmp_path)[0]["by"] for v in (1, 2, 3)] == ["a", "b", "c"]
+    assert sorted(os.listdir(tmp_path / "p")) == ["v0001", "v0002", "v0003"]
+
+
+def test_diff_snapshots_counts_changed_cells_settings_and_shapes(tmp_path):
+    matrix = np.arange(20, dtype=float).reshape(5, 4)
+    matrix[0, 0] = np.nan
+    edited = matrix.copy()
+    edited[1, 2] = -1
+    edited[4, 3] = 99
+    save_snapshot("p", {"weights": [0.5, 0.5], "criteria": ["a", "b"]},
+                  {"matrix": matrix, "scores": np.ones(5), "names": ["x"] * 5}, root=tmp_path)
+    save_snapshot("p", {"weights": [0.6, 0.4], "criteria": ["a", "b"], "note": "n"},
+                  {"matrix": edited, "scores": np.ones(6), "ranking": np.arange(5)}, root=tmp_path)
+
+    changes = {c["item"]: c for c in diff_snapshots("p", 1, 2, root=tmp_path)}
+
+    assert set(changes) == {"weights", "note", "matrix", "scores", "names", "ranking"}
+    assert changes["weights"]["change"] == "changed" and changes["weights"]["after"] == [0.6, 0.4]
+    assert changes["note"]["change"] == "added"
+    assert changes["matrix"]["change"] == "2 of 20 cells changed"
+    assert changes["scores"]["change"] == "shape changed" and changes["scores"]["after"] == [6]
+    assert changes["names"]["change"] == "removed"
+    assert changes["ranking"]["change"] == "added"
+    assert diff_snapshots("p", 1, 1, root=tmp_path) == []
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from rank_reversal import topsis_leave_one_out
+from rumus import topsis
+
+
+# Skor TOPSIS setelah alternatif r dihapus, diindeks global (r = -inf)
+def _brute_force_scores(matrix, weights, is_benefit):
+    n = len(matrix)
+    variants = np.full((n, n), -np.inf)
+    for r in range(n):
+        scores, _ = topsis(np.delete(matrix, r, axis=0), weights, is_benefit)
+        variants[r, np.arange(n) != r] = scores
+    return variants
+
+
+def _assert_new_top_matches(result, variants, top_k):
+    for r, row in enumerate(variants):
+        new_top = result["new_top"][r]
+        assert r not in new_top and len(set(new_top.tolist())) == top_k
+        # Dengan skor seri, indeks boleh berbeda; skor top-k harus sama
+        np.testing.assert_allclose(row[new_top], np.sort(row)[::-1][:top_k], rtol=1e-9)
+
+
+@pytest.mark.parametrize("n, top_k, block_cells", [(12, 1, 1 << 22), (40, 3, 1 << 22), (400, 5, 64)])
+def test_leave_one_out_matches_rerunning_topsis_without_each_alternative(n, top_k, block_cells):
+    rng = np.random.default_rng(n)
+    matrix = rng.uniform(1, 10, size=(n, 4))
+    weights, is_benefit = rng.dirichlet(np.ones(4)), [True, False, True, False]
+
+    result = topsis_leave_one_out(matrix, weights, is_benefit, top_k=top_k, block_cells=block_cells)
+    variants = _brute_force_scores(matrix, weights, is_benefit)
+
+    _assert_new_top_matches(result, variants, top_k)
+    _, ranking = topsis(matrix, weights, is_benefit)
+    assert result["top"].tolist() == ranking[:top_k]
+
+    for r in range(n):
+        expected = [i for i in ranking if i != r][:top_k]
+        assert result["expected_top"][r].tolist() == expected
+        brute_top = np.argsort(-variants[r], kind="stable")[:top_k]
+        assert result["winner_changed"][r] == (brute_top[0] != expected[0])
+        assert result["top_k_changed"][r] == (brute_top.tolist() != expected)
+
+
+def test_ties_and_duplicated_extremes_match_brute_force():
+    rng = np.random.default_rng(3)
+    matrix = rng.integers(1, 5, size=(30, 3)).astype(float)
+    matrix[5] = matrix[6]                              # baris kembar: skor selalu seri
+    matrix[[0, 1], 0] = 9                              # maks kolom 0 dimiliki dua alternatif
+    matrix[[2, 3], 1] = 0.5                            # min kolom 1 dimiliki dua alternatif
+    matrix[4, 2] = 7                                   # maks tunggal: ideal bergeser saat dihapus
+    weights, is_benefit = [0.5, 0.3, 0.2], [True, False, True]
+
+    variants = _brute_force_scores(matrix, weights, is_benefit)
+    for top_k in (1, 4):
+        result = topsis_leave_one_out(matrix, weights, is_benefit, top_k=top_k)
+        _assert_new_top_matches(result, variants, top_k)
+
+
+def test_constant_column_and_two_alternatives():
+    matrix = np.array([[3.0, 5.0], [3.0, 1.0]])
+    result = topsis_leave_one_out(matrix, [0.5, 0.5], [True, True])
+    assert result["new_top"].tolist() == [[1], [0]]
+
+    with pytest.raises(ValueError):
+        topsis_leave_one_out(matrix[:1], [0.5, 0.5], [True, True])
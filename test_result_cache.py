@@ -0,0 +1,138 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from result_cache import ResultCache, content_hash
+from rumus import compile_gap_weight, topsis
+
+
+def _array(value, size=100):
+    return np.full(size, float(value))  # 800 byte
+
+
+def test_lru_evicts_least_recently_used_within_byte_budget():
+    cache = ResultCache(max_bytes=2000)
+    cache.put("a", _array(1))
+    cache.put("b", _array(2))
+    assert cache.get("a")[0] == 1  # "a" menjadi yang terbaru
+
+    cache.put("c", _array(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.bytes == 1600 and cache.bytes <= cache.max_bytes
+    assert cache.stats()["evictions"] == 1
+
+
+def test_replacing_a_key_and_oversized_values_keep_the_byte_count_exact():
+    cache = ResultCache(max_bytes=2000)
+    cache.put("a", _array(1))
+    cache.put("a", _array(1, size=200))
+    assert cache.bytes == 1600 and cache.stats()["entries"] == 1
+
+    # Nilai lebih besar dari anggaran tidak disimpan (dan entri lama dengan kunci sama dibuang)
+    cache.put("a", _array(1, size=1000))
+    assert cache.get("a") is None and cache.bytes == 0
+
+    cache.put("b", _array(2))
+    cache.clear()
+    assert cache.bytes == 0 and cache.stats()["entries"] == 0
+
+
+def test_hit_miss_counters_and_compute_once():
+    cache = ResultCache(max_bytes=1 << 20)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return _array(7)
+
+    for _ in range(3):
+        assert cache.get_or_compute("k", compute)[0] == 7
+    assert cache.get("missing", "default") == "default"
+
+    stats = cache.stats()
+    assert len(calls) == 1
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_call_keys_on_function_and_argument_contents():
+    cache = ResultCache(max_bytes=1 << 20)
+    matrix = np.random.default_rng(0).uniform(1, 10, size=(20, 3))
+
+    first = cache.call(topsis, matrix, [0.5, 0.3, 0.2], [True, False, True])
+    again = cache.call(topsis, matrix.copy(), np.array([0.5, 0.3, 0.2]), (True, False, True))
+    other = cache.call(topsis, matrix, [0.2, 0.3, 0.5], [True, False, True])
+
+    assert again is first and other is not first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_content_hash_depends_on_contents_not_identity():
+    array = np.arange(12, dtype=float).reshape(3, 4)
+
+    assert content_hash(array) == content_hash(array.copy())
+    assert content_hash(array[:, ::2]) == content_hash(np.ascontiguousarray(array[:, ::2]))
+    assert content_hash([1, 2, 3]) == content_hash(np.array([1, 2, 3]))
+    assert content_hash({"a": 1, "b": [1.5]}) == content_hash({"b": [1.5], "a": 1})
+    assert content_hash(compile_gap_weight({0: 5, 1: 4})) == content_hash(compile_gap_weight({1: 4, 0: 5}))
+
+    assert content_hash(array) != content_hash(array.astype(np.float32))
+    assert content_hash(array) != content_hash(array.reshape(4, 3))
+    assert content_hash(array) != content_hash(array + 1e-12)
+    assert content_hash(compile_gap_weight({0: 5, 1: 4})) != content_hash(compile_gap_weight({0: 5, 1: 3}))
+    assert content_hash("1") != content_hash(1)
+
+
+def test_content_hash_of_mixed_lists_object_arrays_and_frames():
+    assert content_hash(["1", 1]) != content_hash(["1", "1"])
+    assert content_hash(["a", "b"]) == content_hash(np.array(["a", "b"]))
+
+    # repr array objek besar terpotong "...": elemen tengah tetap harus masuk hash
+    names = np.array([f"Site {i}" for i in range(5000)], dtype=object)
+    changed = names.copy()
+    changed[2500] = "Other"
+    assert content_hash(names) != content_hash(changed)
+    assert content_hash(np.array([1, "1"], dtype=object)) != content_hash(np.array(["1", "1"], dtype=object))
+
+    frame = pd.DataFrame(np.arange(6000.0).reshape(2000, 3), columns=["a", "b", "c"])
+    edited = frame.copy()
+    edited.iloc[1000, 1] = -1
+    assert content_hash(frame) == content_hash(frame.copy())
+    assert content_hash(frame) != content_hash(edited)
+    assert content_hash(frame) != content_hash(frame.rename(columns={"c": "d"}))
+    assert content_hash(frame) != content_hash(frame.astype(np.float32))
+    assert content_hash(frame) != content_hash(frame.set_axis(frame.index + 1))
+    assert content_hash(frame["a"]) != content_hash(edited["a"].rename("z"))
+
+
+def test_callables_without_a_cache_key_are_refused():
+    assert content_hash(topsis) == content_hash(topsis)
+    assert content_hash(np.add) != content_hash(np.multiply)
+
+    offset = 1.0
+    with pytest.raises(TypeError, match="cache_key"):
+        content_hash(lambda gap: gap + offset)
+    cache = ResultCache(max_bytes=1 << 20)
+    with pytest.raises(TypeError, match="cache_key"):
+        cache.call(topsis, np.ones((3, 2)), [0.5, 0.5], [True, True], callback=cache.stats)
+
+    def lookup(gap):
+        return gap + offset
+    lookup.cache_key = offset
+    assert content_hash(lookup) != content_hash(compile_gap_weight({0: 5}))
+
+
+def test_content_hash_is_stable_across_processes():
+    code = ("import numpy as np; from result_cache import content_hash; "
+            "print(content_hash(np.arange(6.0).reshape(2, 3), ['x', 'y'], {'k': (1, 2.5)}, None))")
+    outputs = {subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+               for _ in range(2)}
+
+    assert outputs == {content_hash(np.arange(6.0).reshape(2, 3), ["x", "y"], {"k": (1, 2.5)}, None)}
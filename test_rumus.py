@@ -0,0 +1,176 @@
+import numpy as np
+import pytest
+
+from rumus import (calculate_ahp_weights_eigen, compile_gap_weight, gap_weight, profile_matching,
+                   random_index, rank_scores, topsis, topsis_batch, topsis_kernel)
+
+
+def test_topsis_batch_matches_loop_over_weights():
+    rng = np.random.default_rng(0)
+    matrix = rng.uniform(1, 10, size=(12, 4))
+    weights = rng.dirichlet(np.ones(4), size=25)
+    is_benefit = [True, False, True, True]
+
+    scores, ranking = topsis_batch(matrix, weights, is_benefit)
+
+    assert scores.shape == (25, 12)
+    for k, w in enumerate(weights):
+        expected_scores, expected_ranking = topsis(matrix, w, is_benefit)
+        np.testing.assert_allclose(scores[k], expected_scores)
+        assert ranking[k].tolist() == expected_ranking
+
+
+def test_topsis_batch_matches_loop_over_matrices_and_flags():
+    rng = np.random.default_rng(1)
+    matrices = rng.uniform(1, 10, size=(6, 8, 3))
+    weights = rng.dirichlet(np.ones(3), size=6)
+    flags = rng.integers(0, 2, size=(6, 3)).astype(bool)
+
+    scores, ranking = topsis_batch(matrices, weights, flags)
+
+    for k in range(6):
+        expected_scores, expected_ranking = topsis(matrices[k], weights[k], flags[k])
+        np.testing.assert_allclose(scores[k], expected_scores)
+        assert ranking[k].tolist() == expected_ranking
+
+
+def test_topsis_batch_single_weight_vector_broadcasts_over_matrices():
+    rng = np.random.default_rng(2)
+    matrices = rng.uniform(1, 10, size=(4, 5, 3))
+    weights = [0.5, 0.3, 0.2]
+
+    scores, _ = topsis_batch(matrices, weights, [True, True, False])
+
+    for k in range(4):
+        expected_scores, _ = topsis(matrices[k], weights, [True, True, False])
+        np.testing.assert_allclose(scores[k], expected_scores)
+
+
+def _profile_matching_loop(ideal, actuals, weights, cf_sf_grouping):
+    total_cf = sum(w for w, g in zip(weights, cf_sf_grouping) if g == 'CF')
+    total_sf = sum(w for w, g in zip(weights, cf_sf_grouping) if g == 'SF')
+    scores = []
+    for alt in actuals:
+        cf = [gap_weight(a - i) for i, a, g in zip(ideal, alt, cf_sf_grouping) if g == 'CF']
+        sf = [gap_weight(a - i) for i, a, g in zip(ideal, alt, cf_sf_grouping) if g != 'CF']
+        avg_cf = sum(cf) / len(cf) if cf else 0
+        avg_sf = sum(sf) / len(sf) if sf else 0
+        scores.append(avg_cf * total_cf + avg_sf * total_sf)
+    return scores
+
+
+def test_profile_matching_matches_reference_loop_on_integer_gaps():
+    rng = np.random.default_rng(3)
+    actuals = rng.integers(1, 6, size=(40, 5)).tolist()
+    ideal = [3, 4, 2, 5, 1]
+    weights = rng.dirichlet(np.ones(5)).tolist()
+    grouping = ['CF', 'SF', 'CF', 'CF', 'SF']
+
+    scores, ranking = profile_matching(ideal, actuals, weights, grouping)
+
+    np.testing.assert_allclose(scores, _profile_matching_loop(ideal, actuals, weights, grouping))
+    assert sorted(ranking) == list(range(40))
+
+
+def test_gap_table_interpolates_fractional_gaps():
+    table = compile_gap_weight()
+    np.testing.assert_allclose(table([0, 0.5, -1.5, 5.5, 7]), [5.0, 4.75, 4.25, 1.75, 1.0])
+
+    lookup = compile_gap_weight(interpolate=False)
+    np.testing.assert_allclose(lookup([0, -2, 0.5, 6]), [5.0, 4.0, 1.0, 1.0])
+
+
+def test_gap_table_signed_keys():
+    table = compile_gap_weight({0: 5.0, 1: 4.5, -1: 4.0}, interpolate=False)
+    np.testing.assert_allclose(table([1, -1, 2]), [4.5, 4.0, 1.0])
+
+
+def test_rank_scores_top_k_matches_full_sort_prefix():
+    rng = np.random.default_rng(4)
+    scores = rng.random((3, 200))
+
+    full, full_positions = rank_scores(scores)
+    top, top_positions = rank_scores(scores, top_k=7)
+
+    assert (top == full[:, :7]).all()
+    assert (np.take_along_axis(full_positions, full, axis=-1) == np.arange(1, 201)).all()
+    assert (top_positions[top_positions > 0] == full_positions[top_positions > 0]).all()
+    assert (top_positions > 0).sum(axis=-1).tolist() == [7, 7, 7]
+
+
+def test_topsis_top_k_and_positions():
+    rng = np.random.default_rng(5)
+    matrix = rng.uniform(1, 10, size=(50, 4))
+    weights = [0.4, 0.3, 0.2, 0.1]
+    is_benefit = [True, True, False, True]
+
+    scores, ranking = topsis(matrix, weights, is_benefit)
+    top_scores, top_ranking, positions = topsis(matrix, weights, is_benefit, top_k=5, return_positions=True)
+
+    assert top_scores == scores
+    assert top_ranking == ranking[:5]
+    assert [positions[i] for i in top_ranking] == [1, 2, 3, 4, 5]
+
+
+def test_eigenvector_ahp_matches_numpy_eig():
+    matrix = np.array([[1, 3, 5, 2], [1 / 3, 1, 2, 1 / 2], [1 / 5, 1 / 2, 1, 1 / 3], [1 / 2, 2, 3, 1]])
+
+    weights, cr = calculate_ahp_weights_eigen(matrix)
+
+    values, vectors = np.linalg.eig(matrix)
+    principal = np.real(vectors[:, np.argmax(np.real(values))])
+    np.testing.assert_allclose(weights, principal / principal.sum(), atol=1e-9)
+    np.testing.assert_allclose(cr, (np.real(values).max() - 4) / 3 / 0.90, atol=1e-9)
+
+
+def test_random_index_extends_past_saaty_table():
+    assert random_index(10) == 1.49
+    generated = [random_index(n) for n in (11, 15, 20)]
+    assert 1.49 < generated[0] < generated[1] < generated[2] < 1.75
+
+
+def test_topsis_kernel_matches_topsis_for_c_and_f_order_blocks():
+    rng = np.random.default_rng(6)
+    matrix = rng.uniform(1, 10, size=(301, 6))
+    weights = rng.dirichlet(np.ones(6))
+    is_benefit = [True, False, True, False, True, True]
+    expected, _ = topsis(matrix, weights, is_benefit)
+
+    for layout in (matrix, np.asfortranarray(matrix)):
+        out = np.empty(301)
+        result = topsis_kernel(layout, weights, is_benefit, out=out, block_cells=64)
+        assert result is out
+        np.testing.assert_allclose(out, expected, rtol=1e-12)
+
+
+def test_topsis_kernel_rejects_mismatched_out_buffers():
+    matrix = np.random.default_rng(8).uniform(1, 10, size=(10, 3))
+    weights, is_benefit = [0.5, 0.3, 0.2], [True, False, True]
+
+    for out in (np.empty(10, dtype=np.float32), np.empty(10, dtype=int), np.empty(9), np.empty((10, 1)), [0.0] * 10):
+        with pytest.raises(ValueError, match="out must be"):
+            topsis_kernel(matrix, weights, is_benefit, out=out)
+    readonly = np.empty(10)
+    readonly.flags.writeable = False
+    with pytest.raises(ValueError, match="writeable"):
+        topsis_kernel(matrix, weights, is_benefit, out=readonly)
+
+    out32 = np.empty(10, dtype=np.float32)
+    assert topsis_kernel(matrix.astype(np.float32), weights, is_benefit, out=out32) is out32
+
+
+def test_topsis_kernel_float32_accuracy_against_float64():
+    rng = np.random.default_rng(7)
+    matrix = rng.uniform(1, 10, size=(20_000, 20))
+    weights = rng.dirichlet(np.ones(20))
+    is_benefit = rng.random(20) < 0.5
+
+    exact = topsis_kernel(matrix, weights, is_benefit)
+    approx = topsis_kernel(matrix.astype(np.float32), weights, is_benefit)
+
+    assert approx.dtype == np.float32
+    assert np.abs(approx - exact).max() < 1e-6
+    # Peringkat hanya boleh berbeda di antara alternatif yang skornya hampir sama
+    exact_order, approx_order = np.argsort(-exact), np.argsort(-approx)
+    swapped = exact_order != approx_order
+    assert np.abs(exact[exact_order[swapped]] - exact[approx_order[swapped]]).max(initial=0) < 2e-6
@@ -0,0 +1,45 @@
+import numpy as np
+
+from rumus import topsis
+from sensitivity import monte_carlo_sensitivity, sample_dirichlet_weights
+
+
+def test_same_seed_gives_identical_results_for_one_and_many_workers(topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(n=15)
+    kwargs = dict(n_draws=900, is_benefit=is_benefit, seed=7, batch_size=100, top_k=5)
+
+    single = monte_carlo_sensitivity("topsis", matrix, weights, n_jobs=1, **kwargs)
+    parallel = monte_carlo_sensitivity("topsis", matrix, weights, n_jobs=3, **kwargs)
+
+    for key in ("rank_acceptability", "win_probability", "mean_rank"):
+        np.testing.assert_array_equal(single[key], parallel[key])
+
+
+def test_profile_matching_same_seed_is_independent_of_workers():
+    rng = np.random.default_rng(1)
+    actuals = rng.integers(1, 6, size=(20, 4))
+    kwargs = dict(n_draws=600, ideal=[3, 4, 2, 5], cf_sf_grouping=["CF", "CF", "SF", "SF"], seed=3, batch_size=50)
+
+    single = monte_carlo_sensitivity("profile_matching", actuals, [0.4, 0.3, 0.2, 0.1], n_jobs=1, **kwargs)
+    parallel = monte_carlo_sensitivity("profile_matching", actuals, [0.4, 0.3, 0.2, 0.1], n_jobs=4, **kwargs)
+
+    np.testing.assert_array_equal(single["rank_acceptability"], parallel["rank_acceptability"])
+    np.testing.assert_array_equal(single["mean_rank"], parallel["mean_rank"])
+
+
+def test_top_k_counts_and_mean_rank_match_reranking_every_draw(topsis_problem):
+    matrix, weights, is_benefit = topsis_problem(n=12, seed=2)
+    result = monte_carlo_sensitivity("topsis", matrix, weights, n_draws=300, is_benefit=is_benefit,
+                                     seed=11, n_jobs=1, top_k=3, block_cells=500)
+
+    draws = sample_dirichlet_weights(weights, 300, 100.0, np.random.default_rng(11))
+    positions = np.empty((300, 12), dtype=int)
+    for d, w in enumerate(draws):
+        _, ranking = topsis(matrix, w, is_benefit)
+        positions[d, ranking] = np.arange(1, 13)
+
+    assert result["rank_acceptability"].shape == (12, 3)
+    for r in range(3):
+        np.testing.assert_allclose(result["rank_acceptability"][:, r], (positions == r + 1).mean(axis=0))
+    np.testing.assert_allclose(result["win_probability"], (positions == 1).mean(axis=0))
+    np.testing.assert_allclose(result["mean_rank"], positions.mean(axis=0))
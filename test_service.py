@@ -0,0 +1,120 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from rumus import compile_gap_weight, profile_matching, topsis
+from service import Coalescer, ScoringService
+
+
+@pytest.fixture
+def service():
+    service = ScoringService(workers=1, window=0.05)
+    yield service
+    service.executor.shutdown()
+
+
+def _post(service, path, body):
+    return asyncio.run(service.dispatch("POST", path, json.dumps(body).encode()))
+
+
+def test_profile_matching_with_custom_gap_table_matches_rumus(service):
+    rng = np.random.default_rng(0)
+    actuals = rng.integers(1, 6, size=(30, 4)).tolist()
+    ideal, weights, cf_sf = [3, 4, 2, 5], [0.4, 0.3, 0.2, 0.1], ["CF", "CF", "SF", "SF"]
+    gap_table = {0: 5, 1: 4, -1: 3, 2: 2, -2: 1.5, 3: 1, -3: 0.5, 4: 0.2, -4: 0.1}
+
+    status, result = _post(service, "/profile-matching", {"ideal": ideal, "actuals": actuals, "weights": weights,
+                                                          "cf_sf": cf_sf, "gap_table": gap_table, "top_k": 5})
+
+    assert status == 200, result
+    expected, _ = profile_matching(ideal, actuals, weights, cf_sf, compile_gap_weight(gap_table))
+    np.testing.assert_allclose(result["scores"], expected)
+    assert result["ranking"] == np.argsort(-np.asarray(expected), kind="stable")[:5].tolist()
+
+
+def test_invalid_gap_table_is_a_bad_request(service):
+    status, result = _post(service, "/profile-matching", {"ideal": [1], "actuals": [[1]], "weights": [1],
+                                                          "cf_sf": ["CF"], "gap_table": {"x": 1}})
+    assert status == 400
+    assert "ValueError" in result["error"]
+
+
+def test_concurrent_topsis_requests_are_coalesced_into_one_batch(service):
+    rng = np.random.default_rng(1)
+    weights, is_benefit = [0.5, 0.3, 0.2], [True, False, True]
+    matrices = [rng.uniform(1, 10, size=(8, 3)).tolist() for _ in range(6)]
+
+    async def run():
+        return await asyncio.gather(*[
+            service.dispatch("POST", "/topsis", json.dumps({"matrix": m, "weights": weights, "is_benefit": is_benefit}).encode())
+            for m in matrices
+        ])
+
+    responses = asyncio.run(run())
+
+    assert service.coalescer.batches == 1
+    assert service.coalescer.coalesced == len(matrices)
+    for matrix, (status, result) in zip(matrices, responses):
+        assert status == 200
+        expected_scores, expected_ranking = topsis(matrix, weights, is_benefit)
+        np.testing.assert_allclose(result["scores"], expected_scores)
+        assert result["ranking"] == expected_ranking
+
+
+def test_stats_report_requests_and_latency_per_endpoint(service):
+    for _ in range(3):
+        assert _post(service, "/ahp", {"pairwise": [[1, 3], [1 / 3, 1]]})[0] == 200
+    assert _post(service, "/ahp", {"pairwise": [[1, 2, 3]]})[0] == 400
+
+    status, stats = asyncio.run(service.dispatch("GET", "/stats", b""))
+
+    assert status == 200
+    assert stats["endpoints"]["/ahp"]["requests"] == 3
+    assert 0 <= stats["endpoints"]["/ahp"]["p50_ms"] <= stats["endpoints"]["/ahp"]["p99_ms"]
+    assert stats["batches"] == 3
+    assert asyncio.run(service.dispatch("GET", "/missing", b""))[0] == 404
+
+
+def test_bad_request_next_to_a_good_one_only_fails_itself(service):
+    rng = np.random.default_rng(2)
+    good = {"matrix": rng.uniform(1, 10, size=(5, 2)).tolist(), "weights": [0.6, 0.4], "is_benefit": [True, False]}
+    bad = [dict(good, top_k=0), dict(good, matrix=[["x", 1]] * 5), dict(good, matrix=[[None, 1]] * 5)]
+
+    async def run():
+        return await asyncio.gather(*[service.dispatch("POST", "/topsis", json.dumps(b).encode()) for b in [good] + bad])
+
+    responses = asyncio.run(run())
+
+    assert responses[0][0] == 200
+    assert responses[0][1]["ranking"] == topsis(good["matrix"], good["weights"], good["is_benefit"])[1]
+    assert [status for status, _ in responses[1:]] == [400, 400, 400]
+    assert service.coalescer.coalesced == 1
+
+
+# Galat yang baru muncul di dalam batch: setiap permintaan diulang sendiri-sendiri
+def test_failed_batch_is_retried_per_request():
+    def run_batch(items):
+        if "bad" in items:
+            raise ZeroDivisionError("bad item")
+        return [item.upper() for item in items]
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            coalescer = Coalescer(executor, window=0.01)
+            return await asyncio.gather(*[coalescer.submit("k", item, run_batch) for item in ["a", "bad", "b"]],
+                                        return_exceptions=True)
+
+    first, error, last = asyncio.run(run())
+
+    assert (first, last) == ("A", "B")
+    assert isinstance(error, ZeroDivisionError)
+
+
+def test_unexpected_errors_are_a_server_error(service):
+    service.executor.shutdown()
+    status, result = _post(service, "/ahp", {"pairwise": [[1, 3], [1 / 3, 1]]})
+    assert status == 500
+    assert "RuntimeError" in result["error"]
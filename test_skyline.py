@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from rumus import profile_matching, topsis
+from skyline import profile_matching_prefiltered, skyband, skyline, topsis_prefiltered
+
+
+# Skyband O(n²): alternatif yang didominasi kurang dari k alternatif lain
+def _brute_force_skyband(matrix, is_benefit, k):
+    data = np.where(np.asarray(is_benefit, dtype=bool), matrix, -matrix)
+    at_least = (data[None, :, :] >= data[:, None, :]).all(axis=2)
+    better = (data[None, :, :] > data[:, None, :]).any(axis=2)
+    dominators = (at_least & better).sum(axis=1)
+    return np.flatnonzero(dominators < k)
+
+
+@pytest.mark.parametrize("is_benefit", [[True, True, True], [True, False, True], [False, False, False]])
+@pytest.mark.parametrize("k", [1, 2, 5])
+def test_skyband_matches_brute_force_dominance(is_benefit, k):
+    rng = np.random.default_rng(k)
+    # Nilai bulat: banyak baris seri dan kembar
+    matrix = rng.integers(1, 8, size=(300, 3)).astype(float)
+
+    expected = _brute_force_skyband(matrix, is_benefit, k)
+
+    np.testing.assert_array_equal(skyband(matrix, is_benefit, k), expected)
+    # Blok dan potongan kecil memaksa jalur multi-blok dan potongan yang membesar
+    np.testing.assert_array_equal(skyband(matrix, is_benefit, k, block=7, chunk_cells=64), expected)
+
+
+def test_skyline_on_continuous_data_and_edge_cases():
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(500, 4))
+    is_benefit = [True, False, False, True]
+
+    np.testing.assert_array_equal(skyline(matrix, is_benefit, block=50), _brute_force_skyband(matrix, is_benefit, 1))
+    assert skyband(np.zeros((0, 3))).tolist() == []
+    # Baris kembar tidak saling mendominasi
+    assert skyline(np.ones((4, 2))).tolist() == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 10])
+def test_topsis_prefiltered_top_k_equals_full_topsis(top_k):
+    rng = np.random.default_rng(top_k)
+    matrix = rng.uniform(1, 10, size=(2000, 4))
+    weights, is_benefit = rng.dirichlet(np.ones(4)), [True, False, True, False]
+
+    candidates, scores, ranking = topsis_prefiltered(matrix, weights, is_benefit, top_k=top_k)
+    full_scores, full_ranking = topsis(matrix, weights, is_benefit)
+
+    assert len(candidates) < len(matrix)
+    np.testing.assert_allclose(scores, np.asarray(full_scores)[candidates])
+    assert ranking[:top_k].tolist() == full_ranking[:top_k]
+
+
+@pytest.mark.parametrize("top_k", [1, 4])
+def test_profile_matching_prefiltered_top_k_equals_full_profile_matching(top_k):
+    rng = np.random.default_rng(top_k)
+    actuals = rng.integers(1, 6, size=(1000, 5))
+    ideal, weights = [3, 4, 2, 5, 3], rng.dirichlet(np.ones(5))
+    grouping = ["CF", "CF", "SF", "CF", "SF"]
+
+    candidates, scores, ranking = profile_matching_prefiltered(ideal, actuals, weights, grouping, top_k=top_k)
+    full_scores, full_ranking = profile_matching(ideal, actuals, weights, grouping)
+    full_scores = np.asarray(full_scores)
+
+    np.testing.assert_allclose(scores, full_scores[candidates])
+    # Skor PM sering seri: yang dibandingkan adalah skor top-k, bukan indeksnya
+    np.testing.assert_allclose(full_scores[ranking[:top_k]], full_scores[full_ranking[:top_k]])
@@ -0,0 +1,107 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from spatial import GridIndex, load_candidates, load_points, points_from_geojson, rescale
+
+
+def _brute_force_nearest(points, queries):
+    if len(points) == 0:
+        return np.full(len(queries), np.inf)
+    return np.sqrt(((queries[:, None, :] - points[None, :, :])**2).sum(axis=2)).min(axis=1)
+
+
+def _brute_force_count(points, queries, radius):
+    return (((queries[:, None, :] - points[None, :, :])**2).sum(axis=2) <= radius**2).sum(axis=1)
+
+
+def _clustered_points(rng, n=400):
+    centers = rng.uniform(0, 5000, size=(6, 2))
+    return centers[rng.integers(len(centers), size=n)] + rng.normal(scale=150, size=(n, 2))
+
+
+@pytest.mark.parametrize("cell_size", [None, 37.5, 500.0])
+def test_nearest_distance_matches_brute_force(cell_size):
+    rng = np.random.default_rng(0)
+    points = _clustered_points(rng)
+    queries = np.vstack([rng.uniform(-500, 5500, size=(300, 2)),
+                         rng.uniform(-2e5, 2e5, size=(20, 2))])  # jauh di luar grid: jalur fallback
+    index = GridIndex(points, cell_size=cell_size)
+
+    expected = _brute_force_nearest(points, queries)
+
+    np.testing.assert_allclose(index.nearest_distance(queries), expected)
+    # Blok kecil: satu kueri x 50 titik per blok, dan 2 kueri x semua titik
+    np.testing.assert_allclose(index.nearest_distance(queries, max_rings=1, block_cells=50), expected)
+    np.testing.assert_allclose(index.nearest_distance(queries, max_rings=1, block_cells=1000), expected)
+
+
+@pytest.mark.parametrize("radius", [50.0, 333.0, 1200.0])
+def test_count_within_matches_brute_force(radius):
+    rng = np.random.default_rng(1)
+    points = _clustered_points(rng)
+    queries = np.vstack([rng.uniform(-500, 5500, size=(300, 2)), [[1e6, 1e6]]])
+
+    for cell_size in (radius / 4, radius, 3 * radius):
+        index = GridIndex(points, cell_size=cell_size)
+        np.testing.assert_array_equal(index.count_within(queries, radius, block=64),
+                                      _brute_force_count(points, queries, radius))
+
+
+def test_radius_and_points_exactly_on_cell_boundaries():
+    # Titik bulat pada sudut dan tepi sel; jarak tepat sama dengan radius tetap dihitung
+    xs = np.arange(0, 101, 10.0)
+    points = np.array([(x, y) for x in xs for y in xs])
+    queries = np.array([[50.0, 50.0], [0.0, 0.0], [30.0, 70.0], [100.0, 40.0], [55.0, 45.0]])
+
+    for cell_size in (10.0, 20.0, 5.0):
+        index = GridIndex(points, cell_size=cell_size)
+        for radius in (10.0, 20.0, 30.0, 50.0):
+            np.testing.assert_array_equal(index.count_within(queries, radius),
+                                          _brute_force_count(points, queries, radius))
+        np.testing.assert_allclose(index.nearest_distance(queries), _brute_force_nearest(points, queries))
+
+
+def test_empty_layer_and_sparse_grid():
+    empty = GridIndex(np.empty((0, 2)))
+    queries = np.array([[0.0, 0.0], [10.0, -5.0]])
+    assert np.isinf(empty.nearest_distance(queries)).all()
+    assert empty.count_within(queries, 100.0).tolist() == [0, 0]
+
+    # Pencilan jauh membuat grid renggang: tanpa tabel awal-sel, memakai searchsorted
+    points = np.array([[0.0, 0.0], [3.0, 4.0], [5e7, 5e7]])
+    sparse = GridIndex(points, cell_size=1.0)
+    assert sparse.cell_start is None
+    np.testing.assert_allclose(sparse.nearest_distance(queries), _brute_force_nearest(points, queries))
+    assert sparse.count_within(queries, 5.0).tolist() == _brute_force_count(points, queries, 5.0).tolist()
+
+
+def test_load_points_from_csv_and_geojson():
+    csv = io.StringIO("name,Latitude,Lng\na,-7.7,110.3\nb,-7.8,110.4\n")
+    csv.name = "points.csv"
+    np.testing.assert_array_equal(load_points(csv), [[-7.7, 110.3], [-7.8, 110.4]])
+
+    geojson = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "geometry": {"type": "Point", "coordinates": [110.3, -7.7]}},
+        {"type": "Feature", "geometry": {"type": "MultiPoint", "coordinates": [[110.4, -7.8], [110.5, -7.9]]}},
+    ]}
+    source = io.StringIO(json.dumps(geojson))
+    source.name = "points.geojson"
+    np.testing.assert_array_equal(load_points(source), [[-7.7, 110.3], [-7.8, 110.4], [-7.9, 110.5]])
+    assert points_from_geojson({"type": "FeatureCollection", "features": []}).shape == (0, 2)
+
+
+def test_load_candidates_rejects_duplicate_names():
+    names, coords = load_candidates(io.StringIO("site,lat,lon\nNorth,-7.7,110.3\nSouth,-7.8,110.4\n"))
+    assert names == ["North", "South"] and coords.shape == (2, 2)
+
+    with pytest.raises(ValueError, match="unique.*North"):
+        load_candidates(io.StringIO("site,lat,lon\nNorth,-7.7,110.3\nSouth,-7.8,110.4\nNorth,-7.9,110.5\n"))
+
+
+def test_rescale_maps_min_max_and_non_finite_values():
+    np.testing.assert_allclose(rescale([0, 5, 10, np.inf], 1, 10), [1, 5.5, 10, 10])
+    np.testing.assert_allclose(rescale([3, 3], 1, 5), [3, 3])
+    np.testing.assert_allclose(rescale([np.inf, np.inf], 1, 5), [1, 1])
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from rumus import compile_gap_weight, profile_matching, topsis_batch
+from stability import profile_matching_weight_stability, topsis_weight_stability
+
+
+# Bobot sepanjang lintasan kriteria j: w_j = t, bobot lain diskalakan (1 - t) / (1 - w_j)
+def _path_weights(weights, j, t):
+    w = np.outer((1 - t) / (1 - weights[j]), weights)
+    w[:, j] = t
+    return w
+
+
+def _top_sets(scores, top_k):
+    return np.sort(np.argsort(-scores, axis=-1, kind="stable")[..., :top_k], axis=-1)
+
+
+# Sapuan padat: pasangan titik grid (t terakhir tanpa perubahan, t pertama dengan perubahan) dan
+# alternatif yang masuk top-k, atau None bila top-k tidak berubah sampai ujung lintasan
+def _brute_force_threshold(score_fn, weights, j, stop, top_k, points=4000):
+    t = weights[j] + (stop - weights[j]) * np.linspace(0, 1, points + 1)
+    tops = _top_sets(score_fn(_path_weights(weights, j, t)), top_k)
+    changed = np.flatnonzero((tops != tops[0]).any(axis=1))
+    if not len(changed):
+        return None
+    first = changed[0]
+    return t[first - 1], t[first], set(tops[first].tolist()) - set(tops[0].tolist())
+
+
+def _assert_thresholds_match(result, score_fn, weights, top_k, points=4000):
+    found = 0
+    for j in range(len(weights)):
+        for side, stop in (("lower", 0.0), ("upper", 1 - 1e-9)):
+            brute = _brute_force_threshold(score_fn, weights, j, stop, top_k, points)
+            if brute is None:
+                assert np.isnan(result[side][j]) and result[f"{side}_entrant"][j] == -1
+                continue
+            inside, outside, entrants = brute
+            low, high = sorted((inside, outside))
+            assert low - 1e-9 <= result[side][j] <= high + 1e-9, (side, j, result[side][j], brute)
+            assert result[f"{side}_entrant"][j] in entrants
+            found += 1
+    assert found > 0
+
+
+@pytest.mark.parametrize("seed, top_k", [(0, 1), (1, 1), (2, 3)])
+def test_topsis_thresholds_match_dense_weight_sweep(seed, top_k):
+    rng = np.random.default_rng(seed)
+    matrix = rng.uniform(1, 10, size=(30, 4))
+    weights = rng.dirichlet(np.full(4, 3.0))
+    is_benefit = [True, False, True, True]
+
+    result = topsis_weight_stability(matrix, weights, is_benefit, top_k=top_k)
+
+    assert result["top"].tolist() == np.argsort(-topsis_batch(matrix, weights, is_benefit)[0][0], kind="stable")[:top_k].tolist()
+    _assert_thresholds_match(result, lambda w: topsis_batch(matrix, w, is_benefit)[0], weights, top_k)
+
+
+@pytest.mark.parametrize("seed, top_k", [(0, 1), (3, 2)])
+def test_profile_matching_closed_form_thresholds_match_dense_weight_sweep(seed, top_k):
+    rng = np.random.default_rng(seed)
+    # Nilai aktual pecahan dengan interpolasi tabel GAP: skor tanpa seri
+    actuals = rng.uniform(1, 5, size=(25, 5))
+    ideal, grouping = [3, 4, 2, 5, 3], ["CF", "SF", "CF", "SF", "CF"]
+    weights = rng.dirichlet(np.full(5, 3.0))
+    gap_table = compile_gap_weight()
+
+    def score_fn(path):
+        return np.array([profile_matching(ideal, actuals, w, grouping, gap_table)[0] for w in path])
+
+    result = profile_matching_weight_stability(ideal, actuals, weights, grouping, gap_table, top_k=top_k)
+
+    assert result["top"].tolist() == np.argsort(-score_fn([weights])[0], kind="stable")[:top_k].tolist()
+    _assert_thresholds_match(result, score_fn, weights, top_k, points=1000)
+
+
+def test_thresholds_are_nan_when_the_ranking_never_changes():
+    # Alternatif 0 unggul di semua kriteria: tidak ada bobot yang mengubah pemenang
+    matrix = np.array([[9.0, 9.0, 9.0], [5.0, 2.0, 4.0], [3.0, 6.0, 1.0]])
+    result = topsis_weight_stability(matrix, [0.5, 0.3, 0.2], [True, True, True])
+
+    assert np.isnan(result["lower"]).all() and np.isnan(result["upper"]).all()
+    assert (result["lower_entrant"] == -1).all() and (result["upper_entrant"] == -1).all()
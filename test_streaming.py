@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rumus import topsis
+from streaming import iter_chunks, topsis_stream
+
+
+@pytest.fixture
+def problem(topsis_problem):
+    return topsis_problem(n=1000)
+
+
+def _sources(matrix, tmp_path):
+    np.save(tmp_path / "matrix.npy", matrix)
+    frame = pd.DataFrame(matrix, columns=["C1", "C2", "C3", "C4"])
+    frame.insert(0, "name", [f"S{i}" for i in range(len(matrix))])
+    frame.to_csv(tmp_path / "matrix.csv", index=False)
+    matrix.tofile(tmp_path / "matrix.bin")
+    return [
+        (matrix, {}),
+        (tmp_path / "matrix.npy", {}),
+        (str(tmp_path / "matrix.csv"), {"usecols": ["C1", "C2", "C3", "C4"]}),
+        (tmp_path / "matrix.bin", {"shape": matrix.shape}),
+    ]
+
+
+# chunksize 37 tidak membagi n = 1000: chunk terakhir lebih pendek
+def test_chunked_scores_and_top_k_match_topsis_for_every_source(problem, tmp_path):
+    matrix, weights, is_benefit = problem
+    expected_scores, expected_ranking = topsis(matrix, weights, is_benefit)
+
+    for source, read_kwargs in _sources(matrix, tmp_path):
+        scores_out = np.empty(len(matrix))
+        top_scores, top_idx = topsis_stream(source, weights, is_benefit, top_k=15, chunksize=37,
+                                            scores_out=scores_out, **read_kwargs)
+
+        np.testing.assert_allclose(scores_out, expected_scores, rtol=1e-12)
+        assert top_idx == expected_ranking[:15]
+        np.testing.assert_allclose(top_scores, np.asarray(expected_scores)[expected_ranking[:15]], rtol=1e-12)
+
+
+def test_scores_can_be_written_to_an_npy_file(problem, tmp_path):
+    matrix, weights, is_benefit = problem
+
+    topsis_stream(matrix, weights, is_benefit, chunksize=300, scores_out=tmp_path / "scores.npy")
+
+    np.testing.assert_allclose(np.load(tmp_path / "scores.npy"), topsis(matrix, weights, is_benefit)[0], rtol=1e-12)
+
+
+def test_top_k_larger_than_n_ties_and_empty_input():
+    matrix = np.array([[1.0, 2.0], [3.0, 1.0], [1.0, 2.0], [2.0, 2.0]])
+    top_scores, top_idx = topsis_stream(matrix, [0.5, 0.5], [True, False], top_k=10, chunksize=3)
+
+    assert len(top_idx) == 4 and sorted(top_idx) == [0, 1, 2, 3]
+    # Skor seri (baris 0 dan 2): urutan sama dengan topsis
+    assert top_idx == topsis(matrix, [0.5, 0.5], [True, False])[1]
+    assert top_scores == sorted(top_scores, reverse=True)
+    assert topsis_stream(np.empty((0, 2)), [0.5, 0.5], [True, True]) == ([], [])
+
+
+def test_iter_chunks_rejects_unknown_sources(tmp_path):
+    with pytest.raises(ValueError):
+        next(iter_chunks(tmp_path / "matrix.bin"))
+    with pytest.raises(ValueError):
+        next(iter_chunks(np.ones(5)))
+    assert [len(c) for c in iter_chunks(np.ones((10, 2)), chunksize=4)] == [4, 4, 2]
@@ -0,0 +1,65 @@
+import asyncio
+import contextvars
+import threading
+
+import tracing
+from tracing import begin_trace, chrome_trace_events, current_trace, end_trace, span, traced
+
+
+def test_nested_spans_record_depth_and_duration():
+    trace = begin_trace("rerun")
+    with span("outer"):
+        with span("inner"):
+            pass
+        with span("inner"):
+            pass
+    assert end_trace() is trace and current_trace() is None
+
+    # Span dicatat saat ditutup: anak sebelum induknya
+    assert [(name, depth) for name, _, _, depth in trace.events] == [("inner", 1), ("inner", 1), ("outer", 0)]
+    outer_start, outer_duration = trace.events[-1][1:3]
+    assert all(outer_start <= start and duration <= outer_duration for _, start, duration, _ in trace.events[:2])
+    assert trace.summary()["inner"][1] == 2 and trace.duration >= outer_duration
+
+
+def test_spans_without_an_active_trace_are_the_shared_null_span():
+    assert current_trace() is None
+    assert span("a") is span("b") is tracing._NULL_SPAN
+    with span("a") as s:
+        assert s is tracing._NULL_SPAN
+
+    with traced("off", enabled=False) as trace:
+        assert trace is None and span("a") is tracing._NULL_SPAN
+
+
+# Trace dibawa oleh ContextVar: tidak bocor ke thread lain, tetapi ikut ke konteks salinan dan task asyncio
+def test_trace_follows_the_context_var():
+    seen = {}
+    with traced("main") as trace:
+        worker = threading.Thread(target=lambda: seen.setdefault("thread", current_trace()))
+        worker.start()
+        worker.join()
+        seen["copied"] = contextvars.copy_context().run(current_trace)
+
+        async def task():
+            with span("async.step"):
+                return current_trace()
+        seen["task"] = asyncio.run(task())
+
+    assert seen == {"thread": None, "copied": trace, "task": trace}
+    assert [name for name, *_ in trace.events] == ["async.step"]
+    assert current_trace() is None
+
+
+def test_chrome_trace_events_one_row_per_trace():
+    with traced("first") as first:
+        with span("step"):
+            pass
+    with traced("second") as second:
+        pass
+
+    events = chrome_trace_events([first, second])
+
+    assert [(e["name"], e["ph"], e["tid"]) for e in events] == [
+        ("thread_name", "M", 0), ("first", "X", 0), ("step", "X", 0), ("thread_name", "M", 1), ("second", "X", 1)]
+    assert events[2]["ts"] >= events[1]["ts"] and events[2]["args"] == {"depth": 0}
@@ -0,0 +1,121 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# --- INSTRUMENTASI WAKTU ---
+# Span bernama mencatat durasi tahap-tahap perhitungan ke dalam trace yang sedang aktif.
+# Tanpa trace aktif, span() mengembalikan satu objek no-op bersama, sehingga biaya saat
+# instrumentasi mati hanya satu pembacaan ContextVar per span.
+#
+#   trace = begin_trace("rerun")          # atau: with traced("job") as trace:
+#   with span("topsis.distance"):
+#       ...
+#   end_trace()
+#   export_chrome_trace([trace], "trace.json")   # dibuka di chrome://tracing atau Perfetto
+
+_current = contextvars.ContextVar("dss_trace", default=None)
+
+class Trace:
+    def __init__(self, label):
+        self.label = label
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = None
+        self.events = []  # (nama, mulai relatif detik, durasi detik, kedalaman)
+        self.depth = 0
+        self.thread_id = threading.get_ident()
+
+    # Total waktu per nama span (detik) dan jumlah pemanggilan, urut sesuai kemunculan pertama
+    def summary(self):
+        totals = {}
+        for name, _, duration, depth in self.events:
+            total, calls, _ = totals.get(name, (0.0, 0, depth))
+            totals[name] = (total + duration, calls + 1, depth)
+        return totals
+
+class _Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.trace.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.trace.depth -= 1
+        self.trace.events.append((self.name, self.start - self.trace.start, end - self.start, self.trace.depth))
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name):
+    trace = _current.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+# Memulai trace baru pada konteks saat ini (trace lama yang belum ditutup diganti)
+def begin_trace(label):
+    trace = Trace(label)
+    _current.set(trace)
+    return trace
+
+def current_trace():
+    return _current.get()
+
+def end_trace():
+    trace = _current.get()
+    _current.set(None)
+    if trace is not None:
+        trace.duration = time.perf_counter() - trace.start
+    return trace
+
+@contextmanager
+def traced(label, enabled=True):
+    if not enabled:
+        yield None
+        return
+    trace = begin_trace(label)
+    try:
+        yield trace
+    finally:
+        end_trace()
+
+# Instrumentasi juga dapat diaktifkan untuk seluruh proses lewat DSS_TRACE=1 (lihat program_dss.py)
+def enabled_by_env():
+    return os.environ.get("DSS_TRACE", "").lower() in ("1", "true", "yes")
+
+# --- EKSPOR ---
+# Format Chrome Trace Event ("X" = complete event, satuan mikrodetik); satu trace = satu baris (tid)
+def chrome_trace_events(traces):
+    events = []
+    for tid, trace in enumerate(traces):
+        base = trace.started_at * 1e6
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": trace.label}})
+        if trace.duration is not None:
+            events.append({"name": trace.label, "ph": "X", "pid": 1, "tid": tid, "ts": base, "dur": trace.duration * 1e6})
+        for name, start, duration, depth in trace.events:
+            events.append({"name": name, "ph": "X", "pid": 1, "tid": tid, "ts": base + start * 1e6,
+                           "dur": duration * 1e6, "args": {"depth": depth}})
+    return events
+
+def export_chrome_trace(traces, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": chrome_trace_events(traces)}, f)